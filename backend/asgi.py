@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+# Serve the JSON read APIs with their async views (see core/async_views.py)
+os.environ.setdefault('SSC_ASYNC_API_VIEWS', '1')
 
 application = get_asgi_application()
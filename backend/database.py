@@ -0,0 +1,67 @@
+"""
+SQLite connection profile for the SSC Educations database.
+
+Cashiers write fees while others load reports, so the database runs in
+WAL mode: readers no longer block the writer or each other. WAL is a
+property of the file, set once by migration 0016; connections only read
+it. Every connection also gets a busy timeout, so a writer waits for the
+lock instead of failing with "database is locked", and write transactions
+start with BEGIN IMMEDIATE, so they take the lock up front rather than
+failing when a read turns into a write.
+
+`sqlite_databases()` builds the DATABASES setting: the read-write
+'default' connection and a 'readonly' connection to the same file, which
+core.routers sends the read-only views to.
+"""
+
+from pathlib import Path
+
+# Applied to every new connection; none of them is stored in the file, so
+# opening the database (manage.py check, a test run) never changes it
+PRAGMAS = {
+    # fsync at checkpoints only; a power cut may lose the last commits but
+    # cannot corrupt the file in WAL mode
+    'synchronous': 'NORMAL',
+    'busy_timeout': 10000,  # milliseconds
+    'cache_size': -64000,  # negative means KiB: 64MB of page cache
+    'mmap_size': 268435456,  # 256MB of the file read through mmap
+    'temp_store': 'MEMORY',
+}
+
+# Connections are kept between requests for this many seconds
+CONN_MAX_AGE = 600
+
+
+def init_command():
+    return ';'.join(f'PRAGMA {name}={value}' for name, value in PRAGMAS.items())
+
+
+def sqlite_databases(path):
+    """DATABASES entries for the read-write and read-only connections to `path`"""
+    return {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': path,
+            'CONN_MAX_AGE': CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'init_command': init_command(),
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': PRAGMAS['busy_timeout'] / 1000,
+            },
+        },
+        'readonly': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            # SQLite refuses every write made through this connection
+            'NAME': f'{Path(path).resolve().as_uri()}?mode=ro',
+            'CONN_MAX_AGE': CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'init_command': init_command(),
+                'timeout': PRAGMAS['busy_timeout'] / 1000,
+            },
+            'TEST': {
+                'MIRROR': 'default',
+            },
+        },
+    }
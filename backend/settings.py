@@ -6,6 +6,10 @@ Updated with MEDIA configuration for admission photo uploads.
 from pathlib import Path
 import os
 
+from django.core.exceptions import ImproperlyConfigured
+
+from .database import sqlite_databases
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -14,7 +18,8 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-urzwsl=3dw@9%j-017m-(c60k6=h5*3no8c5c53ijkzqi5e$xv'
+# The committed key is public; production sets SSC_SECRET_KEY.
+SECRET_KEY = os.environ.get('SSC_SECRET_KEY') or 'django-insecure-urzwsl=3dw@9%j-017m-(c60k6=h5*3no8c5c53ijkzqi5e$xv'
 
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
@@ -35,6 +40,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.StaticFilesMiddleware',
+    'core.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -46,6 +53,13 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'backend.urls'
 
+# Keeps side files of the test run (request metrics) out of the project
+TEST_RUNNER = 'core.test_runner.TestRunner'
+
+# The read-heavy JSON APIs also exist as async views (core/async_views.py).
+# asgi.py switches them on; WSGI and runserver keep the sync views.
+ASYNC_API_VIEWS = os.environ.get('SSC_ASYNC_API_VIEWS') == '1'
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -67,13 +81,49 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
+# WAL, busy timeout and persistent connections (see backend/database.py),
+# plus a read-only connection for the read-only views (see core/routers.py)
+# SSC_DATABASE_FILE points a server at another file, e.g. a benchmark data set
+DATABASES = sqlite_databases(os.environ.get('SSC_DATABASE_FILE') or BASE_DIR / 'db.sqlite3')
+DATABASE_ROUTERS = ['core.routers.ReadOnlyRouter']
+
+# Cache for JSON API responses (see core/caching.py). Entries are keyed on
+# table versions, so a per-process cache never serves stale data.
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ssc-educations',
+        'OPTIONS': {
+            'MAX_ENTRIES': 2000,
+        },
+    },
+    # Local-memory tier in front of the session table (SSC_SESSION_BACKEND=cache)
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ssc-educations-sessions',
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    },
 }
 
+# Sessions default to cached_db: a login is checked against the local-memory
+# cache and only reads django_session on a miss. Signed-cookie sessions
+# ('cookie') skip even that, but anyone who knows SECRET_KEY can forge one,
+# so they need a private key in SSC_SECRET_KEY. They also cannot be revoked
+# from the server before they expire.
+SESSION_ENGINES = {
+    'cookie': 'django.contrib.sessions.backends.signed_cookies',
+    'cache': 'django.contrib.sessions.backends.cached_db',
+    'db': 'django.contrib.sessions.backends.db',
+}
+SESSION_BACKEND = os.environ.get('SSC_SESSION_BACKEND', 'cache')
+if SESSION_BACKEND == 'cookie' and not os.environ.get('SSC_SECRET_KEY'):
+    raise ImproperlyConfigured('SSC_SESSION_BACKEND=cookie needs a private SSC_SECRET_KEY')
+SESSION_ENGINE = SESSION_ENGINES[SESSION_BACKEND]
+SESSION_CACHE_ALIAS = 'sessions'
+SESSION_COOKIE_HTTPONLY = True
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -112,10 +162,36 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# collectstatic writes content-hashed names plus .gz/.br copies, which
+# core.middleware.StaticFilesMiddleware serves with far-future caching
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'core.static_files.CompressedManifestStaticFilesStorage',
+    },
+}
+
 # Media files (User uploaded content)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Background exports are kept under MEDIA_ROOT/exports for this many hours
+EXPORT_JOB_TTL_HOURS = 24
+
+# Rendered receipts and bills (see core/render_cache.py)
+RENDER_CACHE_DIR = BASE_DIR / 'render_cache'
+
+# Per-process request metrics snapshots, merged by /metrics/ (see core/metrics.py)
+METRICS_DIR = os.environ.get('SSC_METRICS_DIR') or BASE_DIR / 'metrics'
+# Clients allowed to scrape /metrics/ without a staff login
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']
+
+# Login throttling (see core/throttle.py): bursts of N attempts per M seconds
+LOGIN_RATE_PER_IP = (30, 60)
+LOGIN_RATE_PER_EMAIL = (5, 300)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -4,7 +4,10 @@ from django.contrib import admin
 from django.urls import path
 from django.conf import settings
 from django.conf.urls.static import static
-from core import views
+from core import views, async_views
+
+# Under ASGI the read-heavy JSON APIs are served by their async versions
+api = async_views if settings.ASYNC_API_VIEWS else views
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -17,27 +20,37 @@ urlpatterns = [
     path("new-enquiry/", views.new_enquiry, name="new_enquiry"),
     path("enquiry-data/", views.enquiry_data, name="enquiry_data"),
     path("export-enquiries/", views.export_enquiries, name="export_enquiries"),
+    path("api/get-enquiries/", views.get_enquiries, name="get_enquiries"),
     path("new-admission/", views.new_admission, name="new_admission"),
+    path("api/import-admissions/", views.import_admissions_upload, name="import_admissions"),
     path("fees-payment/", views.fees_payment, name="fees_payment"),
     path("payment-history/", views.payment_history, name="payment_history"),
     path("students-details/", views.students_details, name="students_details"),
     path("admitted-students/", views.admitted_students, name="admitted_students"),
     
     # API Endpoints
-    path("api/get-admitted-students/", views.get_admitted_students, name="get_admitted_students"),
+    path("api/get-admitted-students/", api.get_admitted_students, name="get_admitted_students"),
     path("api/update-student/", views.update_student, name="update_student"),
-    path("api/search-student-payment/", views.search_student_for_payment, name="search_student_payment"),
-    path("api/get-payment-history/", views.get_payment_history, name="get_payment_history"),
-    path("api/get-receipt/", views.get_receipt_details, name="get_receipt_details"),
+    path("api/search-student-payment/", api.search_student_for_payment, name="search_student_payment"),
+    path("api/get-payment-history/", api.get_payment_history, name="get_payment_history"),
+    path("api/get-payment-totals/", api.get_payment_totals, name="get_payment_totals"),
+    path("api/reconcile-statement/", views.reconcile_statement_upload, name="reconcile_statement"),
+    path("api/get-receipt/", api.get_receipt_details, name="get_receipt_details"),
     path("api/delete-student-admission/", views.delete_student_admission, name="delete_student_admission"),
-    path("api/get-bills/", views.get_bills, name="get_bills"),
+    path("admission-thumbnail/<int:admission_id>/<slug:version>/", views.admission_thumbnail, name="admission_thumbnail"),
+    path("api/get-bills/", api.get_bills, name="get_bills"),
     
     # Export Endpoints
     path("export-payment-history/", views.export_payment_history, name="export_payment_history"),
     path("export-bills/", views.export_bills, name="export_bills"),
+    path("api/export-jobs/", views.create_export_job, name="create_export_job"),
+    path("api/export-jobs/<uuid:job_id>/", views.export_job_status, name="export_job_status"),
+    path("export-jobs/<uuid:job_id>/download/", views.download_export_job, name="download_export_job"),
+    path("metrics/", views.metrics, name="metrics"),
     
     # Bill Management
     path("new-bill/", views.new_bill, name="new_bill"),
+    path("api/bills/batch/", views.create_bills_batch, name="create_bills_batch"),
     path("bills/", views.bills_list, name="bills_list"),
     path("print-bill/<int:bill_id>/", views.print_bill, name="print_bill"),
 ]
@@ -1,5 +1,19 @@
 from django.contrib import admin
-from .models import Student, Enquiry, Admission, Payment, Bill, BillItem
+from django.contrib.auth.models import AnonymousUser
+from django.db import transaction
+from django.db.models import Count
+from django.http import HttpRequest, QueryDict
+from .models import Student, Enquiry, Admission, Payment, Bill, BillItem, ExportJob
+from .summaries import summary_keys, refresh_summary_buckets
+from .caching import bump_versions, ADMISSIONS
+
+def changelist_queryset(model, query):
+    """Rows of a model's admin changelist for a saved query string, in its order"""
+    request = HttpRequest()
+    request.method = 'GET'
+    request.GET = QueryDict(query)
+    request.user = AnonymousUser()
+    return admin.site.get_model_admin(model).get_changelist_instance(request).queryset
 
 @admin.register(Student)
 class StudentAdmin(admin.ModelAdmin):
@@ -138,92 +152,42 @@ class AdmissionAdmin(admin.ModelAdmin):
     actions = ['mark_inactive', 'mark_active', 'export_to_excel']
     
     def mark_inactive(self, request, queryset):
-        updated = queryset.update(is_active=False)
+        with transaction.atomic():
+            keys = summary_keys(queryset)
+            updated = queryset.update(is_active=False)
+            refresh_summary_buckets(keys)
+            bump_versions(ADMISSIONS)
         self.message_user(request, f'{updated} admission(s) marked as inactive.')
     mark_inactive.short_description = 'Mark selected admissions as inactive'
     
     def mark_active(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        with transaction.atomic():
+            keys = summary_keys(queryset)
+            updated = queryset.update(is_active=True)
+            refresh_summary_buckets(keys)
+            bump_versions(ADMISSIONS)
         self.message_user(request, f'{updated} admission(s) marked as active.')
     mark_active.short_description = 'Mark selected admissions as active'
     
     def export_to_excel(self, request, queryset):
-        """Export selected admissions to Excel"""
-        import openpyxl
-        from django.http import HttpResponse
-        from datetime import datetime
-        
-        # Create workbook
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Admissions"
-        
-        # Headers
-        headers = [
-            'Form No', 'Admission Date', 'Course', 'Batch',
-            'First Name', 'Middle Name', 'Last Name',
-            'Birth Date', 'Mobile (Own)', 'Mobile (Parents)',
-            'Address', 'Qualification', 'Total Fees', 'Paid Fees',
-            'Installments', 'Created By', 'Status'
-        ]
-        
-        # Write headers
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = openpyxl.styles.Font(bold=True)
-            cell.fill = openpyxl.styles.PatternFill(
-                start_color="4472C4",
-                end_color="4472C4",
-                fill_type="solid"
-            )
-            cell.font = openpyxl.styles.Font(color="FFFFFF", bold=True)
-        
-        # Write data
-        for row, admission in enumerate(queryset, 2):
-            ws.cell(row=row, column=1, value=admission.form_no)
-            ws.cell(row=row, column=2, value=admission.admission_date.strftime('%d/%m/%Y'))
-            ws.cell(row=row, column=3, value=admission.course_name)
-            ws.cell(row=row, column=4, value=admission.batch)
-            ws.cell(row=row, column=5, value=admission.first_name)
-            ws.cell(row=row, column=6, value=admission.middle_name)
-            ws.cell(row=row, column=7, value=admission.last_name)
-            ws.cell(row=row, column=8, value=admission.birth_date.strftime('%d/%m/%Y'))
-            ws.cell(row=row, column=9, value=admission.mobile_own)
-            ws.cell(row=row, column=10, value=admission.mobile_parents or 'N/A')
-            ws.cell(row=row, column=11, value=admission.address)
-            ws.cell(row=row, column=12, value=admission.qualification)
-            ws.cell(row=row, column=13, value=float(admission.total_fees))
-            ws.cell(row=row, column=14, value=float(admission.paid_fees))
-            ws.cell(row=row, column=15, value=admission.get_installments_display())
-            ws.cell(row=row, column=16, value=admission.created_by or 'N/A')
-            ws.cell(row=row, column=17, value='Active' if admission.is_active else 'Inactive')
-        
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
+        """Queue an Excel export of the selected admissions"""
+        from django.utils.html import format_html
+        from .jobs import enqueue_export
         
-        # Create response
-        response = HttpResponse(
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        filename = f"admissions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        if request.POST.get('select_across') == '1':
+            # "Select all" can cover every admission; save the changelist's
+            # filters rather than an id list too long for one SQLite query
+            params = {'changelist': request.GET.urlencode()}
+        else:
+            # Ticked rows are at most one changelist page
+            params = {'ids': list(queryset.values_list('id', flat=True))}
+        job = enqueue_export('admissions', params, created_by=request.user.get_username())
         
-        # Save workbook
-        wb.save(response)
-        
-        self.message_user(request, f'Exported {queryset.count()} admission(s) to Excel.')
-        return response
-    
+        self.message_user(request, format_html(
+            'Export of {} admission(s) queued. It will be available <a href="{}">here</a> '
+            'once the export worker has finished.',
+            queryset.count(), f'/export-jobs/{job.job_id}/download/'
+        ))
     export_to_excel.short_description = 'Export selected admissions to Excel'
 
 
@@ -233,6 +197,7 @@ class PaymentAdmin(admin.ModelAdmin):
     list_filter = ['payment_mode', 'payment_date', 'created_at']
     search_fields = ['receipt_no', 'admission__first_name', 'admission__last_name', 'transaction_ref']
     readonly_fields = ['receipt_no', 'created_at', 'updated_at']
+    list_select_related = ['admission']
     ordering = ['-payment_date', '-created_at']
     date_hierarchy = 'payment_date'
     
@@ -283,9 +248,14 @@ class BillAdmin(admin.ModelAdmin):
         })
     )
     
+    def get_queryset(self, request):
+        # Count items in the changelist query instead of once per row
+        return super().get_queryset(request).annotate(items_count=Count('items'))
+    
     def get_items_count(self, obj):
-        return obj.items.count()
+        return obj.items_count
     get_items_count.short_description = 'Items Count'
+    get_items_count.admin_order_field = 'items_count'
 
 
 @admin.register(BillItem)
@@ -294,6 +264,7 @@ class BillItemAdmin(admin.ModelAdmin):
     list_filter = ['created_at']
     search_fields = ['bill__receipt_no', 'item_name']
     readonly_fields = ['amount', 'created_at']
+    list_select_related = ['bill']
     ordering = ['-created_at']
     
     fieldsets = (
@@ -312,4 +283,15 @@ class BillItemAdmin(admin.ModelAdmin):
     def get_receipt_no(self, obj):
         return obj.bill.receipt_no
     get_receipt_no.short_description = 'Receipt No'
-    get_receipt_no.admin_order_field = 'bill__receipt_no'
\ No newline at end of file
+    get_receipt_no.admin_order_field = 'bill__receipt_no'
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ['job_id', 'kind', 'status', 'progress', 'total', 'created_by', 'created_at', 'finished_at']
+    list_filter = ['kind', 'status', 'created_at']
+    search_fields = ['job_id', 'created_by']
+    readonly_fields = [
+        'job_id', 'kind', 'params', 'status', 'progress', 'total', 'error', 'file_name',
+        'download_name', 'created_by', 'created_at', 'started_at', 'finished_at', 'expires_at'
+    ]
+    ordering = ['-created_at']
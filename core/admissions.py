@@ -0,0 +1,106 @@
+# core/admissions.py
+"""Validation rules for new admissions, shared by the form and the importer"""
+
+import re
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from .models import Admission
+
+REQUIRED_FIELDS = [
+    'admission_date', 'batch', 'course_name', 'first_name', 'middle_name', 'last_name',
+    'birth_date', 'mobile_own', 'address', 'qualification', 'installment'
+]
+
+BATCH_PATTERN = re.compile(r'^\d{4}-\d{2}$')
+
+
+class InvalidAdmissionError(ValueError):
+    """Admission data rejected before anything was written"""
+
+
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        # Spreadsheets store numbers such as mobile numbers as floats
+        value = int(value)
+    return str(value).strip()
+
+
+def _date(value, label):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    for fmt in ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y'):
+        try:
+            return datetime.strptime(_text(value), fmt).date()
+        except ValueError:
+            pass
+    raise InvalidAdmissionError(f'{label} must be a date (YYYY-MM-DD or DD/MM/YYYY)')
+
+
+def _batch(value):
+    if isinstance(value, (date, datetime)):
+        return value.strftime('%Y-%m')
+    batch = _text(value)
+    if not BATCH_PATTERN.match(batch):
+        raise InvalidAdmissionError('Batch must look like YYYY-MM')
+    return batch
+
+
+def clean_admission(data):
+    """Validate one admission and return model field values
+
+    `data` uses the new admission form's field names. Values may be
+    strings, as posted by the form, or cell values read from a spreadsheet.
+    """
+    values = {field: data.get(field) for field in REQUIRED_FIELDS}
+    if not all(_text(value) for value in values.values()):
+        raise InvalidAdmissionError('All required fields must be filled')
+
+    mobile_own = _text(data.get('mobile_own'))
+    if len(mobile_own) != 10 or not mobile_own.isdigit():
+        raise InvalidAdmissionError('Mobile number must be 10 digits')
+
+    mobile_parents = _text(data.get('mobile_parents'))
+    if mobile_parents and (len(mobile_parents) != 10 or not mobile_parents.isdigit()):
+        raise InvalidAdmissionError("Parents' mobile number must be 10 digits")
+
+    # Accept "2" as well as the "2 Installments" label used in exports
+    installment = _text(data.get('installment'))[:1]
+    if installment not in dict(Admission.INSTALLMENT_CHOICES):
+        raise InvalidAdmissionError('Installments must be 1 or 2')
+
+    cleaned = {
+        'admission_date': _date(data.get('admission_date'), 'Admission date'),
+        'batch': _batch(data.get('batch')),
+        'course_name': _text(data.get('course_name')),
+        'first_name': _text(data.get('first_name')),
+        'middle_name': _text(data.get('middle_name')),
+        'last_name': _text(data.get('last_name')),
+        'birth_date': _date(data.get('birth_date'), 'Birth date'),
+        'mobile_own': mobile_own,
+        'mobile_parents': mobile_parents or None,
+        'address': _text(data.get('address')),
+        'qualification': _text(data.get('qualification')),
+        'installments': installment,
+    }
+
+    total_fees = _text(data.get('total_fees'))
+    if total_fees:
+        try:
+            cleaned['total_fees'] = Decimal(total_fees)
+        except InvalidOperation:
+            raise InvalidAdmissionError('Total fees must be a number')
+        if not cleaned['total_fees'].is_finite() or cleaned['total_fees'] < 0:
+            raise InvalidAdmissionError('Total fees must be a positive number')
+
+    for field in ('course_name', 'first_name', 'middle_name', 'last_name', 'qualification'):
+        max_length = Admission._meta.get_field(field).max_length
+        if len(cleaned[field]) > max_length:
+            label = Admission._meta.get_field(field).verbose_name
+            raise InvalidAdmissionError(f'{label} must be at most {max_length} characters')
+
+    return cleaned
@@ -0,0 +1,231 @@
+# core/async_views.py
+"""Async versions of the read-heavy JSON APIs, for the ASGI deployment
+
+Under an ASGI server every sync view borrows a thread from the
+sync-to-async pool for the whole request. These views run on the event
+loop instead and only hand their queries to the async ORM. They answer
+exactly like the sync views in views.py and share their row helpers;
+backend/urls.py routes the API URLs here when ASYNC_API_VIEWS is set,
+which asgi.py does by default.
+"""
+
+import json
+
+from asgiref.sync import sync_to_async
+from django.core import signing
+from django.db.models import Count, Sum
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+
+from .caching import versioned_json_cache, ADMISSIONS, PAYMENTS, BILLS
+from .decorators import api_login_required
+from .filters import filter_payments, filter_bills
+from .models import Admission, Payment
+from .render_cache import render_cache, InvalidCacheKeyError
+from .routers import read_only_database
+from .search import search_admissions
+from .views import (
+    admission_json, payment_search_json, payment_json, payment_totals_json, receipt_json, bill_json,
+    payment_page_size, make_payment_cursor, payment_cursor_filter
+)
+
+
+@csrf_exempt
+@api_login_required
+@read_only_database
+@versioned_json_cache(ADMISSIONS)
+async def get_admitted_students(request):
+    """API: Get admitted students by course and batch"""
+    try:
+        course = request.GET.get('course', '')
+        batch = request.GET.get('batch', '')
+
+        if not course or not batch:
+            return JsonResponse({
+                'success': False,
+                'error': 'Course and batch are required'
+            })
+
+        students = Admission.objects.filter(
+            course_name=course,
+            batch=batch,
+            is_active=True
+        ).order_by('-created_at')
+
+        return JsonResponse({
+            'success': True,
+            'students': [admission_json(student) async for student in students]
+        })
+
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
+
+
+@csrf_exempt
+@api_login_required
+@read_only_database
+async def search_student_for_payment(request):
+    """API: Search student for payment"""
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            search_term = data.get('search_term', '').strip()
+
+            if len(search_term) < 2:
+                return JsonResponse({
+                    'success': True,
+                    'students': []
+                })
+
+            # The FTS5 lookup is a raw query, which the async ORM does not cover
+            students = await sync_to_async(search_admissions)(search_term, pending_only=True, limit=10)
+
+            return JsonResponse({
+                'success': True,
+                'students': [payment_search_json(student) for student in students]
+            })
+
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            })
+
+    return JsonResponse({'error': 'Invalid request'}, status=400)
+
+
+@csrf_exempt
+@api_login_required
+@read_only_database
+@versioned_json_cache(PAYMENTS, ADMISSIONS)
+async def get_payment_history(request):
+    """API: Get payment history, one keyset-paginated page at a time"""
+    try:
+        page_size = payment_page_size(request.GET)
+        cursor = request.GET.get('cursor', '')
+
+        payments = filter_payments(request.GET).select_related('admission').order_by(
+            '-payment_date', '-created_at', '-id'
+        )
+
+        # Totals come from get_payment_totals (see views.get_payment_history)
+        if cursor:
+            try:
+                payments = payments.filter(payment_cursor_filter(cursor))
+            except (signing.BadSignature, ValueError, TypeError):
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Invalid cursor'
+                }, status=400)
+
+        page = [payment async for payment in payments[:page_size + 1]]
+        has_more = len(page) > page_size
+        page = page[:page_size]
+
+        return JsonResponse({
+            'success': True,
+            'payments': [payment_json(payment) for payment in page],
+            'next_cursor': make_payment_cursor(page[-1]) if has_more else None
+        })
+
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
+
+
+@csrf_exempt
+@api_login_required
+@read_only_database
+@versioned_json_cache(PAYMENTS, ADMISSIONS)
+async def get_payment_totals(request):
+    """API: Count and amount of all payments matching the history filters"""
+    try:
+        summary = await filter_payments(request.GET).aaggregate(count=Count('id'), amount=Sum('amount_paid'))
+
+        return JsonResponse({
+            'success': True,
+            'totals': payment_totals_json(summary)
+        })
+
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
+
+
+@csrf_exempt
+@api_login_required
+@read_only_database
+async def get_receipt_details(request):
+    """API: Get receipt details"""
+    try:
+        receipt_no = request.GET.get('receipt_no', '')
+
+        if not receipt_no:
+            return JsonResponse({
+                'success': False,
+                'error': 'Receipt number is required'
+            })
+
+        # Reprints are served from the render cache without touching the ORM
+        cached, generation = await sync_to_async(render_cache.lookup, thread_sensitive=False)('receipts', receipt_no)
+        if cached is not None:
+            return HttpResponse(cached, content_type='application/json')
+
+        payment = await Payment.objects.select_related('admission').aget(receipt_no=receipt_no)
+
+        response = JsonResponse({
+            'success': True,
+            'receipt': receipt_json(payment)
+        })
+        await sync_to_async(render_cache.set, thread_sensitive=False)(
+            'receipts', payment.receipt_no, response.content, generation
+        )
+        return response
+
+    except (Payment.DoesNotExist, InvalidCacheKeyError):
+        return JsonResponse({
+            'success': False,
+            'error': 'Receipt not found'
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
+
+
+@csrf_exempt
+@api_login_required
+@read_only_database
+@versioned_json_cache(BILLS)
+async def get_bills(request):
+    """API endpoint to get filtered bills"""
+    try:
+        if not request.GET.get('date', ''):
+            return JsonResponse({
+                'success': False,
+                'error': 'Date is required'
+            })
+
+        # Count items in the same query instead of once per bill
+        bills = filter_bills(request.GET).annotate(items_count=Count('items'))
+        bills_data = [bill_json(bill) async for bill in bills]
+
+        return JsonResponse({
+            'success': True,
+            'bills': bills_data,
+            'count': len(bills_data)
+        })
+
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
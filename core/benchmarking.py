@@ -0,0 +1,129 @@
+# core/benchmarking.py
+"""Helpers shared by the benchmark management commands"""
+
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+
+from django.core.management import call_command
+from django.db import connections
+from django.test.utils import override_settings
+
+from core.metrics import registry
+
+
+@contextmanager
+def scratch_database(alias='default'):
+    """Run the block against a throwaway, fully migrated SQLite file
+
+    The real database is never touched: the connection is pointed at a
+    temporary file for the duration of the block and restored afterwards.
+    """
+    connection = connections[alias]
+    old_name = connection.settings_dict['NAME']
+    tmp_dir = tempfile.mkdtemp(prefix='ssc_bench_')
+
+    connection.settings_dict['TEST'] = {
+        **connection.settings_dict.get('TEST', {}),
+        'NAME': os.path.join(tmp_dir, 'bench.sqlite3'),
+    }
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+    # Point the read-only connection at the scratch file too
+    mirrors = _point_mirrors(alias, connection.settings_dict['NAME'])
+
+    try:
+        yield connection.settings_dict['NAME']
+    finally:
+        connections.close_all()
+        _restore_mirrors(mirrors)
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+@contextmanager
+def database_file(path, alias='default'):
+    """Run the block against a persistent SQLite file, migrating it first
+
+    Used to keep large benchmark data sets between runs without touching
+    the real database.
+    """
+    connections.close_all()
+    connection = connections[alias]
+    old_name = connection.settings_dict['NAME']
+    connection.settings_dict['NAME'] = str(path)
+    mirrors = _point_mirrors(alias, str(path))
+
+    try:
+        call_command('migrate', database=alias, verbosity=0)
+        yield str(path)
+    finally:
+        connections.close_all()
+        connection.settings_dict['NAME'] = old_name
+        _restore_mirrors(mirrors)
+
+
+def _point_mirrors(alias, name):
+    """Point the connections that mirror `alias` in tests at the file `name`"""
+    mirrors = {}
+    for other in connections:
+        if connections[other].settings_dict.get('TEST', {}).get('MIRROR') == alias:
+            mirrors[other] = connections[other].settings_dict['NAME']
+            connections[other].close()
+            connections[other].settings_dict['NAME'] = name
+    return mirrors
+
+
+def _restore_mirrors(mirrors):
+    for other, name in mirrors.items():
+        connections[other].settings_dict['NAME'] = name
+
+
+@contextmanager
+def scratch_metrics():
+    """Keep the block's request metrics out of METRICS_DIR
+
+    They go to a temporary directory instead, and are dropped afterwards
+    so the exit-time flush does not write them either.
+    """
+    directory = tempfile.mkdtemp(prefix='ssc_metrics_')
+    try:
+        with override_settings(METRICS_DIR=directory):
+            yield directory
+    finally:
+        registry.reset()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def timing_summary(samples):
+    """Summarise a list of durations (seconds) in milliseconds"""
+    return {
+        'runs': len(samples),
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 95) * 1000, 3),
+        'max_ms': round(max(samples) * 1000, 3) if samples else 0.0,
+    }
+
+
+class Stopwatch:
+    """Context manager measuring elapsed wall time"""
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+        return self
+
+    def __exit__(self, *exc_info):
+        self.elapsed = time.perf_counter() - self.start
+        return False
@@ -0,0 +1,120 @@
+# core/billing.py
+"""Validation and bulk creation of bills and their items"""
+
+from datetime import datetime
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from .caching import bump_versions, BILLS
+from .models import Bill, BillItem, DocumentSequence
+
+CENTS = Decimal('0.01')
+
+
+class InvalidBillError(ValueError):
+    """Bill data rejected before anything was written"""
+
+
+def _decimal(value, label):
+    try:
+        number = Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        raise InvalidBillError(f'{label} must be a number')
+    if not number.is_finite():
+        raise InvalidBillError(f'{label} must be a number')
+    return number.quantize(CENTS, rounding=ROUND_HALF_UP)
+
+
+def clean_bill(data):
+    """Validate one bill and compute its line amounts and total
+
+    Amounts sent by the client are ignored: each line is quantity x rate,
+    and the total is the sum of the lines.
+    """
+    bill_date = str(data.get('bill_date') or '').strip()
+    customer_name = str(data.get('customer_name') or '').strip()
+    customer_mobile = str(data.get('customer_mobile') or '').strip()
+    items = data.get('items') or []
+
+    if not bill_date or not customer_name or not customer_mobile:
+        raise InvalidBillError('All fields are required')
+
+    if len(customer_mobile) != 10 or not customer_mobile.isdigit():
+        raise InvalidBillError('Mobile number must be 10 digits')
+
+    try:
+        parsed_date = parse_date(bill_date)
+    except ValueError:
+        parsed_date = None
+    if parsed_date is None:
+        raise InvalidBillError('Invalid bill date')
+
+    if not isinstance(items, list) or not items:
+        raise InvalidBillError('At least one item is required')
+
+    lines = []
+    total_amount = Decimal('0.00')
+    for number, item in enumerate(items, 1):
+        if not isinstance(item, dict):
+            raise InvalidBillError(f'Item {number}: invalid item')
+        item_name = str(item.get('item_name') or '').strip()
+        if not item_name:
+            raise InvalidBillError(f'Item {number}: name is required')
+
+        quantity = _decimal(item.get('quantity'), f'Item {number}: quantity')
+        rate = _decimal(item.get('rate'), f'Item {number}: rate')
+        if quantity <= 0:
+            raise InvalidBillError(f'Item {number}: quantity must be greater than zero')
+        if rate < 0:
+            raise InvalidBillError(f'Item {number}: rate cannot be negative')
+
+        amount = (quantity * rate).quantize(CENTS, rounding=ROUND_HALF_UP)
+        total_amount += amount
+        lines.append((item_name, quantity, rate, amount))
+
+    return {
+        'bill_date': parsed_date,
+        'customer_name': customer_name,
+        'customer_mobile': customer_mobile,
+        'total_amount': total_amount,
+        'items': lines,
+    }
+
+
+def create_bills(cleaned_bills, created_by=None):
+    """Insert validated bills and all their items in one transaction
+
+    Receipt numbers for the whole batch come from a single counter update,
+    bills and items are written with one bulk insert each, so the number of
+    queries does not grow with the number of bills or lines.
+    """
+    with transaction.atomic():
+        # Receipt numbers follow the entry date, as in Bill.save
+        receipt_numbers = DocumentSequence.reserve(
+            'BIL', datetime.now().strftime('%Y%m%d'), len(cleaned_bills), width=4
+        )
+
+        bills = Bill.objects.bulk_create([
+            Bill(
+                receipt_no=receipt_no,
+                bill_date=cleaned['bill_date'],
+                customer_name=cleaned['customer_name'],
+                customer_mobile=cleaned['customer_mobile'],
+                total_amount=cleaned['total_amount'],
+                created_by=created_by
+            )
+            for receipt_no, cleaned in zip(receipt_numbers, cleaned_bills)
+        ])
+
+        BillItem.objects.bulk_create([
+            BillItem(bill=bill, item_name=item_name, quantity=quantity, rate=rate, amount=amount)
+            for bill, cleaned in zip(bills, cleaned_bills)
+            for item_name, quantity, rate, amount in cleaned['items']
+        ], batch_size=500)
+
+        # bulk_create sends no signals
+        bump_versions(BILLS)
+
+    return bills
@@ -0,0 +1,138 @@
+# core/caching.py
+"""Response cache for the JSON read APIs, invalidated by per-table versions
+
+Every write to a cached table bumps its row in TableVersion. A cached
+response is stored under a key built from the view, its query string and
+the versions of the tables it reads, so a write makes the old entries
+unreachable instead of deleting them. An unchanged read costs a single
+query for the versions.
+"""
+
+import hashlib
+import json
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.http import HttpResponse, HttpResponseNotModified
+
+from .decorators import is_logged_in, ais_logged_in
+from .models import TableVersion
+
+ADMISSIONS = 'admissions'
+PAYMENTS = 'payments'
+BILLS = 'bills'
+
+CACHE_TIMEOUT = 300
+
+
+def bump_versions(*tables):
+    """Mark tables as changed, invalidating every response that read them
+
+    Call this in the same transaction as the write so the data and the new
+    version become visible together.
+    """
+    with transaction.atomic():
+        updated = TableVersion.objects.filter(table__in=tables).update(version=F('version') + 1)
+        if updated == len(tables):
+            return
+        for table in tables:
+            try:
+                with transaction.atomic():
+                    TableVersion.objects.get_or_create(table=table, defaults={'version': 1})
+            except IntegrityError:
+                # Created concurrently; that transaction's bump is enough
+                pass
+
+
+def current_versions(tables):
+    versions = dict(TableVersion.objects.filter(table__in=tables).values_list('table', 'version'))
+    return [versions.get(table, 0) for table in tables]
+
+
+async def acurrent_versions(tables):
+    versions = {table: version async for table, version in
+                TableVersion.objects.filter(table__in=tables).values_list('table', 'version')}
+    return [versions.get(table, 0) for table in tables]
+
+
+def _is_cacheable(response):
+    # Error payloads (e.g. a database that was briefly locked) are not kept.
+    # They are sent with status 200 too, so look at the payload itself.
+    if response.status_code != 200:
+        return False
+    try:
+        payload = json.loads(response.content)
+    except ValueError:
+        return False
+    return isinstance(payload, dict) and payload.get('success') is True
+
+
+def _cache_digest(view, request, args, kwargs, versions):
+    query = sorted(request.GET.lists())
+    return hashlib.sha1(repr((view.__module__, view.__name__, args, kwargs, query, versions)).encode()).hexdigest()
+
+
+def _finish(response, etag):
+    response['ETag'] = etag
+    # Browsers must revalidate, which is cheap thanks to the ETag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def versioned_json_cache(*tables, timeout=CACHE_TIMEOUT):
+    """Cache a GET JSON view until one of `tables` changes
+
+    Responses carry an ETag, and a request whose If-None-Match still
+    matches gets an empty 304. Async views are wrapped with the async
+    cache and ORM APIs.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                if request.method != 'GET' or not await ais_logged_in(request):
+                    return await view(request, *args, **kwargs)
+
+                digest = _cache_digest(view, request, args, kwargs, await acurrent_versions(tables))
+                etag = f'"{digest}"'
+
+                if etag in request.headers.get('If-None-Match', ''):
+                    return _finish(HttpResponseNotModified(), etag)
+                cached = await cache.aget(f'json:{digest}')
+                if cached is None:
+                    response = await view(request, *args, **kwargs)
+                    if not _is_cacheable(response):
+                        return response
+                    await cache.aset(f'json:{digest}', (response.content, response['Content-Type']), timeout)
+                else:
+                    content, content_type = cached
+                    response = HttpResponse(content, content_type=content_type)
+                return _finish(response, etag)
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            # Unauthenticated and non-GET requests go straight to the view
+            if request.method != 'GET' or not is_logged_in(request):
+                return view(request, *args, **kwargs)
+
+            digest = _cache_digest(view, request, args, kwargs, current_versions(tables))
+            etag = f'"{digest}"'
+
+            if etag in request.headers.get('If-None-Match', ''):
+                return _finish(HttpResponseNotModified(), etag)
+            cached = cache.get(f'json:{digest}')
+            if cached is None:
+                response = view(request, *args, **kwargs)
+                if not _is_cacheable(response):
+                    return response
+                cache.set(f'json:{digest}', (response.content, response['Content-Type']), timeout)
+            else:
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+            return _finish(response, etag)
+        return wrapper
+    return decorator
@@ -0,0 +1,52 @@
+# core/decorators.py
+"""Login checks shared by the views
+
+A user is logged in when the session carries `student_id` (see login_view).
+With the cached_db session engine (the default) this check usually needs
+no database query. The decorators also wrap async views (see async_views.py),
+which check the session with its async API.
+"""
+
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib import messages
+from django.http import JsonResponse
+from django.shortcuts import redirect
+
+
+def is_logged_in(request):
+    return 'student_id' in request.session
+
+
+async def ais_logged_in(request):
+    return await request.session.ahas_key('student_id')
+
+
+def login_required(view):
+    """Pages: send anonymous users to the login page"""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not is_logged_in(request):
+            messages.error(request, 'Please login to access this page')
+            return redirect('login')
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def api_login_required(view):
+    """JSON endpoints: answer anonymous requests with 401"""
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            if not await ais_logged_in(request):
+                return JsonResponse({'error': 'Unauthorized'}, status=401)
+            return await view(request, *args, **kwargs)
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not is_logged_in(request):
+            return JsonResponse({'error': 'Unauthorized'}, status=401)
+        return view(request, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,318 @@
+# core/exports.py
+"""Memory-bounded Excel export helpers built on openpyxl's write-only mode
+
+Rows go from the database cursor straight into a write-only worksheet,
+which openpyxl spools to a temporary file, so memory use does not depend
+on the number of rows.
+
+An XLSX file is a zip archive and openpyxl writes it out in one piece when
+the workbook is saved, so a download cannot start until every row has been
+written. xlsx_response saves into a temporary file and then streams that
+file; memory is bounded, the time to the first byte is not.
+"""
+
+import tempfile
+from datetime import datetime
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import get_column_letter
+from django.http import FileResponse
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+MIN_COLUMN_WIDTH = 12
+MAX_COLUMN_WIDTH = 50
+
+
+class Sheet:
+    """One worksheet of an export: headers and an iterator of rows
+
+    A write-only worksheet needs its column widths before the first row, and
+    measuring them would mean holding or re-reading every row. Widths come
+    from the headers instead, with `widths` ({header: width}) for columns
+    known to hold longer text.
+    """
+
+    def __init__(self, title, headers, rows, widths=None, header_color='4472C4'):
+        self.title = title
+        self.headers = headers
+        self.rows = rows
+        self.widths = [
+            (widths or {}).get(header, max(len(str(header)) + 2, MIN_COLUMN_WIDTH))
+            for header in headers
+        ]
+        self.header_color = header_color
+        self.row_count = 0
+
+    def write_to(self, workbook):
+        """Create the worksheet in a write-only workbook and write the rows as they arrive"""
+        ws = workbook.create_sheet(title=self.title)
+
+        for index, width in enumerate(self.widths, 1):
+            ws.column_dimensions[get_column_letter(index)].width = min(width, MAX_COLUMN_WIDTH)
+
+        header_cells = []
+        for header in self.headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.font = Font(bold=True, color="FFFFFF")
+            cell.fill = PatternFill(start_color=self.header_color, end_color=self.header_color, fill_type="solid")
+            header_cells.append(cell)
+        ws.append(header_cells)
+
+        for row in self.rows:
+            ws.append(row)
+            self.row_count += 1
+        return ws
+
+
+def build_workbook(sheets, target):
+    """Write the sheets into a new workbook saved to `target` (path or file)
+
+    The sheets' rows are read here, so the queries run inside this call.
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    for sheet in sheets:
+        sheet.write_to(wb)
+    wb.save(target)
+
+
+def xlsx_response(sheets, filename):
+    """Build the workbook in a temporary file, then stream that file to the client"""
+    spool = tempfile.TemporaryFile()
+    build_workbook(sheets, spool)
+    spool.seek(0)
+    return FileResponse(spool, as_attachment=True, filename=filename, content_type=XLSX_CONTENT_TYPE)
+
+
+# ==================== EXPORT BUILDERS ====================
+# Each builder takes the request/job parameters and an optional
+# progress(done, total) callback and returns (filename, sheets). The rows
+# are generators, so the queries run when the workbook is built.
+
+PROGRESS_EVERY = 1000
+
+
+def _iterate(queryset, progress, done=0, total=None):
+    """Iterate a values_list queryset, reporting progress every PROGRESS_EVERY rows
+
+    An export reading several querysets passes the total of all of them and
+    the rows already read, so its progress only moves forward.
+    """
+    if progress and total is None:
+        total = queryset.count()
+    for values in queryset.iterator(chunk_size=2000):
+        yield values
+        done += 1
+        if progress and done % PROGRESS_EVERY == 0:
+            progress(done, total)
+    if progress:
+        progress(done, total)
+
+
+def enquiries_export(params, progress=None):
+    from .filters import filter_enquiries
+    from .models import Enquiry
+    
+    course_labels = dict(Enquiry.COURSE_CHOICES)
+    enquiries = filter_enquiries(params).order_by('-created_at', '-id').values_list(
+        'enquiry_no', 'enquiry_date', 'student_name', 'mobile_no', 'course', 'address'
+    )
+    
+    rows = (
+        [
+            enquiry_no,
+            enquiry_date.strftime('%d/%m/%Y'),
+            student_name,
+            mobile_no,
+            course_labels.get(course, course),
+            address
+        ]
+        for enquiry_no, enquiry_date, student_name, mobile_no, course, address in _iterate(enquiries, progress)
+    )
+    sheet = Sheet(
+        "Enquiries",
+        ['Enquiry No', 'Date', 'Student Name', 'Mobile No', 'Course', 'Address'],
+        rows,
+        widths={'Student Name': 30, 'Address': MAX_COLUMN_WIDTH}
+    )
+    
+    return f'enquiries_{datetime.now().strftime("%Y%m%d")}.xlsx', [sheet]
+
+
+def payment_history_export(params, progress=None):
+    from .filters import filter_payments
+    
+    payments = filter_payments(params).order_by('-payment_date', '-created_at', '-id').values_list(
+        'receipt_no', 'payment_date',
+        'admission__first_name', 'admission__middle_name', 'admission__last_name',
+        'admission__form_no', 'admission__course_name', 'admission__batch',
+        'amount_paid', 'payment_mode', 'transaction_ref', 'remarks', 'created_by'
+    )
+    
+    def rows():
+        for row in _iterate(payments, progress):
+            (receipt_no, payment_date, first_name, middle_name, last_name, form_no, course, batch,
+             amount_paid, payment_mode, transaction_ref, remarks, created_by) = row
+            yield [
+                receipt_no,
+                payment_date.strftime('%d/%m/%Y'),
+                f"{first_name} {middle_name} {last_name}",
+                form_no,
+                course,
+                batch,
+                float(amount_paid),
+                payment_mode,
+                transaction_ref or 'N/A',
+                remarks or 'N/A',
+                created_by or 'N/A'
+            ]
+    
+    sheet = Sheet("Payment History", [
+        'Receipt No', 'Payment Date', 'Student Name', 'Form No',
+        'Course', 'Batch', 'Amount Paid', 'Payment Mode',
+        'Transaction Ref', 'Remarks', 'Created By'
+    ], rows(), widths={'Receipt No': 20, 'Student Name': 35, 'Transaction Ref': 20, 'Remarks': 30})
+    
+    return f'payment_history_{datetime.now().strftime("%Y%m%d")}.xlsx', [sheet]
+
+
+def bills_export(params, progress=None):
+    from django.db.models import Count
+    from .filters import filter_bills
+    from .models import BillItem
+    
+    date = params.get('date', '')
+    if not date:
+        raise ValueError('Date is required for export')
+    bills = filter_bills(params)
+    
+    # Sheet 1: Bills Summary (item counts come from one grouped query)
+    summary_rows = bills.annotate(items_count=Count('items')).values_list(
+        'receipt_no', 'bill_date', 'customer_name', 'customer_mobile', 'items_count', 'total_amount'
+    )
+    # Sheet 2: Items Details (every item of the selected bills in one joined query)
+    item_rows = BillItem.objects.filter(bill__in=bills.values('id')).order_by(
+        '-bill__bill_date', '-bill__created_at', 'bill_id', 'id'
+    ).values_list(
+        'bill__receipt_no', 'bill__bill_date', 'bill__customer_name',
+        'item_name', 'quantity', 'rate', 'amount'
+    )
+    # Both sheets count towards one progress total
+    bill_count = total = None
+    if progress:
+        bill_count = bills.count()
+        total = bill_count + item_rows.count()
+    
+    summary_sheet = Sheet(
+        "Bills Summary",
+        ['Receipt No', 'Date', 'Customer Name', 'Mobile', 'Items Count', 'Total Amount'],
+        (
+            [
+                receipt_no,
+                bill_date.strftime('%d/%m/%Y'),
+                customer_name,
+                mobile,
+                items_count,
+                float(total_amount)
+            ]
+            for receipt_no, bill_date, customer_name, mobile, items_count, total_amount in _iterate(
+                summary_rows, progress, total=total
+            )
+        ),
+        widths={'Receipt No': 20, 'Customer Name': 30}
+    )
+    
+    items_sheet = Sheet(
+        "Items Details",
+        ['Receipt No', 'Bill Date', 'Customer Name', 'Item Name', 'Quantity', 'Rate', 'Amount'],
+        (
+            [
+                receipt_no,
+                bill_date.strftime('%d/%m/%Y'),
+                customer_name,
+                item_name,
+                float(quantity),
+                float(rate),
+                float(amount)
+            ]
+            for receipt_no, bill_date, customer_name, item_name, quantity, rate, amount in _iterate(
+                item_rows, progress, done=bill_count or 0, total=total
+            )
+        ),
+        widths={'Receipt No': 20, 'Customer Name': 30, 'Item Name': 30},
+        header_color="27AE60"
+    )
+    
+    date_obj = datetime.strptime(date, '%Y-%m-%d')
+    return f"bills_{date_obj.strftime('%d%m%Y')}.xlsx", [summary_sheet, items_sheet]
+
+
+def admissions_export(params, progress=None):
+    """Admissions ticked in the admin, or every row of a filtered changelist
+
+    `changelist` is the admin changelist's query string (filters, search and
+    ordering); `ids` lists rows ticked on one changelist page.
+    """
+    from .admin import changelist_queryset
+    from .models import Admission
+    
+    installment_labels = dict(Admission.INSTALLMENT_CHOICES)
+    if 'changelist' in params:
+        admissions = changelist_queryset(Admission, params['changelist'])
+    else:
+        admissions = Admission.objects.filter(id__in=params.get('ids', [])).order_by('-created_at')
+    admissions = admissions.values_list(
+        'form_no', 'admission_date', 'course_name', 'batch',
+        'first_name', 'middle_name', 'last_name', 'birth_date',
+        'mobile_own', 'mobile_parents', 'address', 'qualification',
+        'total_fees', 'paid_fees', 'installments', 'created_by', 'is_active'
+    )
+    
+    def rows():
+        for row in _iterate(admissions, progress):
+            (form_no, admission_date, course_name, batch, first_name, middle_name, last_name, birth_date,
+             mobile_own, mobile_parents, address, qualification, total_fees, paid_fees,
+             installments, created_by, is_active) = row
+            yield [
+                form_no,
+                admission_date.strftime('%d/%m/%Y'),
+                course_name,
+                batch,
+                first_name,
+                middle_name,
+                last_name,
+                birth_date.strftime('%d/%m/%Y'),
+                mobile_own,
+                mobile_parents or 'N/A',
+                address,
+                qualification,
+                float(total_fees),
+                float(paid_fees),
+                installment_labels.get(installments, installments),
+                created_by or 'N/A',
+                'Active' if is_active else 'Inactive'
+            ]
+    
+    sheet = Sheet("Admissions", [
+        'Form No', 'Admission Date', 'Course', 'Batch',
+        'First Name', 'Middle Name', 'Last Name',
+        'Birth Date', 'Mobile (Own)', 'Mobile (Parents)',
+        'Address', 'Qualification', 'Total Fees', 'Paid Fees',
+        'Installments', 'Created By', 'Status'
+    ], rows(), widths={'Form No': 16, 'Address': MAX_COLUMN_WIDTH})
+    
+    return f"admissions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx", [sheet]
+
+
+EXPORT_BUILDERS = {
+    'enquiries': enquiries_export,
+    'payment_history': payment_history_export,
+    'bills': bills_export,
+    'admissions': admissions_export,
+}
+
+
+def build_export(kind, params, progress=None):
+    """Run the builder for an export kind and return (filename, sheets)"""
+    return EXPORT_BUILDERS[kind](params, progress)
@@ -0,0 +1,84 @@
+# core/filters.py
+"""Query filters shared by the list APIs, exports and export jobs"""
+
+from django.db.models import Q
+
+from .models import Enquiry, Payment, Bill
+from .search import name_filter
+
+
+# Orderings offered by the enquiry listing; `id` keeps pages stable on ties
+ENQUIRY_SORTS = {
+    'newest': ('-created_at', '-id'),
+    'oldest': ('created_at', 'id'),
+    'name': ('student_name', 'id'),
+    'enquiry_no': ('enquiry_no',),
+}
+
+
+def prefix_range(field, prefix):
+    """Prefix match written as a range so SQLite can use the column's index
+
+    SQLite's case-insensitive LIKE cannot use an ordinary index, but
+    `field >= 'abc' AND field < 'abd'` can.
+    """
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return Q(**{f'{field}__gte': prefix, f'{field}__lt': upper})
+
+
+def filter_enquiries(params):
+    """Enquiries matching the search term and course filter
+
+    A term of digits matches the start of the mobile number, a term
+    starting with ENQ matches the start of the enquiry number and anything
+    else matches part of the student name.
+    """
+    q = params.get('q', '').strip()
+    course = params.get('course', '')
+    
+    enquiries = Enquiry.objects.all()
+    
+    if course:
+        enquiries = enquiries.filter(course=course)
+    if q:
+        if q.isdigit():
+            enquiries = enquiries.filter(prefix_range('mobile_no', q))
+        elif q.upper().startswith('ENQ'):
+            enquiries = enquiries.filter(prefix_range('enquiry_no', q.upper()))
+        else:
+            enquiries = enquiries.filter(student_name__icontains=q)
+    
+    return enquiries
+
+
+def filter_payments(params):
+    """Payments matching the course, batch and student name filters"""
+    course = params.get('course', '')
+    batch = params.get('batch', '')
+    student_name = params.get('student_name', '').strip()
+    
+    payments = Payment.objects.all()
+    
+    if course:
+        payments = payments.filter(admission__course_name=course)
+    if batch:
+        payments = payments.filter(admission__batch=batch)
+    if student_name:
+        payments = payments.filter(name_filter(student_name))
+    
+    return payments
+
+
+def filter_bills(params):
+    """Bills of one date, optionally narrowed by customer name"""
+    date = params.get('date', '')
+    customer = params.get('customer', '').strip().lower()
+    
+    # Filter bills by date
+    bills = Bill.objects.filter(bill_date=date)
+    
+    # Filter by customer name if provided
+    if customer:
+        bills = bills.filter(Q(customer_name__icontains=customer))
+    
+    return bills
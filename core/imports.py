@@ -0,0 +1,136 @@
+# core/imports.py
+"""Bulk admission import from XLSX or CSV sheets"""
+
+import csv
+import io
+import re
+from datetime import datetime
+
+import openpyxl
+from django.db import transaction
+
+from .admissions import clean_admission, InvalidAdmissionError, REQUIRED_FIELDS
+from .caching import bump_versions, ADMISSIONS
+from .models import Admission, DocumentSequence
+from .summaries import refresh_summary_buckets
+
+IMPORT_CHUNK_SIZE = 500
+
+# Column headings understood by the importer, after normalising (lower case,
+# words joined by underscores). Both the form's field names and the headings
+# of the admissions export are accepted.
+COLUMN_ALIASES = {
+    'admission_date': 'admission_date',
+    'date': 'admission_date',
+    'batch': 'batch',
+    'course': 'course_name',
+    'course_name': 'course_name',
+    'first_name': 'first_name',
+    'middle_name': 'middle_name',
+    'last_name': 'last_name',
+    'birth_date': 'birth_date',
+    'date_of_birth': 'birth_date',
+    'mobile': 'mobile_own',
+    'mobile_own': 'mobile_own',
+    'mobile_parents': 'mobile_parents',
+    'address': 'address',
+    'qualification': 'qualification',
+    'installment': 'installment',
+    'installments': 'installment',
+    'total_fees': 'total_fees',
+}
+
+
+def normalise_heading(heading):
+    return re.sub(r'[^a-z0-9]+', '_', str(heading or '').lower()).strip('_')
+
+
+def read_rows(source, filename):
+    """Yield (row_number, {field: value}) from an XLSX or CSV file
+
+    XLSX files are read with openpyxl's read-only mode, so rows are streamed
+    rather than loading the whole sheet. Blank rows are skipped.
+    """
+    if filename.lower().endswith('.csv'):
+        if isinstance(source, (str, bytes)) or hasattr(source, '__fspath__'):
+            handle = open(source, newline='', encoding='utf-8-sig')
+        else:
+            handle = io.TextIOWrapper(source, encoding='utf-8-sig', newline='')
+        rows = csv.reader(handle)
+        close = handle.close
+    else:
+        workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        close = workbook.close
+
+    try:
+        headings = next(rows, None)
+        if headings is None:
+            raise InvalidAdmissionError('The file is empty')
+        columns = [COLUMN_ALIASES.get(normalise_heading(heading)) for heading in headings]
+        missing = [field for field in REQUIRED_FIELDS if field not in columns]
+        if missing:
+            raise InvalidAdmissionError(f"Missing columns: {', '.join(missing)}")
+
+        for row_number, row in enumerate(rows, 2):
+            if not any(value not in (None, '') for value in row):
+                continue
+            yield row_number, {
+                field: value for field, value in zip(columns, row) if field
+            }
+    finally:
+        close()
+
+
+def import_admissions(source, filename, created_by=None, dry_run=False, skip_invalid=False,
+                      chunk_size=IMPORT_CHUNK_SIZE):
+    """Validate and insert every admission of a sheet
+
+    Nothing is written if any row is invalid, unless `skip_invalid` is set,
+    in which case the valid rows are imported and the rest reported. Form
+    numbers for the whole sheet are reserved with one counter update and the
+    rows are inserted with chunked bulk inserts in one transaction.
+
+    Returns a report dict with the row counts, the form numbers assigned and
+    a list of {'row': n, 'error': message} entries.
+    """
+    cleaned_rows = []
+    errors = []
+    total_rows = 0
+
+    for row_number, data in read_rows(source, filename):
+        total_rows += 1
+        try:
+            cleaned_rows.append(clean_admission(data))
+        except InvalidAdmissionError as e:
+            errors.append({'row': row_number, 'error': str(e)})
+
+    report = {
+        'total_rows': total_rows,
+        'valid_rows': len(cleaned_rows),
+        'imported': 0,
+        'first_form_no': None,
+        'last_form_no': None,
+        'errors': errors,
+    }
+    if dry_run or not cleaned_rows or (errors and not skip_invalid):
+        return report
+
+    with transaction.atomic():
+        form_numbers = DocumentSequence.reserve(
+            'SSC', datetime.now().strftime('%Y'), len(cleaned_rows), width=4
+        )
+        Admission.objects.bulk_create([
+            Admission(form_no=form_no, created_by=created_by, **cleaned)
+            for form_no, cleaned in zip(form_numbers, cleaned_rows)
+        ], batch_size=chunk_size)
+
+        # bulk_create sends no signals, so refresh the derived data here
+        refresh_summary_buckets({
+            (row['admission_date'].year, row['admission_date'].month, row['course_name'], row['batch'])
+            for row in cleaned_rows
+        })
+        bump_versions(ADMISSIONS)
+
+    report.update(imported=len(cleaned_rows), first_form_no=form_numbers[0], last_form_no=form_numbers[-1])
+    return report
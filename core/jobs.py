@@ -0,0 +1,110 @@
+# core/jobs.py
+"""Background export jobs: queueing, running and expiry"""
+
+import os
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .exports import build_export, build_workbook, EXPORT_BUILDERS
+from .models import ExportJob
+from .routers import read_only_queries
+
+EXPORT_DIR = 'exports'
+PROGRESS_INTERVAL = 1.0  # seconds between progress writes
+
+
+def export_job_ttl():
+    return timedelta(hours=getattr(settings, 'EXPORT_JOB_TTL_HOURS', 24))
+
+
+def job_file_path(job):
+    return os.path.join(settings.MEDIA_ROOT, job.file_name)
+
+
+def enqueue_export(kind, params, created_by=None):
+    """Queue an export for the worker and return the job"""
+    if kind not in EXPORT_BUILDERS:
+        raise ValueError(f'Unknown export type: {kind}')
+    return ExportJob.objects.create(kind=kind, params=params, created_by=created_by)
+
+
+def claim_next_job():
+    """Atomically take the oldest pending job, or return None"""
+    while True:
+        job = ExportJob.objects.filter(status='PENDING').order_by('created_at').first()
+        if job is None:
+            return None
+        
+        # Only one worker can move the job out of PENDING
+        claimed = ExportJob.objects.filter(pk=job.pk, status='PENDING').update(
+            status='RUNNING', started_at=timezone.now()
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def run_job(job):
+    """Build the job's workbook under MEDIA_ROOT and record the outcome"""
+    last_write = [0.0]
+    
+    def progress(done, total):
+        now = time.monotonic()
+        if now - last_write[0] >= PROGRESS_INTERVAL or done == total:
+            ExportJob.objects.filter(pk=job.pk).update(progress=done, total=total)
+            last_write[0] = now
+    
+    file_name = os.path.join(EXPORT_DIR, f'{job.job_id}.xlsx')
+    path = os.path.join(settings.MEDIA_ROOT, file_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    
+    try:
+        # Progress updates still go to the read-write connection
+        with read_only_queries():
+            download_name, sheets = build_export(job.kind, job.params, progress)
+            
+            # Write to a temporary name so a half-written file is never served
+            tmp_path = f'{path}.part'
+            build_workbook(sheets, tmp_path)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        ExportJob.objects.filter(pk=job.pk).update(
+            status='FAILED', error=str(e), finished_at=timezone.now()
+        )
+        return False
+    
+    finished_at = timezone.now()
+    ExportJob.objects.filter(pk=job.pk).update(
+        status='DONE',
+        file_name=file_name,
+        download_name=download_name,
+        finished_at=finished_at,
+        expires_at=finished_at + export_job_ttl()
+    )
+    return True
+
+
+def cleanup_expired_jobs():
+    """Delete expired jobs and their files; fail jobs stuck in RUNNING"""
+    now = timezone.now()
+    
+    expired = ExportJob.objects.filter(expires_at__lt=now)
+    for job in expired:
+        if job.file_name:
+            try:
+                os.remove(job_file_path(job))
+            except FileNotFoundError:
+                pass
+    deleted, _ = expired.delete()
+    
+    # A job running longer than its TTL belongs to a worker that died
+    ExportJob.objects.filter(status='RUNNING', started_at__lt=now - export_job_ttl()).update(
+        status='FAILED', error='Export worker stopped before finishing', finished_at=now,
+        expires_at=now + export_job_ttl()
+    )
+    
+    return deleted
@@ -0,0 +1,235 @@
+"""
+Compare the sync and async versions of the JSON read APIs under ASGI.
+
+Requests go straight into Django's ASGI application, as an ASGI server
+would pass them, with --concurrency requests in flight at a time. Each
+API is served by its sync view (which Django runs on a thread) and by
+its async view from core/async_views.py. The report gives requests per
+second, latency, the Python memory allocated per in-flight request and
+the most threads alive at once.
+
+Every request carries a unique query string, so the response cache is
+missed unless --warm is given, and receipts are fetched in turn from the
+newest payments so the render cache is missed too.
+
+Usage:
+    python manage.py seed_benchmark_data
+    python manage.py bench_async_views --requests 500 --concurrency 50
+"""
+
+import asyncio
+import json
+import tempfile
+import threading
+import tracemalloc
+from http.cookies import SimpleCookie
+from importlib import import_module
+from urllib.parse import urlencode
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.urls import path
+
+from backend import urls
+from core import async_views, views
+from core.benchmarking import database_file, scratch_metrics, timing_summary, Stopwatch
+from core.models import Payment
+from core.render_cache import render_cache
+from core.management.commands.run_benchmarks import benchmark_endpoints
+
+VARIANTS = {'sync': views, 'async': async_views}
+
+
+def has_async_version(pattern):
+    view = getattr(async_views, getattr(getattr(pattern, 'callback', None), '__name__', ''), None)
+    return iscoroutinefunction(view)
+
+
+class BenchmarkURLConf:
+    """Every API with an async version, once per variant: /sync/api/... and /async/api/..."""
+    urlpatterns = [
+        path(f'{variant}/{pattern.pattern}', getattr(module, pattern.callback.__name__))
+        for variant, module in VARIANTS.items()
+        for pattern in urls.urlpatterns if has_async_version(pattern)
+    ]
+
+
+async def asgi_request(application, method, url, query, body, cookie):
+    """Send one HTTP request into the ASGI application; return (status, body)"""
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': url,
+        'raw_path': url.encode(),
+        'root_path': '',
+        'query_string': query.encode(),
+        'headers': [
+            (b'host', b'testserver'),
+            (b'cookie', cookie.encode()),
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+        ],
+        'client': ('127.0.0.1', 50000),
+        'server': ('testserver', 80),
+    }
+    received = asyncio.Event()
+    response = {'status': None, 'body': []}
+
+    async def receive():
+        if not received.is_set():
+            received.set()
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+        # Django listens for a disconnect while the view runs; the client stays
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+        elif message['type'] == 'http.response.body':
+            response['body'].append(message.get('body', b''))
+
+    await application(scope, receive, send)
+    return response['status'], b''.join(response['body'])
+
+
+class ThreadSampler:
+    """Highest number of live threads seen while the block runs"""
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.peak = threading.active_count()
+
+    async def _sample(self):
+        while True:
+            self.peak = max(self.peak, threading.active_count())
+            await asyncio.sleep(self.interval)
+
+    async def __aenter__(self):
+        self.task = asyncio.create_task(self._sample())
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.task.cancel()
+        return False
+
+
+class Command(BaseCommand):
+    help = 'Requests per second and memory per in-flight request of the sync and async JSON APIs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database-file', default=str(settings.BASE_DIR / 'benchmark.sqlite3'),
+                            help='SQLite file filled by seed_benchmark_data')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per API and variant')
+        parser.add_argument('--concurrency', type=int, default=20, help='Requests in flight at a time')
+        parser.add_argument('--warm', action='store_true', help='Let repeated requests hit the response cache')
+        parser.add_argument('--only', action='append', default=[], help='Benchmark only these APIs')
+
+    def handle(self, *args, **options):
+        render_dir = tempfile.TemporaryDirectory()
+        original_render_dir = render_cache.directory
+        render_cache.directory = render_dir.name
+
+        try:
+            with database_file(options['database_file']), scratch_metrics(), override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'], ROOT_URLCONF=BenchmarkURLConf
+            ):
+                endpoints = self._endpoints(options)
+                application = get_asgi_application()
+                cookie = self._session_cookie()
+                rows = []
+                for name, method, url, params in endpoints:
+                    for variant in VARIANTS:
+                        render_cache.clear()
+                        rows.append(asyncio.run(self._measure(
+                            application, cookie, name, variant, method, f'/{variant}{url}', params, options
+                        )))
+        finally:
+            render_cache.directory = original_render_dir
+            render_dir.cleanup()
+
+        self.stdout.write(f"{'api':<32} {'variant':<7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+                          f"{'KB/req':>8} {'threads':>8}")
+        for row in rows:
+            self.stdout.write(
+                f"{row['api']:<32} {row['variant']:<7} {row['rps']:>8.1f} {row['p50_ms']:>8.1f} "
+                f"{row['p95_ms']:>8.1f} {row['kb_per_request']:>8.1f} {row['peak_threads']:>8}"
+            )
+
+    def _endpoints(self, options):
+        apis = {f'/{pattern.pattern}' for pattern in urls.urlpatterns if has_async_version(pattern)}
+        endpoints = [endpoint for endpoint in benchmark_endpoints() if endpoint[2] in apis]
+        if options['only']:
+            endpoints = [endpoint for endpoint in endpoints if endpoint[0] in options['only']]
+        if not endpoints:
+            raise CommandError('No API to benchmark')
+        self.receipts = list(
+            Payment.objects.order_by('-id').values_list('receipt_no', flat=True)[:options['requests']]
+        )
+        return endpoints
+
+    def _session_cookie(self):
+        session = import_module(settings.SESSION_ENGINE).SessionStore()
+        session['student_id'] = 'benchmark'
+        session['student_name'] = 'Benchmark'
+        session.save()
+        cookie = SimpleCookie()
+        cookie[settings.SESSION_COOKIE_NAME] = session.session_key
+        return cookie.output(header='', attrs=[]).strip()
+
+    def _request_args(self, number, method, params, options):
+        """(query string, body) of the number-th request"""
+        params = dict(params)
+        if 'receipt_no' in params:
+            params['receipt_no'] = self.receipts[number % len(self.receipts)]
+        elif not options['warm'] and method == 'GET':
+            params['_'] = number
+        if method == 'POST':
+            return '', json.dumps(params).encode()
+        return urlencode(params), b''
+
+    async def _measure(self, application, cookie, name, variant, method, url, params, options):
+        latencies = []
+        slots = asyncio.Semaphore(options['concurrency'])
+
+        async def one(number):
+            query, body = self._request_args(number, method, params, options)
+            async with slots:
+                with Stopwatch() as sw:
+                    status, content = await asgi_request(application, method, url, query, body, cookie)
+            if status != 200 or b'"success": true' not in content[:32]:
+                raise CommandError(f'{variant} {name} answered {status}: {content[:200]!r}')
+            latencies.append(sw.elapsed)
+
+        # One untimed request fills the import and connection caches
+        await one(0)
+        latencies.clear()
+
+        async with ThreadSampler() as threads:
+            with Stopwatch() as total:
+                await asyncio.gather(*(one(number) for number in range(1, options['requests'] + 1)))
+
+        # One burst of --concurrency requests under tracemalloc, so tracing does not skew the timings
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            await asyncio.gather(*(one(number) for number in range(options['concurrency'])))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        summary = timing_summary(latencies)
+        return {
+            'api': name,
+            'variant': variant,
+            'rps': options['requests'] / total.elapsed,
+            'p50_ms': summary['p50_ms'],
+            'p95_ms': summary['p95_ms'],
+            'kb_per_request': (peak - baseline) / options['concurrency'] / 1024,
+            'peak_threads': threads.peak,
+        }
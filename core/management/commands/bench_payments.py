@@ -0,0 +1,186 @@
+"""
+Throughput and correctness of the fee payment path under parallel writers.
+
+Each run uses a fresh scratch database and records payments two ways:
+'read-modify-write', as Payment.save did before (read the admission, check
+the remaining fees in Python, save the admission with the new paid_fees),
+and 'conditional', the single UPDATE ... WHERE ROUND(total_fees -
+paid_fees - amount, 2) >= 0 that Payment.save uses now. The report compares throughput,
+latency, lost updates and over-collection.
+
+Usage:
+    python manage.py bench_payments --writers 8 --payments 200 --students 5
+    python manage.py bench_payments --strategy conditional
+"""
+
+import random
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction, OperationalError
+from django.db.models import Sum
+
+from core.benchmarking import scratch_database, timing_summary, Stopwatch
+from core.models import Admission, DocumentSequence, Payment, PaymentExceedsDuesError
+
+STRATEGIES = ('read-modify-write', 'conditional')
+
+
+def read_modify_write_payment(admission_id, amount):
+    """The payment path before the conditional UPDATE, kept for comparison"""
+    with transaction.atomic():
+        admission = Admission.objects.get(pk=admission_id)
+        if amount > admission.get_remaining_fees():
+            raise PaymentExceedsDuesError('Amount cannot exceed remaining fees')
+        payment = Payment(
+            receipt_no=DocumentSequence.next_number('RCP', datetime.now().strftime('%Y%m%d'), width=4),
+            payment_date=date.today(),
+            admission_id=admission_id,
+            amount_paid=amount,
+            payment_mode='CASH',
+        )
+        # Model.save, skipping the conditional update in Payment.save
+        super(Payment, payment).save()
+        admission.paid_fees += amount
+        admission.save()
+
+
+def conditional_payment(admission_id, amount):
+    Payment.objects.create(
+        payment_date=date.today(),
+        admission_id=admission_id,
+        amount_paid=amount,
+        payment_mode='CASH',
+    )
+
+
+PAYMENT_PATHS = {
+    'read-modify-write': read_modify_write_payment,
+    'conditional': conditional_payment,
+}
+
+
+class Command(BaseCommand):
+    help = 'Compare concurrent Payment creation before and after the conditional fee update'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8, help='Number of parallel writer threads')
+        parser.add_argument('--payments', type=int, default=200, help='Payments attempted per writer')
+        parser.add_argument('--students', type=int, default=5,
+                            help='Admissions shared by all writers (fewer means more contention)')
+        parser.add_argument('--total-fees', type=Decimal, default=Decimal('100000.00'),
+                            help='Total fees of each admission')
+        parser.add_argument('--amount', type=Decimal, default=Decimal('100.00'),
+                            help='Amount of each payment')
+        parser.add_argument('--strategy', choices=STRATEGIES + ('both',), default='both',
+                            help='Payment path to run (default: both, for a before/after comparison)')
+
+    def handle(self, *args, **options):
+        strategies = STRATEGIES if options['strategy'] == 'both' else (options['strategy'],)
+        attempts = options['writers'] * options['payments']
+        self.stdout.write(f"Writers: {options['writers']}  Attempts: {attempts}  Students: {options['students']}")
+
+        rows = []
+        for strategy in strategies:
+            with scratch_database():
+                admission_ids = self._seed(options['students'], options['total_fees'])
+                results = self._run(PAYMENT_PATHS[strategy], admission_ids, options)
+                rows.append(self._report(strategy, admission_ids, results))
+
+        self.stdout.write(f"{'strategy':<18} {'payments/s':>10} {'p50':>9} {'p95':>9} {'recorded':>9} "
+                          f"{'rejected':>9} {'errors':>7} {'lost':>12} {'over':>5}")
+        for row in rows:
+            self.stdout.write(f"{row['strategy']:<18} {row['throughput']:>10.1f} {row['p50_ms']:>7.1f}ms "
+                              f"{row['p95_ms']:>7.1f}ms {row['ok']:>9} {row['rejected']:>9} {row['errors']:>7} "
+                              f"{row['lost']:>12} {row['over_collected']:>5}")
+        for row in rows:
+            if row['lost'] or row['over_collected']:
+                self.stdout.write(self.style.ERROR(
+                    f"{row['strategy']}: ledger inconsistent, ₹{row['lost']} of payments missing from paid_fees, "
+                    f"{row['over_collected']} admission(s) over-collected"))
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f"{row['strategy']}: ledger consistent, no lost updates, no over-collection"))
+
+    def _seed(self, count, total_fees):
+        admission_ids = []
+        for i in range(count):
+            admission = Admission.objects.create(
+                admission_date=date.today(),
+                batch=date.today().strftime('%Y-%m'),
+                course_name='MS-CIT',
+                first_name=f'Bench{i}',
+                middle_name='Load',
+                last_name='Test',
+                birth_date=date(2005, 1, 1),
+                mobile_own=f'9{i:09d}',
+                address='Benchmark',
+                qualification='HSC',
+                installments='1',
+                total_fees=total_fees,
+            )
+            admission_ids.append(admission.id)
+        return admission_ids
+
+    def _run(self, pay, admission_ids, options):
+        results = {'latencies': [], 'ok': 0, 'rejected': 0, 'locked': 0, 'failed': 0}
+        lock = threading.Lock()
+        start = threading.Barrier(options['writers'])
+
+        def writer(seed):
+            rng = random.Random(seed)
+            local = {'latencies': [], 'ok': 0, 'rejected': 0, 'locked': 0, 'failed': 0}
+            start.wait()
+            try:
+                for _ in range(options['payments']):
+                    with Stopwatch() as sw:
+                        try:
+                            pay(rng.choice(admission_ids), options['amount'])
+                            local['ok'] += 1
+                        except PaymentExceedsDuesError:
+                            local['rejected'] += 1
+                        except OperationalError:
+                            local['locked'] += 1
+                        except Exception:
+                            local['failed'] += 1
+                    local['latencies'].append(sw.elapsed)
+            finally:
+                connections.close_all()
+            with lock:
+                for key, value in local.items():
+                    results[key] += value
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(options['writers'])]
+        with Stopwatch() as sw:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        results['elapsed'] = sw.elapsed
+        return results
+
+    def _report(self, strategy, admission_ids, results):
+        admissions = Admission.objects.filter(id__in=admission_ids)
+        paid_total = admissions.aggregate(total=Sum('paid_fees'))['total'] or Decimal('0')
+        ledger = dict(
+            Payment.objects.filter(admission_id__in=admission_ids)
+            .values('admission_id').annotate(total=Sum('amount_paid')).values_list('admission_id', 'total')
+        )
+        # Judged from the payments, which a lost update leaves out of paid_fees
+        over_collected = sum(1 for a in admissions if ledger.get(a.id, 0) > a.total_fees)
+        summary = timing_summary(results['latencies'])
+
+        return {
+            'strategy': strategy,
+            'throughput': results['ok'] / results['elapsed'],
+            'p50_ms': summary['p50_ms'],
+            'p95_ms': summary['p95_ms'],
+            'ok': results['ok'],
+            'rejected': results['rejected'],
+            # Database locked or any other failure
+            'errors': results['locked'] + results['failed'],
+            'lost': sum(ledger.values(), Decimal('0')) - paid_total,
+            'over_collected': over_collected,
+        }
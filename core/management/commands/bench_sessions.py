@@ -0,0 +1,83 @@
+"""
+Database queries per authenticated read under each session engine.
+
+Usage:
+    python manage.py bench_sessions --requests 50
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from core.benchmarking import scratch_database, scratch_metrics, timing_summary, Stopwatch
+from core.models import Student
+from core.routers import READ_ALIAS
+
+READ_URLS = [
+    '/dashboard/',
+    '/enquiry-data/',
+    '/api/get-enquiries/',
+    '/api/get-admitted-students/',
+    '/api/get-bills/',
+]
+
+EMAIL = 'bench@example.com'
+PASSWORD = 'bench-password'
+
+
+class Command(BaseCommand):
+    help = 'Count the database queries each session engine adds to authenticated reads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help='Requests per URL and engine')
+
+    def handle(self, *args, **options):
+        with scratch_database(), scratch_metrics(), override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            Student.objects.create(
+                name='Bench User', mobile='9000000000', email=EMAIL, password=PASSWORD
+            )
+            rows = [self._measure(name, engine, options['requests'])
+                    for name, engine in settings.SESSION_ENGINES.items()]
+
+        self.stdout.write(f"{'engine':<8} {'requests':>8} {'queries/req':>12} {'session/req':>12} "
+                          f"{'p50 ms':>8} {'p95 ms':>8}")
+        for row in rows:
+            self.stdout.write(f"{row['engine']:<8} {row['requests']:>8} {row['queries']:>12.2f} "
+                              f"{row['session']:>12.2f} {row['p50_ms']:>8} {row['p95_ms']:>8}")
+
+    def _measure(self, name, engine, count):
+        caches[settings.SESSION_CACHE_ALIAS].clear()
+        with override_settings(SESSION_ENGINE=engine):
+            client = Client()
+            response = client.post('/login/', {'email': EMAIL, 'password': PASSWORD})
+            if response.status_code != 302:
+                raise RuntimeError(f'Login failed with the {name} session engine')
+
+            queries = session_queries = 0
+            latencies = []
+            for _ in range(count):
+                for url in READ_URLS:
+                    # Read-only views query through the read-only alias
+                    with CaptureQueriesContext(connections['default']) as writes, \
+                            CaptureQueriesContext(connections[READ_ALIAS]) as reads, Stopwatch() as sw:
+                        response = client.get(url)
+                    captured = [*writes, *reads]
+                    if response.status_code != 200:
+                        raise RuntimeError(f'{url} answered {response.status_code} with the {name} session engine')
+                    latencies.append(sw.elapsed)
+                    queries += len(captured)
+                    session_queries += sum('django_session' in query['sql'] for query in captured)
+
+        requests = count * len(READ_URLS)
+        summary = timing_summary(latencies)
+        return {
+            'engine': name,
+            'requests': requests,
+            'queries': queries / requests,
+            'session': session_queries / requests,
+            'p50_ms': summary['p50_ms'],
+            'p95_ms': summary['p95_ms'],
+        }
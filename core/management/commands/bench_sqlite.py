@@ -0,0 +1,166 @@
+"""
+Mixed read/write throughput of SQLite with the plain and the tuned profile.
+
+Cashier-style writers record payments while readers run report queries,
+first with SQLite's defaults (rollback journal, deferred transactions, a
+connection per request, every read on the writer's connection) and then
+with backend/database.py (WAL, busy timeout, BEGIN IMMEDIATE, persistent
+connections, reads on the read-only connection).
+
+Usage:
+    python manage.py bench_sqlite --writers 4 --readers 4 --seconds 5
+"""
+
+import threading
+import time
+from contextlib import nullcontext
+from datetime import date
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connections, OperationalError
+from django.db.models import Sum
+
+from backend.database import CONN_MAX_AGE
+from core.benchmarking import scratch_database, timing_summary
+from core.models import Admission, Payment
+from core.routers import read_only_queries, READ_ALIAS
+
+
+class Command(BaseCommand):
+    help = 'Compare concurrent payment and report throughput with and without the SQLite profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=4, help='Threads recording payments')
+        parser.add_argument('--readers', type=int, default=4, help='Threads running report queries')
+        parser.add_argument('--seconds', type=float, default=5, help='Duration of each run')
+        parser.add_argument('--students', type=int, default=50, help='Admissions in the scratch database')
+        parser.add_argument('--payments', type=int, default=5000, help='Payments seeded before the runs')
+
+    def handle(self, *args, **options):
+        with scratch_database():
+            default = connections['default'].settings_dict
+            tuned = {key: default[key] for key in ('OPTIONS', 'CONN_MAX_AGE')}
+            admission_ids = self._seed(options['students'], options['payments'])
+
+            rows = []
+            for profile in ('plain', 'tuned'):
+                connections.close_all()
+                if profile == 'plain':
+                    default.update(OPTIONS={}, CONN_MAX_AGE=0)
+                    journal_mode = 'DELETE'
+                else:
+                    default.update(tuned)
+                    journal_mode = 'WAL'
+                with connections['default'].cursor() as cursor:
+                    cursor.execute(f'PRAGMA journal_mode={journal_mode}')
+                connections.close_all()
+                rows.append(self._run(profile, admission_ids, options))
+            default.update(tuned)
+
+        self.stdout.write(f"Writers: {options['writers']}  Readers: {options['readers']}  "
+                          f"Seconds per run: {options['seconds']}")
+        self.stdout.write(f"{'profile':<8} {'writes/s':>9} {'reads/s':>9} {'write p95':>10} "
+                          f"{'read p95':>9} {'locked':>7} {'failed':>7}")
+        for row in rows:
+            self.stdout.write(f"{row['profile']:<8} {row['writes_per_s']:>9.1f} {row['reads_per_s']:>9.1f} "
+                              f"{row['write_p95_ms']:>8.1f}ms {row['read_p95_ms']:>7.1f}ms "
+                              f"{row['locked']:>7} {row['failed']:>7}")
+
+    def _seed(self, students, payments):
+        admission_ids = [
+            Admission.objects.create(
+                admission_date=date.today(),
+                batch=date.today().strftime('%Y-%m'),
+                course_name='MS-CIT',
+                first_name=f'Bench{i}',
+                middle_name='Load',
+                last_name='Test',
+                birth_date=date(2005, 1, 1),
+                mobile_own=f'9{i:09d}',
+                address='Benchmark',
+                qualification='HSC',
+                installments='1',
+                total_fees=Decimal('10000000.00'),
+            ).id
+            for i in range(students)
+        ]
+        Payment.objects.bulk_create([
+            Payment(
+                receipt_no=f'SEED{i:08d}',
+                payment_date=date.today(),
+                admission_id=admission_ids[i % len(admission_ids)],
+                amount_paid=Decimal('100.00'),
+                payment_mode='CASH',
+            )
+            for i in range(payments)
+        ], batch_size=1000)
+        return admission_ids
+
+    def _run(self, profile, admission_ids, options):
+        routed = profile == 'tuned'
+        persistent = routed and CONN_MAX_AGE
+        totals = {'write': [], 'read': [], 'locked': 0, 'failed': 0}
+        lock = threading.Lock()
+        start = threading.Barrier(options['writers'] + options['readers'])
+        deadline = [0.0]
+
+        def write(n):
+            Payment.objects.create(
+                payment_date=date.today(),
+                admission_id=admission_ids[n % len(admission_ids)],
+                amount_paid=Decimal('1.00'),
+                payment_mode='CASH',
+            )
+
+        def read(n):
+            admission_id = admission_ids[n % len(admission_ids)]
+            with read_only_queries() if routed else nullcontext():
+                list(Payment.objects.filter(admission_id=admission_id)
+                     .select_related('admission').order_by('-payment_date', '-id')[:50])
+                Payment.objects.aggregate(total=Sum('amount_paid'))
+
+        def worker(kind, operation, seed):
+            latencies, locked, failed = [], 0, 0
+            n = seed
+            start.wait()
+            try:
+                while time.perf_counter() < deadline[0]:
+                    began = time.perf_counter()
+                    try:
+                        operation(n)
+                        latencies.append(time.perf_counter() - began)
+                    except OperationalError:
+                        locked += 1
+                    except Exception:
+                        failed += 1
+                    n += 1
+                    if not persistent:
+                        # What the end of a request does with CONN_MAX_AGE = 0
+                        connections['default'].close()
+                        connections[READ_ALIAS].close()
+            finally:
+                connections.close_all()
+            with lock:
+                totals[kind].extend(latencies)
+                totals['locked'] += locked
+                totals['failed'] += failed
+
+        threads = [threading.Thread(target=worker, args=('write', write, i)) for i in range(options['writers'])]
+        threads += [threading.Thread(target=worker, args=('read', read, i)) for i in range(options['readers'])]
+        deadline[0] = time.perf_counter() + options['seconds'] + 0.1
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return {
+            'profile': profile,
+            'writes_per_s': len(totals['write']) / options['seconds'],
+            'reads_per_s': len(totals['read']) / options['seconds'],
+            'write_p95_ms': timing_summary(totals['write'])['p95_ms'],
+            'read_p95_ms': timing_summary(totals['read'])['p95_ms'],
+            'locked': totals['locked'],
+            'failed': totals['failed'],
+        }
+
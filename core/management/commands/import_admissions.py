@@ -0,0 +1,63 @@
+"""
+Import admissions from an XLSX or CSV sheet.
+
+Usage:
+    python manage.py import_admissions batch.xlsx
+    python manage.py import_admissions batch.csv --dry-run
+    python manage.py import_admissions batch.xlsx --skip-invalid --created-by "Front Desk"
+
+The first row holds the column headings: Admission Date, Batch, Course,
+First Name, Middle Name, Last Name, Birth Date, Mobile (Own),
+Mobile (Parents), Address, Qualification, Installments and optionally
+Total Fees (the layout of the admissions export).
+"""
+
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.admissions import InvalidAdmissionError
+from core.benchmarking import Stopwatch
+from core.imports import import_admissions
+
+
+class Command(BaseCommand):
+    help = 'Bulk import admissions from an XLSX or CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path to the .xlsx or .csv file')
+        parser.add_argument('--dry-run', action='store_true', help='Validate only, write nothing')
+        parser.add_argument('--skip-invalid', action='store_true',
+                            help='Import the valid rows even if some rows are invalid')
+        parser.add_argument('--created-by', default='Import', help='Value stored in created_by')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f'File not found: {path}')
+
+        try:
+            with Stopwatch() as sw:
+                report = import_admissions(
+                    path, os.path.basename(path),
+                    created_by=options['created_by'],
+                    dry_run=options['dry_run'],
+                    skip_invalid=options['skip_invalid']
+                )
+        except InvalidAdmissionError as e:
+            raise CommandError(str(e))
+
+        for error in report['errors']:
+            self.stdout.write(self.style.ERROR(f"Row {error['row']}: {error['error']}"))
+
+        self.stdout.write(f"Rows: {report['total_rows']}  Valid: {report['valid_rows']}  "
+                          f"Invalid: {len(report['errors'])}  ({sw.elapsed:.2f}s)")
+
+        if report['imported']:
+            self.stdout.write(self.style.SUCCESS(
+                f"Imported {report['imported']} admission(s): {report['first_form_no']} to {report['last_form_no']}"))
+        elif options['dry_run']:
+            self.stdout.write('Dry run: nothing was imported')
+        else:
+            self.stdout.write(self.style.WARNING(
+                'Nothing was imported. Fix the rows above or use --skip-invalid.'))
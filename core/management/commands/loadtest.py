@@ -0,0 +1,357 @@
+"""
+Replay cashier and front-desk workflows against a running server with many concurrent users.
+
+Each virtual user logs in once and then repeats a workflow until the time
+is up. Cashiers search a student, record a fee payment and load the
+payment history. Front desks create an enquiry and a bill. Every request
+is classified: ok, locked ("database is locked"), unique (UNIQUE
+constraint), rejected (refused by validation, e.g. over the dues),
+throttled (429) or error.
+
+With --start-server a development server is started on a benchmark
+database file (see seed_benchmark_data) and every virtual user gets its
+own login, so the per-email login throttle does not hold them back.
+Otherwise pass the URL and the credentials of an existing account that
+all users share; note that the test writes real payments, enquiries and
+bills.
+
+Usage:
+    python manage.py loadtest --start-server --users 20 --duration 30
+    python manage.py loadtest --url http://127.0.0.1:8000 --email desk@example.com --password secret
+"""
+
+import html
+import http.cookiejar
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.management.base import BaseCommand, CommandError
+from django.http import HttpRequest
+
+from core.benchmarking import database_file, percentile
+from core.models import Student
+from core.management.commands.seed_benchmark_data import FIRST_NAMES, LAST_NAMES
+
+OUTCOMES = ('ok', 'locked', 'unique', 'rejected', 'throttled', 'error')
+
+LOAD_TEST_PASSWORD = 'loadtest-password'
+
+
+def load_test_email(index):
+    return f'loadtest{index}@example.com'
+
+
+def classify(text):
+    """Outcome of a failed request from its error message"""
+    if 'database is locked' in text or 'database table is locked' in text:
+        return 'locked'
+    if 'UNIQUE constraint' in text:
+        return 'unique'
+    if 'exceed' in text or 'required' in text or 'must be' in text:
+        return 'rejected'
+    return 'error'
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Keep redirects as responses: they carry the outcome of form posts"""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class VirtualUser:
+    def __init__(self, base_url, rng):
+        self.base_url = base_url.rstrip('/')
+        self.rng = rng
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies), NoRedirect
+        )
+        # Decodes the messages cookie that form views set on redirect
+        self.messages = CookieStorage(HttpRequest())
+        # What the server said about the last failed step
+        self.detail = ''
+
+    def cookie(self, name):
+        for cookie in self.cookies:
+            if cookie.name == name:
+                return cookie.value
+        return ''
+
+    def request(self, method, path, data=None, json_body=None):
+        """Return (status, headers, body); HTTP errors and redirects are responses too"""
+        headers = {}
+        body = None
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            headers['Content-Type'] = 'application/json'
+        elif data is not None:
+            data = {**data, 'csrfmiddlewaretoken': self.cookie('csrftoken')}
+            body = urllib.parse.urlencode(data).encode()
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        request = urllib.request.Request(self.base_url + path, data=body, headers=headers, method=method)
+        try:
+            with self.opener.open(request, timeout=60) as response:
+                status, headers, body = response.status, response.headers, response.read()
+        except urllib.error.HTTPError as e:
+            status, headers, body = e.code, e.headers, e.read()
+        self.detail = f'{method} {path} answered {status}'
+        return status, headers, body
+
+    def failure(self, text):
+        self.detail = text[:200]
+        return classify(text)
+
+    def forget_messages(self):
+        # Nothing renders the messages between posts, so they would pile up in the cookie
+        for cookie in list(self.cookies):
+            if cookie.name == 'messages':
+                self.cookies.clear(cookie.domain, cookie.path, cookie.name)
+
+    def flash_messages(self):
+        """Texts of the messages the last redirect carried"""
+        value = self.cookie('messages')
+        if not value:
+            return ''
+        decoded = self.messages._decode(urllib.parse.unquote(value.strip('"'))) or []
+        return ' '.join(str(message) for message in decoded)
+
+    def login(self, email, password):
+        self.request('GET', '/login/')
+        status, headers, body = self.request('POST', '/login/', data={'email': email, 'password': password})
+        if status == 429:
+            return 'throttled', float(headers.get('Retry-After', 1))
+        if status == 302 and '/dashboard/' in headers.get('Location', ''):
+            return 'ok', 0
+        raise CommandError(f'Login as {email} failed (HTTP {status})')
+
+    # Each step returns its outcome
+
+    def search_student(self):
+        term = self.rng.choice(FIRST_NAMES)
+        status, _, body = self.request('POST', '/api/search-student-payment/', json_body={'search_term': term})
+        if status != 200:
+            return 'throttled' if status == 429 else self.failure(f'HTTP {status}'), None
+        data = json.loads(body)
+        if not data.get('success'):
+            return self.failure(data.get('error', '')), None
+        students = data['students']
+        return 'ok', self.rng.choice(students) if students else None
+
+    def pay_fees(self, student):
+        remaining = int(student['remaining_fees'])
+        amount = min(remaining, self.rng.choice((100, 200, 500)))
+        self.forget_messages()
+        status, headers, _ = self.request('POST', '/fees-payment/', data={
+            'admission_id': student['id'],
+            'amount_paid': amount,
+            'payment_mode': self.rng.choice(('CASH', 'UPI')),
+        })
+        if status != 302:
+            return self.failure(f'HTTP {status}')
+        if 'receipt=' in headers.get('Location', ''):
+            return 'ok'
+        return self.failure(self.flash_messages())
+
+    def payment_history(self):
+        status, _, body = self.request('GET', '/api/get-payment-history/')
+        if status != 200:
+            return self.failure(f'HTTP {status}')
+        data = json.loads(body)
+        return 'ok' if data.get('success') else self.failure(data.get('error', ''))
+
+    def new_enquiry(self):
+        status, headers, body = self.request('POST', '/new-enquiry/', data={
+            'student_name': f'{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}',
+            'mobile_no': f'9{self.rng.randrange(10 ** 9):09d}',
+            'course': 'MS-CIT',
+            'address': 'Load test',
+        })
+        if status == 302:
+            return 'ok'
+        # The form is rendered again with the error in an alert
+        alert = re.search(r'class="alert alert-error">\s*(.*?)\s*<', body.decode(errors='replace'), re.S)
+        return self.failure(html.unescape(alert.group(1)) if alert else f'HTTP {status} without an error message')
+
+    def new_bill(self):
+        status, _, body = self.request('POST', '/new-bill/', data={
+            'bill_date': time.strftime('%Y-%m-%d'),
+            'customer_name': f'{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}',
+            'customer_mobile': f'9{self.rng.randrange(10 ** 9):09d}',
+            'items': json.dumps([{'item_name': 'Printout', 'quantity': 2, 'rate': 5}]),
+        })
+        if status != 200:
+            return self.failure(f'HTTP {status}')
+        data = json.loads(body)
+        return 'ok' if data.get('success') else self.failure(data.get('error', ''))
+
+
+class Command(BaseCommand):
+    help = 'Load-test the cashier and front-desk workflows with concurrent virtual users'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Base URL of the server under test')
+        parser.add_argument('--start-server', action='store_true',
+                            help='Start a development server on --database-file for the test')
+        parser.add_argument('--database-file', default=str(settings.BASE_DIR / 'benchmark.sqlite3'),
+                            help='Database of the started server')
+        parser.add_argument('--email', help='Account of the server under test, shared by all users')
+        parser.add_argument('--password', default=LOAD_TEST_PASSWORD)
+        parser.add_argument('--users', type=int, default=10, help='Concurrent virtual users')
+        parser.add_argument('--duration', type=float, default=30, help='Seconds of load')
+        parser.add_argument('--cashiers', type=float, default=0.6,
+                            help='Share of users running the cashier workflow; the rest are front desks')
+        parser.add_argument('--think-time', type=float, default=0, help='Pause between workflows, in seconds')
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        if not (options['start_server'] or options['email']):
+            raise CommandError('Pass --email and --password of an account, or --start-server')
+        server = self._start_server(options) if options['start_server'] else None
+        try:
+            results = self._run(options)
+        finally:
+            if server:
+                server.terminate()
+                server.wait(timeout=10)
+                self.metrics_dir.cleanup()
+        self._report(results, options)
+
+    def _start_server(self, options):
+        with database_file(options['database_file']):
+            for index in range(options['users']):
+                if not Student.objects.filter(email=load_test_email(index)).exists():
+                    Student.objects.create(
+                        name=f'Load Test {index}', mobile=f'7000{index:06d}',
+                        email=load_test_email(index), password=options['password']
+                    )
+
+        port = urllib.parse.urlsplit(options['url']).port or 8000
+        # The server's request metrics go to a throwaway directory
+        self.metrics_dir = tempfile.TemporaryDirectory(prefix='ssc_metrics_')
+        env = {
+            **os.environ,
+            'SSC_DATABASE_FILE': options['database_file'],
+            'SSC_METRICS_DIR': self.metrics_dir.name,
+        }
+        server = subprocess.Popen(
+            [sys.executable, 'manage.py', 'runserver', '--noreload', f'127.0.0.1:{port}'],
+            cwd=settings.BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            try:
+                urllib.request.urlopen(f"{options['url']}/login/", timeout=1).close()
+                return server
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.2)
+        server.terminate()
+        raise CommandError('The development server did not start')
+
+    def _run(self, options):
+        results = defaultdict(lambda: {'latencies': [], 'outcomes': defaultdict(int), 'errors': []})
+        lock = threading.Lock()
+        users = options['users']
+        cashiers = round(users * options['cashiers'])
+        logged_in = threading.Barrier(users + 1)
+        stop = threading.Event()
+
+        def timed(user, local, operation, step, *args):
+            start = time.perf_counter()
+            try:
+                value = step(*args)
+            except (urllib.error.URLError, OSError, ValueError) as e:
+                value = ('error', None) if operation == 'search_student' else 'error'
+                user.detail = f'{type(e).__name__}: {e}'
+            outcome = value[0] if isinstance(value, tuple) else value
+            if outcome not in ('ok', 'throttled') and user.detail:
+                local[operation]['errors'].append(user.detail)
+            local[operation]['latencies'].append(time.perf_counter() - start)
+            local[operation]['outcomes'][outcome] += 1
+            return value
+
+        def virtual_user(index):
+            rng = random.Random(options['seed'] * 1000 + index)
+            user = VirtualUser(options['url'], rng)
+            local = defaultdict(lambda: {'latencies': [], 'outcomes': defaultdict(int), 'errors': []})
+            email = options['email'] or load_test_email(index)
+            try:
+                # Logins from one address are throttled; wait as a real desk would
+                while True:
+                    outcome, retry_after = timed(user, local, 'login', user.login, email, options['password'])
+                    if outcome == 'ok':
+                        break
+                    time.sleep(retry_after)
+            finally:
+                logged_in.wait()
+
+            while not stop.is_set():
+                if index < cashiers:
+                    _, student = timed(user, local, 'search_student', user.search_student)
+                    if student and student['remaining_fees'] > 0:
+                        timed(user, local, 'pay_fees', user.pay_fees, student)
+                    timed(user, local, 'payment_history', user.payment_history)
+                else:
+                    timed(user, local, 'new_enquiry', user.new_enquiry)
+                    timed(user, local, 'new_bill', user.new_bill)
+                local['workflow']['outcomes']['ok'] += 1
+                if options['think_time']:
+                    stop.wait(options['think_time'])
+
+            with lock:
+                for operation, data in local.items():
+                    results[operation]['latencies'].extend(data['latencies'])
+                    results[operation]['errors'].extend(data['errors'])
+                    for outcome, count in data['outcomes'].items():
+                        results[operation]['outcomes'][outcome] += count
+
+        threads = [threading.Thread(target=virtual_user, args=(i,), daemon=True) for i in range(users)]
+        for thread in threads:
+            thread.start()
+        logged_in.wait()
+        started = time.perf_counter()
+        stop.wait(options['duration'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        results['elapsed'] = time.perf_counter() - started
+        return results
+
+    def _report(self, results, options):
+        elapsed = results.pop('elapsed')
+        workflows = results.pop('workflow')['outcomes']['ok']
+        requests = sum(
+            sum(data['outcomes'].values()) for operation, data in results.items() if operation != 'login'
+        )
+        self.stdout.write(f"Users: {options['users']}  Duration: {elapsed:.1f}s  "
+                          f"Workflows: {workflows} ({workflows / elapsed:.1f}/s)  "
+                          f"Requests: {requests} ({requests / elapsed:.1f}/s)")
+        self.stdout.write(f"{'operation':<16} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}  "
+                          + '  '.join(f'{outcome:>9}' for outcome in OUTCOMES))
+        for operation, data in results.items():
+            latencies, outcomes = data['latencies'], data['outcomes']
+            count = len(latencies)
+            if not count:
+                continue
+            rates = '  '.join(f'{100 * outcomes[outcome] / count:>8.1f}%' for outcome in OUTCOMES)
+            self.stdout.write(
+                f'{operation:<16} {count:>6} {percentile(latencies, 50) * 1000:>8.1f} '
+                f'{percentile(latencies, 95) * 1000:>8.1f} {percentile(latencies, 99) * 1000:>8.1f} '
+                f'{max(latencies) * 1000:>8.1f}  {rates}'
+            )
+        for operation, data in results.items():
+            for error in sorted(set(data['errors']))[:3]:
+                self.stdout.write(self.style.WARNING(f'{operation}: {error}'))
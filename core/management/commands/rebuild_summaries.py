@@ -0,0 +1,18 @@
+"""
+Recompute the admission summary table from scratch.
+
+Usage:
+    python manage.py rebuild_summaries
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.summaries import rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the AdmissionSummary table from the admissions table'
+
+    def handle(self, *args, **options):
+        count = rebuild_summaries()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} summary row(s)'))
@@ -0,0 +1,60 @@
+"""
+Record UPI/bank statement credits as fee payments.
+
+Usage:
+    python manage.py reconcile_statement statement.csv --dry-run   # preview
+    python manage.py reconcile_statement statement.csv
+
+The CSV needs Date, Amount (or Credit) and Reference (or UTR) columns.
+A line whose reference is already on a payment is reconciled with that
+payment. Other lines are matched to students by a form number (SSC...)
+or a 10-digit mobile number found in the Form No / Mobile columns or the
+narration, and recorded as new payments.
+"""
+
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarking import Stopwatch
+from core.models import PaymentExceedsDuesError
+from core.reconciliation import reconcile_statement, StatementError
+
+
+class Command(BaseCommand):
+    help = 'Match a bank/UPI statement CSV to admissions and record the payments'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path to the statement .csv file')
+        parser.add_argument('--dry-run', action='store_true', help='Show the matches without recording anything')
+        parser.add_argument('--created-by', default='Statement import', help='Value stored in created_by')
+        parser.add_argument('--verbose-lines', action='store_true', help='List matched lines as well')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f'File not found: {path}')
+
+        try:
+            with Stopwatch() as sw:
+                report = reconcile_statement(path, created_by=options['created_by'], dry_run=options['dry_run'])
+        except (StatementError, PaymentExceedsDuesError) as e:
+            raise CommandError(str(e))
+
+        for line in report['lines']:
+            if line['status'] == 'matched':
+                if options['verbose_lines']:
+                    self.stdout.write(f"Row {line['row']}: {line['reference']} ₹{line['amount']} -> "
+                                      f"{line['form_no']} {line['student_name']} {line['receipt_no'] or ''}")
+            else:
+                self.stdout.write(self.style.WARNING(
+                    f"Row {line['row']}: {line['status']} - {line['reason']}"))
+
+        counts = '  '.join(f'{status}: {count}' for status, count in sorted(report['counts'].items()))
+        self.stdout.write(f"Lines: {report['total_lines']}  {counts}  ({sw.elapsed:.2f}s)")
+
+        if options['dry_run']:
+            self.stdout.write(f"Dry run: ₹{report['matched_amount']:.2f} would be recorded")
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Recorded {report['recorded']} payment(s) totalling ₹{report['matched_amount']:.2f}"))
@@ -0,0 +1,232 @@
+"""
+Time every read view, API endpoint and Excel export against a benchmark database.
+
+Each endpoint is requested --runs times through the Django test client,
+logged in as a student and as staff. The JSON report has p50/p95/max
+timings, query counts, response sizes and memory use per endpoint, and
+can be diffed between commits. Endpoints that write (new payments,
+imports, deletes) are left out so the data set stays the same.
+
+Memory per endpoint is the tracemalloc peak of one request (Python
+allocations only) and the resident set size after it. The process RSS
+high-water mark is reported once for the whole run: ru_maxrss never goes
+down, so per endpoint it would only repeat the largest one so far.
+
+Usage:
+    python manage.py seed_benchmark_data
+    python manage.py run_benchmarks --runs 10 --output bench.json
+    python manage.py run_benchmarks --only get_payment_history --only export_bills
+"""
+
+import json
+import os
+import resource
+import subprocess
+import tempfile
+import tracemalloc
+from datetime import date
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from core.benchmarking import database_file, scratch_metrics, timing_summary, Stopwatch
+from core.filters import ENQUIRY_SORTS
+from core.models import Admission, Payment, Enquiry, Bill, BillItem
+from core.render_cache import render_cache
+from core.routers import READ_ALIAS
+from core.views import make_enquiry_cursor
+
+
+def benchmark_endpoints():
+    """(name, method, url, params) of the endpoints to time, using rows from the data set"""
+    payment = Payment.objects.order_by('-id').first()
+    bill = Bill.objects.order_by('-id').first()
+    admission = Admission.objects.order_by('-id').first()
+    if not (payment and bill and admission):
+        raise CommandError('The benchmark database is empty; run seed_benchmark_data first')
+
+    busiest_day = bill.bill_date.isoformat()
+    name = admission.first_name
+    # Cursor of the 10,000th enquiry, or of the last one on a smaller data set
+    deep = list(Enquiry.objects.order_by(*ENQUIRY_SORTS['newest']).values('created_at', 'id')[:10000])
+    deep_cursor = make_enquiry_cursor(deep[-1], 'newest') if deep else ''
+    return [
+        ('home', 'GET', '/', {}),
+        ('login', 'GET', '/login/', {}),
+        ('dashboard', 'GET', '/dashboard/', {}),
+        ('dashboard_last_year', 'GET', '/dashboard/', {'year': date.today().year - 1}),
+        ('enquiry_data', 'GET', '/enquiry-data/', {}),
+        ('get_enquiries', 'GET', '/api/get-enquiries/', {}),
+        ('get_enquiries_by_name', 'GET', '/api/get-enquiries/', {'q': name}),
+        ('get_enquiries_by_mobile', 'GET', '/api/get-enquiries/', {'q': '98'}),
+        ('get_enquiries_deep_page', 'GET', '/api/get-enquiries/', {'cursor': deep_cursor}),
+        ('admitted_students', 'GET', '/admitted-students/', {}),
+        ('students_details', 'GET', '/students-details/', {}),
+        ('get_admitted_students', 'GET', '/api/get-admitted-students/',
+         {'course': admission.course_name, 'batch': admission.batch}),
+        ('search_student_payment', 'POST', '/api/search-student-payment/', {'search_term': name}),
+        ('payment_history', 'GET', '/payment-history/', {}),
+        ('get_payment_history', 'GET', '/api/get-payment-history/', {}),
+        ('get_payment_history_by_student', 'GET', '/api/get-payment-history/', {'student_name': name}),
+        ('get_payment_totals', 'GET', '/api/get-payment-totals/', {}),
+        ('get_receipt_details', 'GET', '/api/get-receipt/', {'receipt_no': payment.receipt_no}),
+        ('bills_list', 'GET', '/bills/', {}),
+        ('get_bills', 'GET', '/api/get-bills/', {'date': busiest_day}),
+        ('print_bill', 'GET', f'/print-bill/{bill.id}/', {}),
+        ('export_enquiries', 'GET', '/export-enquiries/', {}),
+        ('export_payment_history', 'GET', '/export-payment-history/', {}),
+        ('export_bills', 'GET', '/export-bills/', {'date': busiest_day}),
+        ('admin_admissions', 'GET', '/admin/core/admission/', {}),
+        ('admin_payments', 'GET', '/admin/core/payment/', {}),
+        ('admin_bills', 'GET', '/admin/core/bill/', {}),
+        ('admin_enquiries', 'GET', '/admin/core/enquiry/', {}),
+    ]
+
+
+def peak_rss_kb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def current_rss_kb():
+    """Resident set size right now, or None where /proc is not available"""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf('SC_PAGE_SIZE') // 1024
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = 'Time views, APIs and exports against the benchmark database and write a JSON report'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database-file', default=str(settings.BASE_DIR / 'benchmark.sqlite3'),
+                            help='SQLite file filled by seed_benchmark_data')
+        parser.add_argument('--runs', type=int, default=5, help='Timed requests per endpoint')
+        parser.add_argument('--warm', action='store_true',
+                            help='Keep the response and render caches between runs')
+        parser.add_argument('--only', action='append', default=[], help='Benchmark only these endpoints')
+        parser.add_argument('--output', default='benchmark_report.json', help='Where to write the report')
+
+    def handle(self, *args, **options):
+        render_dir = tempfile.TemporaryDirectory()
+        original_render_dir = render_cache.directory
+        render_cache.directory = render_dir.name
+
+        try:
+            with database_file(options['database_file']), scratch_metrics(), \
+                    override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                client = self._login()
+                endpoints = benchmark_endpoints()
+                if options['only']:
+                    endpoints = [endpoint for endpoint in endpoints if endpoint[0] in options['only']]
+                report = {
+                    'commit': git_commit(),
+                    'created_at': timezone.now().isoformat(timespec='seconds'),
+                    'runs': options['runs'],
+                    'warm': options['warm'],
+                    'rows': {
+                        model._meta.db_table: model.objects.count()
+                        for model in (Admission, Payment, Enquiry, Bill, BillItem)
+                    },
+                    'endpoints': {},
+                }
+                for endpoint in endpoints:
+                    result = self._measure(client, *endpoint, options)
+                    report['endpoints'][endpoint[0]] = result
+                    self.stdout.write(
+                        f"{endpoint[0]:<32} p50 {result['p50_ms']:>9.1f}ms  p95 {result['p95_ms']:>9.1f}ms  "
+                        f"max {result['max_ms']:>9.1f}ms  {result['queries']:>3} queries  "
+                        f"{result['response_bytes']:>9} bytes  {result['peak_alloc_kb']:>7}KB allocated"
+                    )
+                report['peak_rss_kb'] = peak_rss_kb()
+        finally:
+            render_cache.directory = original_render_dir
+            render_dir.cleanup()
+
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        self.stdout.write(self.style.SUCCESS(
+            f"Process peak RSS {report['peak_rss_kb'] // 1024}MB; report written to {options['output']}"
+        ))
+
+    def _login(self):
+        staff, created = User.objects.get_or_create(username='benchmark', defaults={
+            'is_staff': True, 'is_superuser': True
+        })
+        client = Client()
+        client.force_login(staff)
+        session = client.session
+        session['student_id'] = 'benchmark'
+        session['student_name'] = 'Benchmark'
+        session.save()
+        client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+        return client
+
+    def _request(self, client, method, url, params):
+        if method == 'POST':
+            response = client.post(url, json.dumps(params), content_type='application/json')
+        else:
+            response = client.get(url, params)
+        # Streamed files are only produced while the body is read
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        if response.status_code >= 400:
+            raise CommandError(f'{url} answered {response.status_code}')
+        return body
+
+    def _clear_caches(self, options):
+        if not options['warm']:
+            cache.clear()
+            render_cache.clear()
+
+    def _measure(self, client, name, method, url, params, options):
+        # One untimed request fills the connection and import caches
+        self._clear_caches(options)
+        self._request(client, method, url, params)
+
+        samples, queries, size = [], 0, 0
+        for _ in range(options['runs']):
+            self._clear_caches(options)
+            with CaptureQueriesContext(connections['default']) as writes, \
+                    CaptureQueriesContext(connections[READ_ALIAS]) as reads, Stopwatch() as sw:
+                body = self._request(client, method, url, params)
+            samples.append(sw.elapsed)
+            queries, size = len(writes) + len(reads), len(body)
+
+        # Python allocations are traced in a separate run so tracing does not skew the timings
+        self._clear_caches(options)
+        rss_before = current_rss_kb()
+        tracemalloc.start()
+        try:
+            self._request(client, method, url, params)
+            peak_alloc = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        rss_after = current_rss_kb()
+
+        return {
+            **timing_summary(samples),
+            'queries': queries,
+            'response_bytes': size,
+            'peak_alloc_kb': peak_alloc // 1024,
+            'rss_kb': rss_after,
+            'rss_growth_kb': rss_after - rss_before if rss_after is not None else None,
+        }
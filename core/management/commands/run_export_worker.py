@@ -0,0 +1,45 @@
+"""
+Run queued Excel exports in the background.
+
+Usage:
+    python manage.py run_export_worker            # run until interrupted
+    python manage.py run_export_worker --once     # drain the queue and exit
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.jobs import claim_next_job, run_job, cleanup_expired_jobs
+
+
+class Command(BaseCommand):
+    help = 'Process queued export jobs and remove expired export files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit when the queue is empty')
+        parser.add_argument('--poll', type=float, default=2.0, help='Seconds to wait when the queue is empty')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Export worker started')
+        try:
+            while True:
+                close_old_connections()
+                cleanup_expired_jobs()
+                
+                job = claim_next_job()
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll'])
+                    continue
+                
+                self.stdout.write(f'Running {job.kind} export {job.job_id}')
+                if run_job(job):
+                    self.stdout.write(self.style.SUCCESS(f'Finished export {job.job_id}'))
+                else:
+                    self.stdout.write(self.style.ERROR(f'Export {job.job_id} failed'))
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write('Export worker stopped')
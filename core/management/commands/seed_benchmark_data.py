@@ -0,0 +1,256 @@
+"""
+Fill a benchmark database with production-sized synthetic data.
+
+The data goes into a separate SQLite file (benchmark.sqlite3 by default),
+never the real database. Run run_benchmarks against the same file.
+
+Usage:
+    python manage.py seed_benchmark_data
+    python manage.py seed_benchmark_data --admissions 20000 --payments 100000 --enquiries 30000 --bills 10000
+"""
+
+import random
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal, ROUND_DOWN
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.benchmarking import database_file, Stopwatch
+from core.caching import bump_versions, ADMISSIONS, PAYMENTS, BILLS
+from core.models import Admission, Payment, Enquiry, Bill, BillItem, DocumentSequence
+from core.summaries import rebuild_summaries
+
+FIRST_NAMES = [
+    'Aarav', 'Aditi', 'Akash', 'Ananya', 'Aniket', 'Anjali', 'Arjun', 'Chetan', 'Deepak', 'Divya',
+    'Ganesh', 'Gauri', 'Harsh', 'Ishita', 'Kavya', 'Kiran', 'Komal', 'Mahesh', 'Manasi', 'Mayur',
+    'Neha', 'Nikhil', 'Omkar', 'Pooja', 'Prachi', 'Pranav', 'Priya', 'Rahul', 'Riya', 'Rohan',
+    'Sagar', 'Sakshi', 'Sanket', 'Shreya', 'Siddhi', 'Sneha', 'Suraj', 'Swati', 'Tejas', 'Vaishnavi',
+]
+LAST_NAMES = [
+    'Bhosale', 'Chavan', 'Deshmukh', 'Gaikwad', 'Jadhav', 'Joshi', 'Kadam', 'Kale', 'Kamble', 'Kulkarni',
+    'Mane', 'More', 'Patil', 'Pawar', 'Salunkhe', 'Sawant', 'Shinde', 'Shirke', 'Suryawanshi', 'Yadav',
+]
+CITIES = ['Satara', 'Karad', 'Wai', 'Koregaon', 'Phaltan', 'Mahabaleshwar', 'Patan', 'Khatav']
+QUALIFICATIONS = ['SSC', 'HSC', 'B.A.', 'B.Com', 'B.Sc', 'Diploma', 'Graduate']
+COURSES = [code for code, _ in Enquiry.COURSE_CHOICES]
+FEES = [Decimal(value) for value in ('3500', '4500', '5000', '6500', '8000', '12000')]
+BILL_ITEMS = [
+    ('Printout', Decimal('5')), ('Xerox', Decimal('2')), ('Lamination', Decimal('30')),
+    ('Scanning', Decimal('10')), ('Online form', Decimal('50')), ('Spiral binding', Decimal('40')),
+]
+
+CHUNK_SIZE = 10000
+BATCH_SIZE = 2000
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep the generated dates instead of stamping 'now'"""
+    fields = [
+        field for model in models for field in model._meta.fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def reserve_numbers(prefix, periods, width):
+    """Document numbers for a list of periods, in the same order"""
+    counts = defaultdict(int)
+    for period in periods:
+        counts[period] += 1
+    numbers = {period: iter(DocumentSequence.reserve(prefix, period, count, width)) for period, count in counts.items()}
+    return [next(numbers[period]) for period in periods]
+
+
+def spread(total, buckets, rng):
+    """Split `total` items over `buckets` at random; returns the count per bucket"""
+    counts = [0] * buckets
+    for _ in range(total):
+        counts[rng.randrange(buckets)] += 1
+    return counts
+
+
+class Command(BaseCommand):
+    help = 'Generate large volumes of synthetic admissions, payments, enquiries and bills'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database-file', default=str(settings.BASE_DIR / 'benchmark.sqlite3'),
+                            help='SQLite file to fill (created and migrated if missing)')
+        parser.add_argument('--admissions', type=int, default=200000)
+        parser.add_argument('--payments', type=int, default=1000000)
+        parser.add_argument('--enquiries', type=int, default=300000)
+        parser.add_argument('--bills', type=int, default=100000)
+        parser.add_argument('--items-per-bill', type=int, default=3, help='Average items per bill')
+        parser.add_argument('--years', type=int, default=3, help='Spread the data over this many years')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed, for repeatable data sets')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.today = date.today()
+        self.first_day = self.today - timedelta(days=365 * options['years'])
+
+        with database_file(options['database_file']) as path, \
+                explicit_timestamps(Admission, Payment, Enquiry, Bill, BillItem):
+            self.stdout.write(f'Seeding {path}')
+            with Stopwatch() as sw:
+                self._seed_admissions(options['admissions'], options['payments'])
+                self._seed_enquiries(options['enquiries'])
+                self._seed_bills(options['bills'], options['items_per_bill'])
+                rows = rebuild_summaries()
+                bump_versions(ADMISSIONS, PAYMENTS, BILLS)
+            self.stdout.write(f'Rebuilt {rows} summary row(s)')
+            self.stdout.write(self.style.SUCCESS(f'Done in {sw.elapsed:.1f}s'))
+
+    def _random_date(self, start=None):
+        start = start or self.first_day
+        return start + timedelta(days=self.rng.randrange((self.today - start).days + 1))
+
+    def _timestamp(self, day):
+        moment = datetime.combine(day, time(9)) + timedelta(seconds=self.rng.randrange(9 * 3600))
+        return timezone.make_aware(moment)
+
+    def _mobile(self):
+        return f'{self.rng.choice("6789")}{self.rng.randrange(10 ** 9):09d}'
+
+    def _progress(self, label, done, total):
+        self.stdout.write(f'  {label}: {done}/{total}')
+
+    def _seed_admissions(self, total, total_payments):
+        rng = self.rng
+        payments_per_admission = spread(total_payments, total, rng) if total else []
+
+        for start in range(0, total, CHUNK_SIZE):
+            count = min(CHUNK_SIZE, total - start)
+            days = sorted(self._random_date() for _ in range(count))
+            form_numbers = reserve_numbers('SSC', [day.strftime('%Y') for day in days], 4)
+
+            admissions = []
+            for day, form_no, payment_count in zip(days, form_numbers, payments_per_admission[start:start + count]):
+                total_fees = rng.choice(FEES)
+                # Each payment is a share of the fees, so paid_fees never exceeds them
+                share = (total_fees / max(payment_count + rng.randrange(3), 1)).quantize(Decimal('1'), ROUND_DOWN)
+                created = self._timestamp(day)
+                admission = Admission(
+                    form_no=form_no,
+                    admission_date=day,
+                    batch=day.strftime('%Y-%m'),
+                    course_name=rng.choice(COURSES),
+                    first_name=rng.choice(FIRST_NAMES),
+                    middle_name=rng.choice(FIRST_NAMES),
+                    last_name=rng.choice(LAST_NAMES),
+                    birth_date=date(rng.randrange(1995, 2012), rng.randrange(1, 13), rng.randrange(1, 29)),
+                    mobile_own=self._mobile(),
+                    mobile_parents=self._mobile() if rng.random() < 0.7 else None,
+                    address=f'{rng.randrange(1, 500)}, {rng.choice(CITIES)}',
+                    qualification=rng.choice(QUALIFICATIONS),
+                    installments=rng.choice('12'),
+                    total_fees=total_fees,
+                    paid_fees=share * payment_count,
+                    created_at=created,
+                    updated_at=created,
+                    created_by='seed',
+                )
+                admission.payment_plan = (payment_count, share)
+                admissions.append(admission)
+
+            with transaction.atomic():
+                Admission.objects.bulk_create(admissions, batch_size=BATCH_SIZE)
+                self._seed_payments(admissions)
+            self._progress('admissions', start + count, total)
+
+    def _seed_payments(self, admissions):
+        rng = self.rng
+        planned = []
+        for admission in admissions:
+            payment_count, share = admission.payment_plan
+            for _ in range(payment_count):
+                planned.append((self._random_date(admission.admission_date), admission, share))
+        planned.sort(key=lambda payment: payment[0])
+        receipt_numbers = reserve_numbers('RCP', [day.strftime('%Y%m%d') for day, _, _ in planned], 4)
+
+        payments = []
+        for (day, admission, share), receipt_no in zip(planned, receipt_numbers):
+            mode = rng.choice(('CASH', 'CASH', 'UPI', 'UPI', 'ONLINE', 'CARD'))
+            created = self._timestamp(day)
+            payments.append(Payment(
+                receipt_no=receipt_no,
+                payment_date=day,
+                admission=admission,
+                amount_paid=share,
+                payment_mode=mode,
+                transaction_ref=f'{rng.randrange(10 ** 11, 10 ** 12)}' if mode != 'CASH' else '',
+                created_at=created,
+                updated_at=created,
+                created_by='seed',
+            ))
+        Payment.objects.bulk_create(payments, batch_size=BATCH_SIZE)
+
+    def _seed_enquiries(self, total):
+        rng = self.rng
+        for start in range(0, total, CHUNK_SIZE):
+            count = min(CHUNK_SIZE, total - start)
+            days = sorted(self._random_date() for _ in range(count))
+            enquiry_numbers = reserve_numbers('ENQ', [day.strftime('%Y%m%d') for day in days], 3)
+            enquiries = []
+            for day, enquiry_no in zip(days, enquiry_numbers):
+                created = self._timestamp(day)
+                enquiries.append(Enquiry(
+                    enquiry_no=enquiry_no,
+                    student_name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                    mobile_no=self._mobile(),
+                    course=rng.choice(COURSES),
+                    address=f'{rng.randrange(1, 500)}, {rng.choice(CITIES)}',
+                    enquiry_date=day,
+                    created_at=created,
+                    updated_at=created,
+                ))
+            with transaction.atomic():
+                Enquiry.objects.bulk_create(enquiries, batch_size=BATCH_SIZE)
+            self._progress('enquiries', start + count, total)
+
+    def _seed_bills(self, total, items_per_bill):
+        rng = self.rng
+        for start in range(0, total, CHUNK_SIZE):
+            count = min(CHUNK_SIZE, total - start)
+            days = sorted(self._random_date() for _ in range(count))
+            bill_numbers = reserve_numbers('BIL', [day.strftime('%Y%m%d') for day in days], 4)
+
+            bills, items = [], []
+            for day, receipt_no in zip(days, bill_numbers):
+                created = self._timestamp(day)
+                bill = Bill(
+                    receipt_no=receipt_no,
+                    bill_date=day,
+                    customer_name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                    customer_mobile=self._mobile(),
+                    total_amount=Decimal('0'),
+                    created_at=created,
+                    updated_at=created,
+                    created_by='seed',
+                )
+                for _ in range(rng.randint(1, max(1, 2 * items_per_bill - 1))):
+                    name, rate = rng.choice(BILL_ITEMS)
+                    quantity = Decimal(rng.randint(1, 20))
+                    items.append(BillItem(
+                        bill=bill, item_name=name, quantity=quantity, rate=rate,
+                        amount=quantity * rate, created_at=created
+                    ))
+                    bill.total_amount += quantity * rate
+                bills.append(bill)
+
+            with transaction.atomic():
+                Bill.objects.bulk_create(bills, batch_size=BATCH_SIZE)
+                BillItem.objects.bulk_create(items, batch_size=BATCH_SIZE)
+            self._progress('bills', start + count, total)
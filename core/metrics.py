@@ -0,0 +1,255 @@
+# core/metrics.py
+"""Per-view request histograms, exposed in the Prometheus text format
+
+Each server process aggregates its requests in memory (a few counters per
+view, so recording costs microseconds) and writes a snapshot to its own
+file under METRICS_DIR at most once per FLUSH_INTERVAL. /metrics adds up
+the snapshots of the live processes. The process answering a scrape first
+takes over the snapshots of processes that have exited: it adds their
+counts to its own and deletes their files. The counters never go
+backwards, and the directory holds one file per live process.
+"""
+
+import atexit
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+FLUSH_INTERVAL = 1.0  # seconds
+
+# name: (help text, bucket upper bounds)
+HISTOGRAMS = {
+    'ssc_http_request_duration_seconds': (
+        'Wall time spent handling the request',
+        (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    ),
+    'ssc_http_request_queries': (
+        'SQL queries executed while handling the request',
+        (0, 1, 2, 3, 5, 10, 20, 50, 100, 500),
+    ),
+    'ssc_http_request_query_seconds': (
+        'Time spent in SQL queries while handling the request',
+        (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+    ),
+    'ssc_http_response_size_bytes': (
+        'Size of the response body',
+        (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+    ),
+}
+REQUESTS_TOTAL = 'ssc_http_requests_total'
+METHODS = {'GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD', 'OPTIONS'}
+
+
+class MetricsRegistry:
+    """Histograms and request counters of this process"""
+
+    def __init__(self, directory=None):
+        # None: settings.METRICS_DIR, read at each write so tests can move it
+        self._directory = directory
+        self._pid = None
+        self._histograms = {}  # (metric, view) -> [bucket counts..., +Inf count, sum]
+        self._requests = {}  # (view, method, status) -> count
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+
+    def record(self, view, method, status, duration, queries, query_time, size):
+        with self._lock:
+            for metric, value in (
+                ('ssc_http_request_duration_seconds', duration),
+                ('ssc_http_request_queries', queries),
+                ('ssc_http_request_query_seconds', query_time),
+                ('ssc_http_response_size_bytes', size),
+            ):
+                bounds = HISTOGRAMS[metric][1]
+                series = self._histograms.get((metric, view))
+                if series is None:
+                    series = self._histograms[(metric, view)] = [0] * (len(bounds) + 1) + [0.0]
+                # Per-bucket counts; made cumulative when exposed
+                for index, bound in enumerate(bounds):
+                    if value <= bound:
+                        break
+                else:
+                    index = len(bounds)
+                series[index] += 1
+                series[-1] += value
+
+            key = (view, method if method in METHODS else 'other', str(status))
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+            due = time.monotonic() - self._last_flush >= FLUSH_INTERVAL
+            if due:
+                self._last_flush = time.monotonic()
+                snapshot = self._snapshot()
+        if due:
+            self._write(snapshot)
+
+    @property
+    def directory(self):
+        return str(self._directory or settings.METRICS_DIR)
+
+    @directory.setter
+    def directory(self, value):
+        self._directory = value
+
+    @property
+    def file_name(self):
+        # Unique per process, even after a fork or when a pid is reused
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._file_name = f'{self._pid}-{time.time_ns()}.json'
+        return self._file_name
+
+    def _snapshot(self):
+        return {
+            'histograms': [[metric, view, series] for (metric, view), series in self._histograms.items()],
+            'requests': [[*key, count] for key, count in self._requests.items()],
+        }
+
+    def snapshot(self):
+        with self._lock:
+            return self._snapshot()
+
+    def _write(self, snapshot):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, os.path.join(self.directory, self.file_name))
+        except OSError:
+            # Metrics must never break a request; the next flush retries
+            pass
+
+    def flush(self):
+        if self._requests:
+            self._write(self.snapshot())
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._requests.clear()
+
+    def adopt_exited(self):
+        """Add the snapshots of exited processes to this one and delete their files"""
+        claimed = []
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            name = os.path.basename(path)
+            try:
+                pid = int(name.split('-', 1)[0])
+            except ValueError:
+                continue
+            if name == self.file_name or (pid != os.getpid() and _process_alive(pid)):
+                continue
+            # Renaming is atomic, so only one scraping process takes each file
+            taken = os.path.join(self.directory, f'.adopted-{self.file_name}-{name}')
+            try:
+                os.rename(path, taken)
+                with open(taken) as f:
+                    snapshot = json.load(f)
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError):
+                snapshot = None
+            if snapshot is not None:
+                with self._lock:
+                    _merge_into(self._histograms, self._requests, snapshot)
+            claimed.append(taken)
+
+        if claimed:
+            # Write the adopted counts before deleting their old files
+            self._write(self.snapshot())
+            for taken in claimed:
+                try:
+                    os.remove(taken)
+                except OSError:
+                    pass
+
+    def collect(self):
+        """Snapshots of all live processes, with this process's current state"""
+        self.adopt_exited()
+        snapshots = [self.snapshot()]
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            if os.path.basename(path) == self.file_name:
+                continue
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                pass
+        return snapshots
+
+
+def _process_alive(pid):
+    if os.name == 'nt':
+        # os.kill() would terminate the process on Windows; keep its snapshot
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # alive, but owned by another user
+    return True
+
+
+def _merge_into(histograms, requests, snapshot):
+    for metric, view, series in snapshot['histograms']:
+        if metric not in HISTOGRAMS or len(series) != len(HISTOGRAMS[metric][1]) + 2:
+            continue  # written with other buckets by an older version
+        total = histograms.setdefault((metric, view), [0] * len(series))
+        for index, value in enumerate(series):
+            total[index] += value
+    for view, method, status, count in snapshot['requests']:
+        requests[(view, method, status)] = requests.get((view, method, status), 0) + count
+
+
+def _merge(snapshots):
+    histograms, requests = {}, {}
+    for snapshot in snapshots:
+        _merge_into(histograms, requests, snapshot)
+    return histograms, requests
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(snapshots):
+    """Prometheus text exposition (format 0.0.4) of merged snapshots"""
+    histograms, requests = _merge(snapshots)
+    lines = [
+        f'# HELP {REQUESTS_TOTAL} Requests handled, by view, method and status',
+        f'# TYPE {REQUESTS_TOTAL} counter',
+    ]
+    for (view, method, status), count in sorted(requests.items()):
+        lines.append(f'{REQUESTS_TOTAL}{{view="{_label(view)}",method="{method}",status="{status}"}} {count}')
+
+    for metric, (help_text, bounds) in HISTOGRAMS.items():
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} histogram')
+        for (name, view), series in sorted(histograms.items()):
+            if name != metric:
+                continue
+            view = _label(view)
+            cumulative = 0
+            for bound, count in zip(bounds, series):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{view="{view}",le="{_number(bound)}"}} {cumulative}')
+            cumulative += series[len(bounds)]
+            lines.append(f'{metric}_bucket{{view="{view}",le="+Inf"}} {cumulative}')
+            lines.append(f'{metric}_sum{{view="{view}"}} {_number(series[-1])}')
+            lines.append(f'{metric}_count{{view="{view}"}} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+atexit.register(registry.flush)
@@ -0,0 +1,133 @@
+# core/middleware.py
+"""Static file serving and request timing for /metrics/ (see core/metrics.py)"""
+
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from .metrics import registry
+from .static_files import serve_static_file
+
+# Timer of the request being handled. A context variable rather than a
+# wrapper around each connection, because the async ORM runs an async
+# view's queries on a worker thread's connection (with a copy of the context)
+_timer = ContextVar('query_timer', default=None)
+
+
+class QueryTimer:
+    """Database execute wrapper counting queries and their total time"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+
+
+def time_queries(execute, sql, params, many, context):
+    timer = _timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    return timer(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_query_timer(sender, connection, **kwargs):
+    if time_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_queries)
+
+
+class StaticFilesMiddleware:
+    """Serve STATIC_URL from STATIC_ROOT, compressed and cacheable (see core/static_files.py)
+
+    Goes first in MIDDLEWARE: static files need no session, CSRF check or
+    metrics entry. Missing files fall through to the URL resolver's 404.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = '/' + settings.STATIC_URL.lstrip('/')
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _static_name(self, request):
+        if request.method in ('GET', 'HEAD') and request.path.startswith(self.prefix):
+            return request.path[len(self.prefix):]
+        return None
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        name = self._static_name(request)
+        response = serve_static_file(request, name) if name else None
+        return response or self.get_response(request)
+
+    async def __acall__(self, request):
+        name = self._static_name(request)
+        # Stat and open on a worker thread rather than the event loop
+        response = await sync_to_async(serve_static_file, thread_sensitive=False)(request, name) if name else None
+        return response or await self.get_response(request)
+
+
+class RequestMetricsMiddleware:
+    """Record wall time, SQL queries, response size and status per URL name
+
+    Goes right after StaticFilesMiddleware in MIDDLEWARE so the time spent
+    in the other middleware (sessions, messages) is included. Works both ways, so under ASGI async
+    views are not pushed onto a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = QueryTimer()
+        token = _timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _timer.reset(token)
+        return self._record(request, response, timer, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        timer = QueryTimer()
+        token = _timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _timer.reset(token)
+        return self._record(request, response, timer, time.perf_counter() - start)
+
+    def _record(self, request, response, timer, duration):
+        match = getattr(request, 'resolver_match', None)
+        view = (match.url_name or match.view_name) if match else 'unmatched'
+        if response.streaming:
+            # File downloads: the body is sent after the view returns
+            size = int(response.get('Content-Length') or 0)
+        else:
+            size = len(response.content)
+
+        registry.record(view, request.method, response.status_code, duration, timer.count, timer.seconds, size)
+        return response
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:58
+
+from django.db import migrations, models
+
+
+# (model, number field, prefix, period length)
+NUMBERED_MODELS = [
+    ('Admission', 'form_no', 'SSC', 4),
+    ('Payment', 'receipt_no', 'RCP', 8),
+    ('Enquiry', 'enquiry_no', 'ENQ', 8),
+    ('Bill', 'receipt_no', 'BIL', 8),
+]
+
+
+def seed_sequences(apps, schema_editor):
+    """Start every counter after the highest number already issued"""
+    DocumentSequence = apps.get_model('core', 'DocumentSequence')
+    
+    for model_name, field, prefix, period_length in NUMBERED_MODELS:
+        model = apps.get_model('core', model_name)
+        last_values = {}
+        
+        numbers = model.objects.filter(**{f'{field}__startswith': prefix}).values_list(field, flat=True)
+        for number in numbers.iterator():
+            period = number[len(prefix):len(prefix) + period_length]
+            seq = number[len(prefix) + period_length:]
+            if len(period) != period_length or not seq.isdigit():
+                continue
+            last_values[period] = max(last_values.get(period, 0), int(seq))
+        
+        DocumentSequence.objects.bulk_create([
+            DocumentSequence(prefix=prefix, period=period, last_value=last_value)
+            for period, last_value in last_values.items()
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_bill_billitem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(max_length=10)),
+                ('period', models.CharField(max_length=8)),
+                ('last_value', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Document Sequence',
+                'verbose_name_plural': 'Document Sequences',
+                'db_table': 'document_sequences',
+                'constraints': [models.UniqueConstraint(fields=('prefix', 'period'), name='unique_document_sequence')],
+            },
+        ),
+        migrations.RunPython(seed_sequences, migrations.RunPython.noop),
+    ]
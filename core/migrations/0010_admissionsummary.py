@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:00
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import ExtractYear, ExtractMonth
+
+
+def populate_summaries(apps, schema_editor):
+    """Build the initial summary rows from existing admissions"""
+    Admission = apps.get_model('core', 'Admission')
+    AdmissionSummary = apps.get_model('core', 'AdmissionSummary')
+    
+    rows = (
+        Admission.objects
+        .filter(is_active=True)
+        .annotate(year=ExtractYear('admission_date'), month=ExtractMonth('admission_date'))
+        .values_list('year', 'month', 'course_name', 'batch')
+        .annotate(count=Count('id'), total=Sum('total_fees'), paid=Sum('paid_fees'))
+        .order_by()
+    )
+    
+    AdmissionSummary.objects.bulk_create([
+        AdmissionSummary(
+            year=year, month=month, course_name=course_name, batch=batch,
+            admissions_count=count, total_fees=total or 0, paid_fees=paid or 0
+        )
+        for year, month, course_name, batch, count, total, paid in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_documentsequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdmissionSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('course_name', models.CharField(max_length=100)),
+                ('batch', models.CharField(max_length=7)),
+                ('admissions_count', models.PositiveIntegerField(default=0)),
+                ('total_fees', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('paid_fees', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'verbose_name': 'Admission Summary',
+                'verbose_name_plural': 'Admission Summaries',
+                'db_table': 'admission_summaries',
+                'ordering': ['year', 'month', 'course_name', 'batch'],
+                'constraints': [models.UniqueConstraint(fields=('year', 'month', 'course_name', 'batch'), name='unique_admission_summary')],
+            },
+        ),
+        migrations.RunPython(populate_summaries, migrations.RunPython.noop),
+    ]
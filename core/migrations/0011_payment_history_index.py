@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_admissionsummary'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='payment',
+            options={'ordering': ['-payment_date', '-created_at', '-id'], 'verbose_name': 'Payment', 'verbose_name_plural': 'Payments'},
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['-payment_date', '-created_at', '-id'], name='payment_history_idx'),
+        ),
+    ]
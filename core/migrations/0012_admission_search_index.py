@@ -0,0 +1,79 @@
+# Full-text index over admissions for the fee-payment typeahead
+
+from django.db import migrations
+
+
+SEARCH_COLUMNS = """
+    new.form_no,
+    new.first_name || ' ' || new.middle_name || ' ' || new.last_name,
+    new.mobile_own || ' ' || COALESCE(new.mobile_parents, '')
+"""
+
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS admission_search USING fts5(
+        form_no, full_name, mobile,
+        tokenize = 'unicode61',
+        prefix = '2 3 4'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS admission_search_insert AFTER INSERT ON admissions BEGIN
+        INSERT INTO admission_search (rowid, form_no, full_name, mobile)
+        VALUES (new.id, {SEARCH_COLUMNS});
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS admission_search_delete AFTER DELETE ON admissions BEGIN
+        DELETE FROM admission_search WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS admission_search_update
+    AFTER UPDATE OF form_no, first_name, middle_name, last_name, mobile_own, mobile_parents ON admissions BEGIN
+        DELETE FROM admission_search WHERE rowid = old.id;
+        INSERT INTO admission_search (rowid, form_no, full_name, mobile)
+        VALUES (new.id, {SEARCH_COLUMNS});
+    END
+    """,
+    """
+    INSERT INTO admission_search (rowid, form_no, full_name, mobile)
+    SELECT id, form_no,
+           first_name || ' ' || middle_name || ' ' || last_name,
+           mobile_own || ' ' || COALESCE(mobile_parents, '')
+    FROM admissions
+    """,
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS admission_search_insert",
+    "DROP TRIGGER IF EXISTS admission_search_delete",
+    "DROP TRIGGER IF EXISTS admission_search_update",
+    "DROP TABLE IF EXISTS admission_search",
+]
+
+
+def create_search_index(apps, schema_editor):
+    # FTS5 is SQLite specific; other databases use the icontains fallback
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in CREATE_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in DROP_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_payment_history_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_exportjob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enquiry',
+            index=models.Index(fields=['-created_at', '-id'], name='enquiry_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enquiry',
+            index=models.Index(fields=['course', '-created_at', '-id'], name='enquiry_course_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enquiry',
+            index=models.Index(fields=['mobile_no'], name='enquiry_mobile_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enquiry',
+            index=models.Index(fields=['student_name', 'id'], name='enquiry_name_idx'),
+        ),
+    ]
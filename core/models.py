@@ -1,5 +1,7 @@
 # core/models.py
-from django.db import models
+from django.db import models, transaction, IntegrityError
+from django.db.models import F
+from django.db.models.functions import Round
 from django.contrib.auth.hashers import make_password
 from django.core.validators import RegexValidator
 # Add the complete Admission class (see artifact: admission_model)
@@ -98,27 +100,24 @@ class Enquiry(models.Model):
         verbose_name = 'Enquiry'
         verbose_name_plural = 'Enquiries'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='enquiry_recent_idx'),
+            models.Index(fields=['course', '-created_at', '-id'], name='enquiry_course_idx'),
+            models.Index(fields=['mobile_no'], name='enquiry_mobile_idx'),
+            models.Index(fields=['student_name', 'id'], name='enquiry_name_idx'),
+        ]
     
     def __str__(self):
         return f"{self.enquiry_no} - {self.student_name}"
     
     def save(self, *args, **kwargs):
-        if not self.enquiry_no:
-            # Generate enquiry number: ENQ + YYYYMMDD + sequential number
-            from datetime import datetime
-            today = datetime.now()
-            date_str = today.strftime('%Y%m%d')
-            
-            # Get count of enquiries created today
-            today_enquiries = Enquiry.objects.filter(
-                created_at__date=today.date()
-            ).count()
+        with transaction.atomic():
+            if not self.enquiry_no:
+                # Generate enquiry number: ENQ + YYYYMMDD + 3-digit sequential number
+                date_str = datetime.now().strftime('%Y%m%d')
+                self.enquiry_no = DocumentSequence.next_number('ENQ', date_str, width=3)
             
-            # Generate enquiry number
-            seq_num = str(today_enquiries + 1).zfill(3)
-            self.enquiry_no = f"ENQ{date_str}{seq_num}"
-        
-        super().save(*args, **kwargs)
+            super().save(*args, **kwargs)
 
 # Add this to your core/models.py file
 
@@ -203,21 +202,13 @@ class Admission(models.Model):
         return f"{self.first_name} {self.middle_name} {self.last_name}"
     
     def save(self, *args, **kwargs):
-        if not self.form_no:
-            # Generate form number: SSC + YYYY + 4-digit sequential number
-            today = datetime.now()
-            year = today.strftime('%Y')
-            
-            # Get count of admissions this year
-            year_admissions = Admission.objects.filter(
-                created_at__year=today.year
-            ).count()
+        with transaction.atomic():
+            if not self.form_no:
+                # Generate form number: SSC + YYYY + 4-digit sequential number
+                year = datetime.now().strftime('%Y')
+                self.form_no = DocumentSequence.next_number('SSC', year, width=4)
             
-            # Generate form number
-            seq_num = str(year_admissions + 1).zfill(4)
-            self.form_no = f"SSC{year}{seq_num}"
-        
-        super().save(*args, **kwargs)
+            super().save(*args, **kwargs)
 
     batch = models.CharField(
         max_length=7,
@@ -246,9 +237,16 @@ class Admission(models.Model):
 # Add this Payment model to core/models.py
 
 from django.db import models
+from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
 from datetime import datetime
 
+
+class PaymentExceedsDuesError(Exception):
+    """Raised when a payment would take paid fees above total fees"""
+    pass
+
+
 class Payment(models.Model):
     """Model to store fee payment records"""
     
@@ -311,7 +309,11 @@ class Payment(models.Model):
         db_table = 'payments'
         verbose_name = 'Payment'
         verbose_name_plural = 'Payments'
-        ordering = ['-payment_date', '-created_at']
+        ordering = ['-payment_date', '-created_at', '-id']
+        indexes = [
+            # Supports keyset pagination of the payment history
+            models.Index(fields=['-payment_date', '-created_at', '-id'], name='payment_history_idx'),
+        ]
     
     def __str__(self):
         return f"{self.receipt_no} - {self.admission.get_full_name()} - ₹{self.amount_paid}"
@@ -320,28 +322,49 @@ class Payment(models.Model):
         # Check if this is a new payment
         is_new = self.pk is None
         
-        if not self.receipt_no:
-            # Generate receipt number: RCP + YYYYMMDD + 4-digit sequential number
-            today = datetime.now()
-            date_str = today.strftime('%Y%m%d')
+        with transaction.atomic():
+            # Update admission paid_fees only for new payments
+            if is_new:
+                from decimal import Decimal
+                # Convert to Decimal to avoid type mismatch
+                amount = Decimal(str(self.amount_paid))
+                # A negative amount would pass the dues check and lower paid_fees
+                if amount <= 0:
+                    raise ValueError('Amount must be greater than zero')
+                
+                # Single conditional UPDATE of the fee column: concurrent desks
+                # cannot lose each other's updates or collect more than is due.
+                # SQLite keeps decimals as REAL, so the check and the new
+                # total are rounded to paise: 0.10 + 0.20 must leave exactly
+                # the remainder payable
+                updated = Admission.objects.alias(
+                    dues_after=Round(F('total_fees') - F('paid_fees') - amount, 2)
+                ).filter(
+                    pk=self.admission_id,
+                    dues_after__gte=0
+                ).update(paid_fees=Round(F('paid_fees') + amount, 2))
+                
+                if not updated:
+                    raise PaymentExceedsDuesError('Amount cannot exceed remaining fees')
             
-            # Get count of payments created today
-            today_payments = Payment.objects.filter(
-                created_at__date=today.date()
-            ).count()
+            if not self.receipt_no:
+                # Generate receipt number: RCP + YYYYMMDD + 4-digit sequential number
+                date_str = datetime.now().strftime('%Y%m%d')
+                self.receipt_no = DocumentSequence.next_number('RCP', date_str, width=4)
             
-            # Generate receipt number
-            seq_num = str(today_payments + 1).zfill(4)
-            self.receipt_no = f"RCP{date_str}{seq_num}"
-        
-        super().save(*args, **kwargs)
+            super().save(*args, **kwargs)
         
-        # Update admission paid_fees only for new payments
-        if is_new:
-            from decimal import Decimal
-            # Convert to Decimal to avoid type mismatch
-            self.admission.paid_fees = Decimal(str(self.admission.paid_fees)) + Decimal(str(self.amount_paid))
-            self.admission.save()
+        # Keep an already loaded admission in step with the database
+        if is_new and Payment.admission.is_cached(self):
+            self.admission.refresh_from_db(fields=['paid_fees'])
+    
+    def clean(self):
+        # Surface bad amounts and over-collection as form errors (e.g. in the admin)
+        if self.pk is None and self.admission_id and self.amount_paid is not None:
+            if self.amount_paid <= 0:
+                raise ValidationError({'amount_paid': 'Amount must be greater than zero'})
+            if self.amount_paid > self.admission.get_remaining_fees():
+                raise ValidationError({'amount_paid': 'Amount cannot exceed remaining fees'})
     
     def get_amount_in_words(self):
         """Convert amount to words"""
@@ -409,21 +432,13 @@ class Bill(models.Model):
         return f"{self.receipt_no} - {self.customer_name}"
     
     def save(self, *args, **kwargs):
-        if not self.receipt_no:
-            # Generate receipt number: BIL + YYYYMMDD + 4-digit sequential number
-            today = datetime.now()
-            date_str = today.strftime('%Y%m%d')
-            
-            # Get count of bills created today
-            today_bills = Bill.objects.filter(
-                created_at__date=today.date()
-            ).count()
+        with transaction.atomic():
+            if not self.receipt_no:
+                # Generate receipt number: BIL + YYYYMMDD + 4-digit sequential number
+                date_str = datetime.now().strftime('%Y%m%d')
+                self.receipt_no = DocumentSequence.next_number('BIL', date_str, width=4)
             
-            # Generate receipt number
-            seq_num = str(today_bills + 1).zfill(4)
-            self.receipt_no = f"BIL{date_str}{seq_num}"
-        
-        super().save(*args, **kwargs)
+            super().save(*args, **kwargs)
 
 
 class BillItem(models.Model):
@@ -465,4 +480,164 @@ class BillItem(models.Model):
     def save(self, *args, **kwargs):
         # Calculate amount automatically
         self.amount = self.quantity * self.rate
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+
+class DocumentSequence(models.Model):
+    """Counter used to allocate form, receipt, enquiry and bill numbers"""
+    
+    # Number prefix (SSC, RCP, ENQ, BIL) and period (YYYY or YYYYMMDD)
+    prefix = models.CharField(max_length=10)
+    period = models.CharField(max_length=8)
+    
+    # Last number handed out for this prefix and period
+    last_value = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'document_sequences'
+        verbose_name = 'Document Sequence'
+        verbose_name_plural = 'Document Sequences'
+        constraints = [
+            models.UniqueConstraint(fields=['prefix', 'period'], name='unique_document_sequence'),
+        ]
+    
+    def __str__(self):
+        return f"{self.prefix}{self.period} - {self.last_value}"
+    
+    @classmethod
+    def reserve(cls, prefix, period, count=1, width=4):
+        """Reserve a block of consecutive numbers and return them formatted
+        
+        The counter row is advanced with a single UPDATE, so the cost does not
+        depend on how many documents already exist for the period. When called
+        inside the caller's insert transaction the numbers are released again
+        if that transaction rolls back.
+        """
+        if count < 1:
+            raise ValueError('count must be at least 1')
+        
+        counter = cls.objects.filter(prefix=prefix, period=period)
+        
+        with transaction.atomic():
+            updated = counter.update(last_value=F('last_value') + count)
+            
+            if not updated:
+                # First number of the period: create the counter row
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(prefix=prefix, period=period, last_value=count)
+                except IntegrityError:
+                    # Another transaction created it first
+                    counter.update(last_value=F('last_value') + count)
+            
+            last_value = counter.values_list('last_value', flat=True).get()
+        
+        first_value = last_value - count + 1
+        return [f"{prefix}{period}{str(n).zfill(width)}" for n in range(first_value, last_value + 1)]
+    
+    @classmethod
+    def next_number(cls, prefix, period, width=4):
+        """Allocate a single document number"""
+        return cls.reserve(prefix, period, 1, width)[0]
+
+
+class AdmissionSummary(models.Model):
+    """Admission counts and fee totals per month, course and batch
+    
+    Maintained incrementally from Admission and Payment writes (see
+    core/summaries.py) and only covers active admissions, matching what
+    the dashboard reports. Use the rebuild_summaries command to recompute.
+    """
+    
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    course_name = models.CharField(max_length=100)
+    batch = models.CharField(max_length=7)
+    
+    admissions_count = models.PositiveIntegerField(default=0)
+    total_fees = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    paid_fees = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    
+    class Meta:
+        db_table = 'admission_summaries'
+        verbose_name = 'Admission Summary'
+        verbose_name_plural = 'Admission Summaries'
+        ordering = ['year', 'month', 'course_name', 'batch']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['year', 'month', 'course_name', 'batch'],
+                name='unique_admission_summary'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.year}-{self.month:02d} {self.course_name} ({self.batch}): {self.admissions_count}"
+
+
+class ExportJob(models.Model):
+    """Excel export built in the background by the export worker"""
+    
+    KIND_CHOICES = [
+        ('enquiries', 'Enquiries'),
+        ('payment_history', 'Payment History'),
+        ('bills', 'Bills'),
+        ('admissions', 'Admissions'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+    
+    # Public identifier used in status and download URLs
+    job_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    
+    # What to export and with which filters
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    params = models.JSONField(default=dict, blank=True)
+    
+    # Progress
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    progress = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(blank=True, null=True)
+    error = models.TextField(blank=True)
+    
+    # Result file (relative to MEDIA_ROOT) and the name offered on download
+    file_name = models.CharField(max_length=255, blank=True)
+    download_name = models.CharField(max_length=255, blank=True)
+    
+    # Metadata
+    created_by = models.CharField(max_length=100, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    expires_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        db_table = 'export_jobs'
+        verbose_name = 'Export Job'
+        verbose_name_plural = 'Export Jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='export_job_queue_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} export - {self.get_status_display()}"
+
+
+class TableVersion(models.Model):
+    """Change counter for a table, bumped on every write (see core/caching.py)"""
+    
+    table = models.CharField(max_length=50, unique=True)
+    version = models.BigIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'table_versions'
+        verbose_name = 'Table Version'
+        verbose_name_plural = 'Table Versions'
+    
+    def __str__(self):
+        return f"{self.table} v{self.version}"
@@ -0,0 +1,352 @@
+# core/reconciliation.py
+"""Match bank/UPI statement lines to admissions and record them as payments"""
+
+import csv
+import io
+import re
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Round
+
+from .caching import bump_versions, ADMISSIONS, PAYMENTS
+from .imports import normalise_heading
+from .models import Admission, Payment, DocumentSequence, PaymentExceedsDuesError
+from .summaries import summary_keys, refresh_summary_buckets
+
+# Statement column headings (normalised) and the field they fill
+STATEMENT_COLUMNS = {
+    'date': 'date',
+    'txn_date': 'date',
+    'transaction_date': 'date',
+    'value_date': 'date',
+    'amount': 'amount',
+    'credit': 'amount',
+    'credit_amount': 'amount',
+    'deposit': 'amount',
+    'reference': 'reference',
+    'ref': 'reference',
+    'ref_no': 'reference',
+    'reference_no': 'reference',
+    'transaction_ref': 'reference',
+    'transaction_id': 'reference',
+    'utr': 'reference',
+    'utr_no': 'reference',
+    'description': 'narration',
+    'narration': 'narration',
+    'particulars': 'narration',
+    'remarks': 'narration',
+    'mode': 'mode',
+    'payment_mode': 'mode',
+    'form_no': 'form_no',
+    'mobile': 'mobile',
+    'mobile_no': 'mobile',
+}
+
+DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%d/%m/%y', '%d-%b-%Y', '%d %b %Y')
+FORM_NO_PATTERN = re.compile(r'SSC\d{8,}', re.IGNORECASE)
+MOBILE_PATTERN = re.compile(r'(?<!\d)[6-9]\d{9}(?!\d)')
+
+# Admissions per grouped paid_fees UPDATE
+UPDATE_CHUNK_SIZE = 500
+
+
+class StatementError(ValueError):
+    """Statement file or line that cannot be read"""
+
+
+def read_statement(source):
+    """Yield (row_number, {field: text}) for each non-blank statement line"""
+    if isinstance(source, (str, bytes)) or hasattr(source, '__fspath__'):
+        handle = open(source, newline='', encoding='utf-8-sig')
+    else:
+        handle = io.TextIOWrapper(source, encoding='utf-8-sig', newline='')
+
+    with handle:
+        rows = csv.reader(handle)
+        headings = next(rows, None)
+        if headings is None:
+            raise StatementError('The statement is empty')
+        columns = [STATEMENT_COLUMNS.get(normalise_heading(heading)) for heading in headings]
+        missing = [field for field in ('date', 'amount', 'reference') if field not in columns]
+        if missing:
+            raise StatementError(f"Missing columns: {', '.join(missing)}")
+
+        for row_number, row in enumerate(rows, 2):
+            if not any(value.strip() for value in row):
+                continue
+            line = {}
+            for field, value in zip(columns, row):
+                if field and value.strip() and field not in line:
+                    line[field] = value.strip()
+            yield row_number, line
+
+
+def parse_line(line):
+    """Return (date, amount, reference, narration) or raise StatementError"""
+    for fmt in DATE_FORMATS:
+        try:
+            payment_date = datetime.strptime(line.get('date', ''), fmt).date()
+            break
+        except ValueError:
+            pass
+    else:
+        raise StatementError('Unreadable date')
+
+    # A blank credit column is a debit line of the statement
+    raw_amount = re.sub(r'[^\d.\-]', '', line.get('amount', '')) or '0'
+    try:
+        amount = Decimal(raw_amount)
+    except InvalidOperation:
+        raise StatementError('Unreadable amount')
+
+    reference = line.get('reference', '')
+    if not reference:
+        raise StatementError('Missing transaction reference')
+
+    return payment_date, amount, reference, line.get('narration', '')
+
+
+def _payment_mode(line, narration):
+    mode = line.get('mode', '').upper()
+    if mode in dict(Payment.PAYMENT_MODE_CHOICES):
+        return mode
+    return 'UPI' if 'UPI' in narration.upper() else 'ONLINE'
+
+
+def match_statement(source):
+    """Classify every statement line
+
+    A line is matched on its transaction reference first: a reference
+    already recorded on a payment (entered at the desk) reconciles the line
+    with that payment. Lines with a new reference are matched to a student
+    by form number, else by mobile number, and become new payments.
+
+    Each result has a `status`: matched (to be recorded), reconciled
+    (reference recorded with the same amount), mismatch (reference recorded
+    with another amount), duplicate (reference repeated in the statement),
+    unmatched, ambiguous (the mobile number belongs to several students),
+    exceeds_dues, ignored (debits) or invalid. Lookups are batched rather
+    than made line by line.
+    """
+    results = []
+    for row_number, line in read_statement(source):
+        result = {'row': row_number, 'status': 'matched', 'reason': ''}
+        try:
+            payment_date, amount, reference, narration = parse_line(line)
+        except StatementError as e:
+            result.update(status='invalid', reason=str(e))
+            results.append(result)
+            continue
+
+        form_match = FORM_NO_PATTERN.search(line.get('form_no', '') or narration)
+        mobile_match = MOBILE_PATTERN.search(line.get('mobile', '') or narration)
+        result.update(
+            date=payment_date,
+            amount=amount,
+            reference=reference,
+            narration=narration,
+            mode=_payment_mode(line, narration),
+            form_no=form_match.group(0).upper() if form_match else None,
+            mobile=mobile_match.group(0) if mobile_match else None,
+        )
+        if amount <= 0:
+            result.update(status='ignored', reason='Not a credit')
+        results.append(result)
+
+    candidates = [r for r in results if r['status'] == 'matched']
+
+    # Batched lookups of known references, then one query for the students
+    references = list({r['reference'] for r in candidates})
+    recorded = {}
+    for start in range(0, len(references), 500):
+        chunk = references[start:start + 500]
+        payments = Payment.objects.filter(transaction_ref__in=chunk).select_related('admission').only(
+            'transaction_ref', 'receipt_no', 'amount_paid',
+            'admission__form_no', 'admission__first_name', 'admission__middle_name', 'admission__last_name'
+        ).order_by('id')
+        for payment in payments:
+            recorded.setdefault(payment.transaction_ref, payment)
+
+    form_numbers = {r['form_no'] for r in candidates if r['form_no']}
+    mobiles = {r['mobile'] for r in candidates if r['mobile'] and not r['form_no']}
+    admissions = Admission.objects.filter(
+        Q(form_no__in=form_numbers) | Q(mobile_own__in=mobiles) | Q(mobile_parents__in=mobiles),
+        is_active=True
+    ).only('id', 'form_no', 'first_name', 'middle_name', 'last_name',
+           'mobile_own', 'mobile_parents', 'total_fees', 'paid_fees')
+    by_form_no = {}
+    by_mobile = defaultdict(list)
+    for admission in admissions:
+        by_form_no[admission.form_no] = admission
+        by_mobile[admission.mobile_own].append(admission)
+        if admission.mobile_parents and admission.mobile_parents != admission.mobile_own:
+            by_mobile[admission.mobile_parents].append(admission)
+
+    seen_references = set()
+    remaining = {}
+    for result in candidates:
+        reference = result['reference']
+        if reference in seen_references:
+            result.update(status='duplicate', reason='Transaction reference repeated in the statement')
+            continue
+        seen_references.add(reference)
+
+        payment = recorded.get(reference)
+        if payment is not None:
+            result.update(
+                form_no=payment.admission.form_no,
+                student_name=payment.admission.get_full_name(),
+                receipt_no=payment.receipt_no,
+            )
+            if payment.amount_paid == result['amount']:
+                result.update(status='reconciled', reason=f'Recorded as receipt {payment.receipt_no}')
+            else:
+                result.update(
+                    status='mismatch',
+                    reason=f'Recorded as receipt {payment.receipt_no} for ₹{payment.amount_paid}'
+                )
+            continue
+
+        if result['form_no']:
+            admission = by_form_no.get(result['form_no'])
+        else:
+            found = by_mobile.get(result['mobile'], []) if result['mobile'] else []
+            if len(found) > 1:
+                result.update(status='ambiguous', reason=f"{len(found)} students share mobile {result['mobile']}")
+                continue
+            admission = found[0] if found else None
+
+        if admission is None:
+            result.update(status='unmatched', reason='No active admission matches the form number or mobile')
+            continue
+
+        result['admission'] = admission
+        result['student_name'] = admission.get_full_name()
+        result['form_no'] = admission.form_no
+
+        # Lines for the same student may together exceed the dues
+        dues = remaining.setdefault(admission.id, admission.get_remaining_fees())
+        if result['amount'] > dues:
+            result.update(status='exceeds_dues', reason=f'Only ₹{dues} is due')
+            continue
+        remaining[admission.id] = dues - result['amount']
+
+    return results
+
+
+def _add_paid_fees(admission_ids, totals):
+    """Raise paid_fees of several admissions with one UPDATE ... CASE statement
+
+    The dues check and the update see the same values: on SQLite,
+    select_for_update() does nothing, but the payments inserted earlier in
+    this transaction already hold the database's write lock, so no other
+    connection can commit a payment until it ends. On databases with row
+    locks, select_for_update() locks the admissions. Written as SQL because
+    building one ORM When() per admission costs more than the update itself.
+    The new value is rounded to paise like in Payment.save, as SQLite adds
+    decimals as floating point.
+    """
+    dues = dict(
+        Admission.objects.select_for_update()
+        .filter(pk__in=admission_ids)
+        .values_list('id', Round(F('total_fees') - F('paid_fees'), 2))
+    )
+    if any(totals[admission_id] > dues.get(admission_id, -1) for admission_id in admission_ids):
+        raise PaymentExceedsDuesError('Fees changed while importing the statement; please run it again')
+
+    qn = connection.ops.quote_name
+    table, pk, paid = qn(Admission._meta.db_table), qn('id'), qn('paid_fees')
+    cases = ' '.join(['WHEN %s THEN CAST(%s AS NUMERIC)'] * len(admission_ids))
+    placeholders = ', '.join(['%s'] * len(admission_ids))
+    params = [value for admission_id in admission_ids for value in (admission_id, str(totals[admission_id]))]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {table} SET {paid} = ROUND({paid} + CASE {pk} {cases} END, 2) WHERE {pk} IN ({placeholders})',
+            params + admission_ids
+        )
+
+
+def apply_matches(matched, created_by=None):
+    """Record matched lines as payments in one transaction
+
+    Payments are bulk inserted, and each admission's paid_fees is raised
+    by the sum of its lines in grouped CASE updates. The dues are checked
+    again under lock, so a payment taken at the desk since matching makes
+    the whole import roll back instead of over-collecting.
+    """
+    totals = defaultdict(Decimal)
+    for result in matched:
+        totals[result['admission'].id] += result['amount']
+
+    with transaction.atomic():
+        receipt_numbers = DocumentSequence.reserve(
+            'RCP', datetime.now().strftime('%Y%m%d'), len(matched), width=4
+        )
+        payments = Payment.objects.bulk_create([
+            Payment(
+                receipt_no=receipt_no,
+                payment_date=result['date'],
+                admission=result['admission'],
+                amount_paid=result['amount'],
+                payment_mode=result['mode'],
+                transaction_ref=result['reference'],
+                remarks=f"Statement import: {result['narration']}" if result['narration'] else 'Statement import',
+                created_by=created_by
+            )
+            for receipt_no, result in zip(receipt_numbers, matched)
+        ], batch_size=500)
+
+        admission_ids = list(totals)
+        for start in range(0, len(admission_ids), UPDATE_CHUNK_SIZE):
+            chunk = admission_ids[start:start + UPDATE_CHUNK_SIZE]
+            _add_paid_fees(chunk, totals)
+
+        # bulk_create and update() send no signals
+        refresh_summary_buckets(summary_keys(Admission.objects.filter(pk__in=admission_ids)))
+        bump_versions(PAYMENTS, ADMISSIONS)
+
+    return payments
+
+
+def reconcile_statement(source, created_by=None, dry_run=False):
+    """Match a statement CSV and, unless `dry_run`, record the matched lines
+
+    Returns a report with per-status counts and one entry per line.
+    """
+    results = match_statement(source)
+    matched = [r for r in results if r['status'] == 'matched']
+
+    payments = [] if dry_run or not matched else apply_matches(matched, created_by)
+    receipts = {payment.transaction_ref: payment.receipt_no for payment in payments}
+
+    counts = defaultdict(int)
+    lines = []
+    for result in results:
+        counts[result['status']] += 1
+        lines.append({
+            'row': result['row'],
+            'status': result['status'],
+            'reason': result['reason'],
+            'date': result['date'].strftime('%d/%m/%Y') if result.get('date') else None,
+            'amount': float(result['amount']) if result.get('amount') is not None else None,
+            'reference': result.get('reference'),
+            'form_no': result.get('form_no'),
+            'student_name': result.get('student_name'),
+            'receipt_no': (
+                receipts.get(result.get('reference')) if result['status'] == 'matched' else result.get('receipt_no')
+            ),
+        })
+
+    return {
+        'dry_run': dry_run,
+        'total_lines': len(results),
+        'counts': dict(counts),
+        'matched_amount': float(sum((r['amount'] for r in matched), Decimal('0'))),
+        'recorded': len(payments),
+        'lines': lines,
+    }
@@ -0,0 +1,154 @@
+# core/render_cache.py
+"""Cache of rendered receipts and bills: files on disk behind an in-memory LRU
+
+Receipts and bills do not change once created, so their rendered output is
+kept until the row behind it is edited or deleted (see core/signals.py).
+The files are shared by all server processes. Each process keeps the most
+recently used entries in memory and checks the file's mtime before
+serving one, so an entry dropped by another process is not served.
+
+Every key has a generation, a random token kept in its own file, and the
+entry is stored under it. delete() draws a new generation. A view reads the
+generation before it reads the rows and passes it to set(), so a render of
+rows that were edited meanwhile is stored under the old generation, where
+no one looks for it.
+"""
+
+import os
+import re
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+
+MEMORY_ENTRIES = 256
+
+# Receipt numbers and ids; anything else could reach outside the directory
+KEY_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+
+# Generation of a key that was never deleted
+FIRST_GENERATION = '0'
+
+
+class InvalidCacheKeyError(ValueError):
+    """Raised for a namespace or key that is not a plain file name"""
+    pass
+
+
+class RenderCache:
+    def __init__(self, directory, memory_entries=MEMORY_ENTRIES):
+        self.directory = str(directory)
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key_path(self, namespace, key):
+        namespace, key = str(namespace), str(key)
+        if not KEY_PATTERN.match(namespace) or not KEY_PATTERN.match(key):
+            raise InvalidCacheKeyError(f'Invalid render cache key: {namespace!r}, {key!r}')
+        return os.path.join(self.directory, namespace, key)
+
+    def _path(self, namespace, key, generation):
+        return f'{self._key_path(namespace, key)}.{generation}'
+
+    def _generation_path(self, namespace, key):
+        return f'{self._key_path(namespace, key)}.gen'
+
+    def _write(self, path, content):
+        """Write to a temporary name and move it into place; returns the mtime"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+                f.flush()
+                mtime = os.fstat(f.fileno()).st_mtime_ns
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return mtime
+
+    def _remember(self, path, mtime, content):
+        with self._lock:
+            self._memory[path] = (mtime, content)
+            self._memory.move_to_end(path)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def generation(self, namespace, key):
+        """Current generation of a key; read it before the rows that are rendered"""
+        try:
+            with open(self._generation_path(namespace, key)) as f:
+                return f.read() or FIRST_GENERATION
+        except FileNotFoundError:
+            return FIRST_GENERATION
+
+    def lookup(self, namespace, key):
+        """Return (cached bytes or None, generation to pass to set())"""
+        generation = self.generation(namespace, key)
+        return self._read(self._path(namespace, key, generation)), generation
+
+    def get(self, namespace, key):
+        """Return the cached bytes, or None"""
+        return self.lookup(namespace, key)[0]
+
+    def _read(self, path):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            with self._lock:
+                self._memory.pop(path, None)
+            return None
+
+        with self._lock:
+            entry = self._memory.get(path)
+            if entry and entry[0] == mtime:
+                self._memory.move_to_end(path)
+                return entry[1]
+
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+        self._remember(path, mtime, content)
+        return content
+
+    def set(self, namespace, key, content, generation):
+        """Store bytes rendered from rows read after generation(namespace, key)"""
+        path = self._path(namespace, key, generation)
+        mtime = self._write(path, content)
+        if self.generation(namespace, key) != generation:
+            # Deleted while rendering; the entry can no longer be read anyway
+            self._forget(path)
+            return
+        self._remember(path, mtime, content)
+
+    def delete(self, namespace, key):
+        """Move the key to a new generation, making the stored entry unreachable"""
+        old_path = self._path(namespace, key, self.generation(namespace, key))
+        self._write(self._generation_path(namespace, key), uuid.uuid4().hex.encode())
+        self._forget(old_path)
+
+    def _forget(self, path):
+        with self._lock:
+            self._memory.pop(path, None)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        for root, dirs, files in os.walk(self.directory):
+            for name in files:
+                os.remove(os.path.join(root, name))
+
+
+render_cache = RenderCache(
+    getattr(settings, 'RENDER_CACHE_DIR', os.path.join(settings.BASE_DIR, 'render_cache'))
+)
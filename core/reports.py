@@ -0,0 +1,41 @@
+# core/reports.py
+"""Aggregated admission statistics for the dashboard and reports"""
+
+from django.db.models import Sum
+
+from .models import AdmissionSummary
+
+MSCIT_COURSE = 'MS-CIT'
+
+
+def admission_stats(year):
+    """Return dashboard statistics for a year
+    
+    Reads the AdmissionSummary table, which holds at most
+    12 x courses x batches rows per year, so the cost does not grow with
+    the number of admissions. No Admission instances are built.
+    """
+    rows = (
+        AdmissionSummary.objects
+        .filter(year=year, admissions_count__gt=0)
+        .values_list('month', 'course_name')
+        .annotate(count=Sum('admissions_count'))
+        .order_by('course_name', 'month')
+    )
+    
+    monthly = [0] * 12
+    courses = {}
+    for month, course_name, count in rows:
+        monthly[month - 1] += count
+        courses[course_name] = courses.get(course_name, 0) + count
+    
+    total = sum(monthly)
+    mscit = courses.get(MSCIT_COURSE, 0)
+    
+    return {
+        'total': total,
+        'mscit': mscit,
+        'others': total - mscit,
+        'monthly': monthly,
+        'courses': [{'label': name, 'value': count} for name, count in courses.items()],
+    }
@@ -0,0 +1,62 @@
+# core/routers.py
+"""Send the queries of read-only views to the read-only connection
+
+Views decorated with `read_only_database` (and blocks inside
+`read_only_queries()`) read through the 'readonly' alias, which SQLite
+opens with mode=ro. In WAL mode those reads never wait for the cashier
+writes on 'default'. Writes always go to 'default'.
+
+The flag is a context variable, so it also reaches the queries an async
+view runs through the async ORM, which executes them in a worker thread
+with a copy of the view's context.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+
+READ_ALIAS = 'readonly'
+
+_reading = ContextVar('read_only_database', default=False)
+
+
+class ReadOnlyRouter:
+    def db_for_read(self, model, **hints):
+        return READ_ALIAS if _reading.get() else None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases are the same database file
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+@contextmanager
+def read_only_queries():
+    token = _reading.set(True)
+    try:
+        yield
+    finally:
+        _reading.reset(token)
+
+
+def read_only_database(view):
+    """Route the view's ORM reads to the read-only connection"""
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            with read_only_queries():
+                return await view(request, *args, **kwargs)
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        with read_only_queries():
+            return view(request, *args, **kwargs)
+    return wrapper
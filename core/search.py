@@ -0,0 +1,83 @@
+# core/search.py
+"""Admission search backed by the SQLite FTS5 index (see migration 0012)"""
+
+import re
+
+from django.db import connection
+from django.db.models import Q, F
+from django.db.models.expressions import RawSQL
+
+from .models import Admission
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def fts_available():
+    """The admission_search index only exists on SQLite"""
+    return connection.vendor == 'sqlite'
+
+
+def build_match_query(term, column=None):
+    """Turn free text into an FTS5 query: every word must match as a prefix"""
+    tokens = TOKEN_RE.findall(term)
+    if not tokens:
+        return None
+    query = ' AND '.join(f'"{token}"*' for token in tokens)
+    if column:
+        query = f'{column} : ({query})'
+    return query
+
+
+def search_admissions(term, pending_only=False, limit=10):
+    """Active admissions matching name, form number or mobile, best match first"""
+    if not fts_available():
+        return _search_admissions_fallback(term, pending_only, limit)
+    
+    match = build_match_query(term)
+    if match is None:
+        return []
+    
+    # Every match is ranked, so long-standing students are found as well as
+    # new ones. bm25 ties (the same name) list the newest admission first.
+    pending = "AND a.paid_fees < a.total_fees" if pending_only else ""
+    sql = f"""
+        SELECT a.* FROM admission_search
+        JOIN admissions a ON a.id = admission_search.rowid
+        WHERE admission_search MATCH %s AND a.is_active {pending}
+        ORDER BY admission_search.rank, a.id DESC
+        LIMIT %s
+    """
+    
+    return list(Admission.objects.raw(sql, [match, limit]))
+
+
+def name_filter(term, prefix='admission__'):
+    """Q object matching admissions (or related rows) by student name"""
+    if not fts_available():
+        return (
+            Q(**{f'{prefix}first_name__icontains': term}) |
+            Q(**{f'{prefix}middle_name__icontains': term}) |
+            Q(**{f'{prefix}last_name__icontains': term})
+        )
+    
+    match = build_match_query(term, column='full_name')
+    if match is None:
+        return Q()
+    
+    matching_ids = RawSQL("SELECT rowid FROM admission_search WHERE admission_search MATCH %s", [match])
+    return Q(**{f'{prefix}id__in': matching_ids})
+
+
+def _search_admissions_fallback(term, pending_only, limit):
+    admissions = Admission.objects.filter(
+        Q(first_name__icontains=term) |
+        Q(middle_name__icontains=term) |
+        Q(last_name__icontains=term) |
+        Q(mobile_own__icontains=term) |
+        Q(mobile_parents__icontains=term) |
+        Q(form_no__icontains=term),
+        is_active=True
+    )
+    if pending_only:
+        admissions = admissions.filter(paid_fees__lt=F('total_fees'))
+    return list(admissions[:limit])
@@ -0,0 +1,149 @@
+# core/signals.py
+"""Signal handlers keeping derived tables in step with model writes"""
+
+from decimal import Decimal
+
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.db import transaction
+from django.dispatch import receiver
+
+from .caching import bump_versions, ADMISSIONS, PAYMENTS, BILLS
+from .models import Admission, Payment, Bill, BillItem
+from .render_cache import render_cache
+from .thumbnails import make_thumbnail_quietly
+from .summaries import (
+    admission_contribution, stored_contribution, summary_contribution, apply_contribution_change,
+    apply_summary_delta, SUMMARY_FIELDS
+)
+
+
+# ==================== ADMISSION SUMMARIES ====================
+
+# Admission fields printed on its receipts
+RECEIPT_FIELDS = ('first_name', 'middle_name', 'last_name', 'course_name', 'batch')
+
+
+@receiver(pre_save, sender=Admission)
+def remember_admission_contribution(sender, instance, raw=False, **kwargs):
+    """Remember what an existing admission contributed, and its receipt fields, before it is updated"""
+    if raw:
+        return
+    instance._summary_before = instance._receipt_fields_before = None
+    if instance.pk:
+        stored = Admission.objects.filter(pk=instance.pk).values_list(*SUMMARY_FIELDS, *RECEIPT_FIELDS).first()
+        if stored:
+            instance._summary_before = summary_contribution(*stored[:len(SUMMARY_FIELDS)])
+            instance._receipt_fields_before = stored[len(SUMMARY_FIELDS):]
+
+
+@receiver(post_save, sender=Admission)
+def update_admission_summary(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    before = getattr(instance, '_summary_before', None)
+    apply_contribution_change(before, admission_contribution(instance))
+
+
+@receiver(pre_delete, sender=Admission)
+def remember_deleted_contribution(sender, instance, **kwargs):
+    instance._summary_before = stored_contribution(instance.pk)
+
+
+@receiver(post_delete, sender=Admission)
+def remove_admission_summary(sender, instance, **kwargs):
+    apply_contribution_change(getattr(instance, '_summary_before', None), None)
+
+
+@receiver(post_save, sender=Payment)
+def add_payment_to_summary(sender, instance, created=False, raw=False, **kwargs):
+    """New payments raise the admission's paid fees (see Payment.save)
+
+    Editing or deleting a payment leaves Admission.paid_fees untouched, so
+    the summary, which mirrors that column, does not change either.
+    """
+    if raw or not created:
+        return
+    contribution = admission_contribution(instance.admission)
+    if contribution:
+        apply_summary_delta(contribution[0], paid_fees=Decimal(str(instance.amount_paid)))
+
+
+# ==================== CACHE VERSIONS ====================
+
+@receiver(post_save, sender=Admission)
+@receiver(post_delete, sender=Admission)
+def bump_admission_version(sender, raw=False, **kwargs):
+    if not raw:
+        bump_versions(ADMISSIONS)
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+def bump_payment_version(sender, raw=False, **kwargs):
+    """Payments change the paid fees shown with each admission too"""
+    if not raw:
+        bump_versions(PAYMENTS, ADMISSIONS)
+
+
+@receiver(post_save, sender=Bill)
+@receiver(post_delete, sender=Bill)
+@receiver(post_save, sender=BillItem)
+@receiver(post_delete, sender=BillItem)
+def bump_bill_version(sender, raw=False, **kwargs):
+    if not raw:
+        bump_versions(BILLS)
+
+
+# ==================== RENDER CACHE ====================
+# Entries are dropped once the change is committed, so a reprint can never
+# re-cache the old version from a transaction that is still open. A reprint
+# that read the rows before the commit stores its render under the old
+# generation, which the drop has already left behind.
+
+def _drop_rendered(namespace, *keys):
+    def drop():
+        for key in keys:
+            render_cache.delete(namespace, key)
+    transaction.on_commit(drop)
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+def drop_rendered_receipt(sender, instance, created=False, raw=False, **kwargs):
+    if not raw and not created:
+        _drop_rendered('receipts', instance.receipt_no)
+
+
+@receiver(post_save, sender=Admission)
+def drop_rendered_admission_receipts(sender, instance, created=False, raw=False, **kwargs):
+    """Receipts show the student's name, course and batch; other edits keep them"""
+    if raw or created:
+        return
+    after = tuple(getattr(instance, field) for field in RECEIPT_FIELDS)
+    if getattr(instance, '_receipt_fields_before', None) == after:
+        return
+    receipts = Payment.objects.filter(admission_id=instance.pk).values_list('receipt_no', flat=True)
+    _drop_rendered('receipts', *receipts)
+
+
+@receiver(post_save, sender=Bill)
+@receiver(post_delete, sender=Bill)
+def drop_rendered_bill(sender, instance, created=False, raw=False, **kwargs):
+    if not raw and not created:
+        _drop_rendered('bill_bodies', instance.pk)
+
+
+@receiver(post_save, sender=BillItem)
+@receiver(post_delete, sender=BillItem)
+def drop_rendered_bill_of_item(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _drop_rendered('bill_bodies', instance.bill_id)
+
+
+# ==================== PHOTO THUMBNAILS ====================
+
+@receiver(post_save, sender=Admission)
+def create_photo_thumbnail(sender, instance, raw=False, **kwargs):
+    """Make the grid thumbnail as soon as a photo is uploaded"""
+    if not raw and instance.photo:
+        make_thumbnail_quietly(instance.photo)
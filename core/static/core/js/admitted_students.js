@@ -0,0 +1,440 @@
+let currentStudentData = null;
+let isEditMode = false;
+
+function filterStudents() {
+    const course = document.getElementById('courseSelect').value;
+    const batch = document.getElementById('batchSelect').value;
+
+    if (!course || !batch) {
+        alert('Please select both Course and Batch');
+        return;
+    }
+
+    const container = document.getElementById('studentsContainer');
+    container.innerHTML = `
+        <div class="no-results">
+            <div class="no-results-icon">⏳</div>
+            <h3>Loading...</h3>
+            <p>Please wait while we fetch student data</p>
+        </div>
+    `;
+
+    fetch(`/api/get-admitted-students/?course=${encodeURIComponent(course)}&batch=${encodeURIComponent(batch)}`)
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                displayStudents(data.students);
+            } else {
+                container.innerHTML = `
+                    <div class="no-results">
+                        <div class="no-results-icon">❌</div>
+                        <h3>Error</h3>
+                        <p>${data.error || 'Failed to fetch students'}</p>
+                    </div>
+                `;
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            container.innerHTML = `
+                <div class="no-results">
+                    <div class="no-results-icon">❌</div>
+                    <h3>Error</h3>
+                    <p>Failed to load students: ${error.message}</p>
+                </div>
+            `;
+        });
+}
+
+function displayStudents(students) {
+    const container = document.getElementById('studentsContainer');
+
+    if (students.length === 0) {
+        container.innerHTML = `
+            <div class="no-results">
+                <div class="no-results-icon">😔</div>
+                <h3>No Students Found</h3>
+                <p>No students found for the selected course and batch</p>
+            </div>
+        `;
+        return;
+    }
+
+    const studentsHtml = students.map(student => {
+        const fullName = `${student.firstName} ${student.middleName} ${student.lastName}`;
+        const initials = `${student.firstName[0]}${student.lastName[0]}`;
+
+        return `
+            <div class="student-card" onclick="showStudentDetails(${student.id})">
+                <div class="student-info">
+                    <div class="student-name">${fullName}</div>
+                    <div class="student-mobile">📱 ${student.mobileOwn}</div>
+                </div>
+                ${student.photo ?
+                    `<img src="${student.photoThumb || student.photo}" alt="${fullName}" class="student-photo" width="80" height="80" loading="lazy">` :
+                    `<div class="student-photo no-photo">${initials}</div>`
+                }
+            </div>
+        `;
+    }).join('');
+
+    container.innerHTML = `<div class="students-grid">${studentsHtml}</div>`;
+}
+
+function showStudentDetails(studentId) {
+    const course = document.getElementById('courseSelect').value;
+    const batch = document.getElementById('batchSelect').value;
+
+    fetch(`/api/get-admitted-students/?course=${encodeURIComponent(course)}&batch=${encodeURIComponent(batch)}`)
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                const student = data.students.find(s => s.id === studentId);
+                if (student) {
+                    displayStudentModal(student);
+                }
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            alert('Failed to load student details');
+        });
+}
+
+function displayStudentModal(student) {
+    currentStudentData = { ...student };
+    isEditMode = false;
+
+    const modalContent = `
+        <div class="detail-section">
+            <div class="section-title">📋 Basic Information</div>
+            <div class="detail-grid">
+                <div class="detail-item">
+                    <div class="detail-label">Form Number</div>
+                    <div class="detail-value">
+                        <input type="text" id="formNo" value="${student.formNo}" readonly>
+                    </div>
+                </div>
+                <div class="detail-item">
+                    <div class="detail-label">Admission Date</div>
+                    <div class="detail-value">
+                        <input type="date" id="admissionDate" value="${student.admissionDate}" readonly>
+                    </div>
+                </div>
+                <div class="detail-item">
+                    <div class="detail-label">Course Name</div>
+                    <div class="detail-value">
+                        <input type="text" id="course" value="${student.course}" readonly>
+                    </div>
+                </div>
+                <div class="detail-item">
+                    <div class="detail-label">Batch</div>
+                    <div class="detail-value">
+                        <input type="text" id="batch" value="${student.batch}" readonly>
+                    </div>
+                </div>
+            </div>
+        </div>
+
+        <div class="detail-section">
+            <div class="section-title">👤 Personal Details</div>
+            <div class="detail-grid">
+                <div class="detail-item">
+                    <div class="detail-label">First Name</div>
+                    <div class="detail-value">
+                        <input type="text" id="firstName" value="${student.firstName}" readonly>
+                    </div>
+                </div>
+                <div class="detail-item">
+                    <div class="detail-label">Middle Name</div>
+                    <div class="detail-value">
+                        <input type="text" id="middleName" value="${student.middleName}" readonly>
+                    </div>
+                </div>
+                <div class="detail-item">
+                    <div class="detail-label">Last Name</div>
+                    <div class="detail-value">
+                        <input type="text" id="lastName" value="${student.lastName}" readonly>
+                    </div>
+                </div>
+                <div class="detail-item">
+                    <div class="detail-label">Birth Date</div>
+                    <div class="detail-value">
+                        <input type="date" id="birthDate" value="${student.birthDate}" readonly>
+                    </div>
+                </div>
+            </div>
+        </div>
+
+        <div class="detail-section">
+            <div class="section-title">📞 Contact Information</div>
+            <div class="detail-grid">
+                <div class="detail-item">
+                    <div class="detail-label">Mobile (Own)</div>
+                    <div class="detail-value">
+                        <input type="tel" id="mobileOwn" value="${student.mobileOwn}" readonly>
+                    </div>
+                </div>
+                <div class="detail-item">
+                    <div class="detail-label">Mobile (Parents)</div>
+                    <div class="detail-value">
+                        <input type="tel" id="mobileParents" value="${student.mobileParents}" readonly>
+                    </div>
+                </div>
+                <div class="detail-item" style="grid-column: 1 / -1;">
+                    <div class="detail-label">Address</div>
+                    <div class="detail-value">
+                        <textarea id="address" readonly>${student.address}</textarea>
+                    </div>
+                </div>
+            </div>
+        </div>
+
+        <div class="detail-section">
+            <div class="section-title">🎓 Academic Information</div>
+            <div class="detail-grid">
+                <div class="detail-item">
+                    <div class="detail-label">Qualification</div>
+                    <div class="detail-value">
+                        <input type="text" id="qualification" value="${student.qualification}" readonly>
+                    </div>
+                </div>
+                <div class="detail-item">
+                    <div class="detail-label">Installments</div>
+                    <div class="detail-value">
+                        <input type="text" id="installments" value="${student.installments} Installment(s)" readonly>
+                    </div>
+                </div>
+            </div>
+        </div>
+
+        <div class="detail-section">
+            <div class="section-title">💰 Fee Information</div>
+            <div class="fee-cards">
+                <div class="fee-card">
+                    <div class="fee-label">Total Fees</div>
+                    <div class="fee-amount" id="displayTotalFees">₹${student.totalFees}</div>
+                    <input type="number" id="totalFees" class="fee-input" value="${student.totalFees}" readonly style="display: none;">
+                </div>
+                <div class="fee-card paid">
+                    <div class="fee-label">Paid Fees</div>
+                    <div class="fee-amount" id="displayPaidFees">₹${student.paidFees}</div>
+                    <input type="number" id="paidFees" class="fee-input" value="${student.paidFees}" readonly style="display: none;">
+                </div>
+                <div class="fee-card remaining">
+                    <div class="fee-label">Remaining Fees</div>
+                    <div class="fee-amount" id="displayRemainingFees">₹${student.remainingFees}</div>
+                    <div class="fee-amount" id="calculatedRemainingFees" style="display: none;">₹${student.remainingFees}</div>
+                </div>
+            </div>
+        </div>
+
+        <div class="action-buttons">
+            <button class="btn btn-primary" id="editBtn" onclick="toggleEditMode()">✏️ Edit</button>
+            <button class="btn btn-success" id="saveBtn" onclick="saveStudentData()" style="display: none;">💾 Save Changes</button>
+            <button class="btn btn-danger" onclick="deleteStudent()">🗑️ Delete Student</button>
+            <button class="btn btn-secondary" onclick="closeModal()">❌ Close</button>
+        </div>
+    `;
+
+    document.getElementById('modalContent').innerHTML = modalContent;
+    document.getElementById('studentModal').classList.add('show');
+}
+
+function toggleEditMode() {
+    isEditMode = !isEditMode;
+
+    const editBtn = document.getElementById('editBtn');
+    const saveBtn = document.getElementById('saveBtn');
+
+    const editableFields = ['firstName', 'middleName', 'lastName', 'birthDate',
+                        'mobileOwn', 'mobileParents', 'address', 'qualification'];
+
+    editableFields.forEach(fieldId => {
+        const field = document.getElementById(fieldId);
+        if (field) {
+            field.readOnly = !isEditMode;
+            field.style.background = isEditMode ? 'white' : '#f8f9fa';
+        }
+    });
+
+    const totalFeesInput = document.getElementById('totalFees');
+    const paidFeesInput = document.getElementById('paidFees');
+    const displayTotalFees = document.getElementById('displayTotalFees');
+    const displayPaidFees = document.getElementById('displayPaidFees');
+    const displayRemainingFees = document.getElementById('displayRemainingFees');
+    const calculatedRemainingFees = document.getElementById('calculatedRemainingFees');
+
+    if (isEditMode) {
+        editBtn.style.display = 'none';
+        saveBtn.style.display = 'block';
+
+        totalFeesInput.readOnly = false;
+        paidFeesInput.readOnly = false;
+        displayTotalFees.style.display = 'none';
+        displayPaidFees.style.display = 'none';
+        displayRemainingFees.style.display = 'none';
+        totalFeesInput.style.display = 'block';
+        paidFeesInput.style.display = 'block';
+        calculatedRemainingFees.style.display = 'block';
+
+        totalFeesInput.addEventListener('input', calculateRemainingFees);
+        paidFeesInput.addEventListener('input', calculateRemainingFees);
+    } else {
+        editBtn.style.display = 'block';
+        saveBtn.style.display = 'none';
+
+        totalFeesInput.readOnly = true;
+        paidFeesInput.readOnly = true;
+        displayTotalFees.style.display = 'block';
+        displayPaidFees.style.display = 'block';
+        displayRemainingFees.style.display = 'block';
+        totalFeesInput.style.display = 'none';
+        paidFeesInput.style.display = 'none';
+        calculatedRemainingFees.style.display = 'none';
+    }
+}
+
+function calculateRemainingFees() {
+    const totalFees = parseFloat(document.getElementById('totalFees').value) || 0;
+    const paidFees = parseFloat(document.getElementById('paidFees').value) || 0;
+    const remaining = totalFees - paidFees;
+    document.getElementById('calculatedRemainingFees').textContent = `₹${remaining}`;
+}
+
+function saveStudentData() {
+    if (!currentStudentData) return;
+
+    const updatedData = {
+        id: currentStudentData.id,
+        firstName: document.getElementById('firstName').value,
+        middleName: document.getElementById('middleName').value,
+        lastName: document.getElementById('lastName').value,
+        birthDate: document.getElementById('birthDate').value,
+        mobileOwn: document.getElementById('mobileOwn').value,
+        mobileParents: document.getElementById('mobileParents').value,
+        address: document.getElementById('address').value,
+        qualification: document.getElementById('qualification').value,
+        totalFees: parseFloat(document.getElementById('totalFees').value),
+        paidFees: parseFloat(document.getElementById('paidFees').value)
+    };
+
+    if (!updatedData.firstName || !updatedData.lastName) {
+        alert('First name and last name are required!');
+        return;
+    }
+
+    if (!/^\d{10}$/.test(updatedData.mobileOwn)) {
+        alert('Own mobile number must be 10 digits!');
+        return;
+    }
+
+    if (updatedData.mobileParents && !/^\d{10}$/.test(updatedData.mobileParents)) {
+        alert('Parent mobile number must be 10 digits!');
+        return;
+    }
+
+    if (updatedData.paidFees > updatedData.totalFees) {
+        alert('Paid fees cannot be greater than total fees!');
+        return;
+    }
+
+    const csrftoken = getCookie('csrftoken');
+
+    fetch('/api/update-student/', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': csrftoken
+        },
+        body: JSON.stringify(updatedData)
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            alert('✅ Student data updated successfully!');
+            closeModal();
+            filterStudents();
+        } else {
+            alert('Error updating data: ' + (data.error || 'Unknown error'));
+        }
+    })
+    .catch(error => {
+        alert('Error: ' + error.message);
+    });
+}
+
+function deleteStudent() {
+    if (!currentStudentData) return;
+
+    const studentName = `${currentStudentData.firstName} ${currentStudentData.middleName} ${currentStudentData.lastName}`;
+    const formNo = currentStudentData.formNo;
+
+    if (!confirm(`⚠️ WARNING!\n\nAre you sure you want to DELETE student:\n\n${studentName}\nForm No: ${formNo}\n\nThis will permanently delete:\n• Student admission record\n• All payment history\n• All related data\n\nThis action CANNOT be undone!`)) {
+        return;
+    }
+
+    if (!confirm('Final confirmation: Click OK to permanently delete all data for this student.')) {
+        return;
+    }
+
+    const csrftoken = getCookie('csrftoken');
+
+    fetch('/api/delete-student-admission/', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': csrftoken
+        },
+        body: JSON.stringify({ admission_id: currentStudentData.id })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            alert('✅ ' + data.message);
+            closeModal();
+            filterStudents();
+        } else {
+            alert('❌ Error: ' + (data.error || 'Failed to delete student'));
+        }
+    })
+    .catch(error => {
+        alert('❌ Error: ' + error.message);
+    });
+}
+
+function closeModal() {
+    document.getElementById('studentModal').classList.remove('show');
+    currentStudentData = null;
+    isEditMode = false;
+}
+
+document.getElementById('studentModal').addEventListener('click', function(e) {
+    if (e.target === this) {
+        closeModal();
+    }
+});
+
+window.addEventListener('DOMContentLoaded', function() {
+    const batchSelect = document.getElementById('batchSelect');
+    const months = [
+        'January', 'February', 'March', 'April', 'May', 'June',
+        'July', 'August', 'September', 'October', 'November', 'December'
+    ];
+
+    while (batchSelect.options.length > 1) {
+        batchSelect.remove(1);
+    }
+
+    for (let year = 2025; year <= 2026; year++) {
+        for (let i = 0; i < 12; i++) {
+            const monthNum = (i + 1).toString().padStart(2, '0');
+            const option = document.createElement('option');
+            option.value = `${year}-${monthNum}`;
+            option.textContent = `${months[i]} ${year}`;
+            batchSelect.appendChild(option);
+        }
+    }
+
+    console.log('Admitted Students page loaded successfully!');
+});
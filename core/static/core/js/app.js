@@ -0,0 +1,71 @@
+// Helpers shared by the logged-in pages. Each page adds its own core/js/<page>.js.
+
+// CSRF token helper
+function getCookie(name) {
+    let cookieValue = null;
+    if (document.cookie && document.cookie !== '') {
+        const cookies = document.cookie.split(';');
+        for (let i = 0; i < cookies.length; i++) {
+            const cookie = cookies[i].trim();
+            if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                break;
+            }
+        }
+    }
+    return cookieValue;
+}
+
+// Queue an export job and download the file once the worker has built it
+function runExportJob(kind, params, button) {
+    const label = button.textContent;
+    button.disabled = true;
+    button.textContent = '⏳ Preparing...';
+
+    const finish = () => {
+        button.disabled = false;
+        button.textContent = label;
+    };
+
+    fetch('/api/export-jobs/', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ kind: kind, params: params })
+    })
+        .then(response => response.json())
+        .then(data => {
+            if (!data.success) {
+                alert('Error: ' + data.error);
+                finish();
+                return;
+            }
+            pollExportJob(data.job_id, button, finish);
+        })
+        .catch(error => {
+            alert('Error starting export: ' + error);
+            finish();
+        });
+}
+
+function pollExportJob(jobId, button, finish) {
+    fetch(`/api/export-jobs/${jobId}/`)
+        .then(response => response.json())
+        .then(data => {
+            if (!data.success || data.status === 'FAILED') {
+                alert('Export failed: ' + (data.error || 'Unknown error'));
+                finish();
+            } else if (data.status === 'DONE') {
+                window.location.href = data.download_url;
+                finish();
+            } else {
+                if (data.total) {
+                    button.textContent = `⏳ ${Math.floor(data.progress * 100 / data.total)}%`;
+                }
+                setTimeout(() => pollExportJob(jobId, button, finish), 1000);
+            }
+        })
+        .catch(error => {
+            alert('Error checking export: ' + error);
+            finish();
+        });
+}
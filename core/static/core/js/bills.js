@@ -0,0 +1,147 @@
+// Set today's date as default
+document.getElementById('dateFilter').valueAsDate = new Date();
+
+function loadBills() {
+    const date = document.getElementById('dateFilter').value;
+    const customer = document.getElementById('customerFilter').value;
+
+    if (!date) {
+        alert('Please select a date');
+        return;
+    }
+
+    const container = document.getElementById('billsContainer');
+    container.innerHTML = `
+        <div class="no-results">
+            <div class="no-results-icon">⏳</div>
+            <h3>Loading...</h3>
+        </div>
+    `;
+
+    const params = new URLSearchParams();
+    params.append('date', date);
+    if (customer) params.append('customer', customer);
+
+    fetch(`/api/get-bills/?${params.toString()}`)
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            displayBills(data.bills);
+            updateStats(data.bills);
+        } else {
+            container.innerHTML = `
+                <div class="no-results">
+                    <div class="no-results-icon">❌</div>
+                    <h3>Error</h3>
+                    <p>${data.error || 'Failed to load bills'}</p>
+                </div>
+            `;
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        container.innerHTML = `
+            <div class="no-results">
+                <div class="no-results-icon">❌</div>
+                <h3>Error</h3>
+                <p>Failed to load bills</p>
+            </div>
+        `;
+    });
+}
+
+function displayBills(bills) {
+    const container = document.getElementById('billsContainer');
+
+    if (bills.length === 0) {
+        container.innerHTML = `
+            <div class="no-results">
+                <div class="no-results-icon">📭</div>
+                <h3>No Bills Found</h3>
+                <p>No bills found for the selected date</p>
+            </div>
+        `;
+        return;
+    }
+
+    const tableHtml = `
+        <table class="bills-table">
+            <thead>
+                <tr>
+                    <th>Receipt No</th>
+                    <th>Date</th>
+                    <th>Customer Name</th>
+                    <th>Mobile</th>
+                    <th>Items</th>
+                    <th>Total Amount</th>
+                    <th>Actions</th>
+                </tr>
+            </thead>
+            <tbody>
+                ${bills.map(bill => `
+                    <tr>
+                        <td class="receipt-no">${bill.receipt_no}</td>
+                        <td>${new Date(bill.bill_date).toLocaleDateString('en-GB')}</td>
+                        <td><strong>${bill.customer_name}</strong></td>
+                        <td>${bill.customer_mobile}</td>
+                        <td>${bill.items_count} items</td>
+                        <td class="amount-cell">₹${parseFloat(bill.total_amount).toFixed(2)}</td>
+                        <td>
+                            <div class="action-buttons">
+                                <button class="action-btn btn-view" onclick="viewBill(${bill.id})">
+                                    👁️ View
+                                </button>
+                                <button class="action-btn btn-print" onclick="printBill(${bill.id})">
+                                    🖨️ Print
+                                </button>
+                            </div>
+                        </td>
+                    </tr>
+                `).join('')}
+            </tbody>
+        </table>
+    `;
+
+    container.innerHTML = tableHtml;
+    document.getElementById('recordCount').textContent = `${bills.length} records`;
+}
+
+function updateStats(bills) {
+    const totalBills = bills.length;
+    const totalAmount = bills.reduce((sum, bill) => sum + parseFloat(bill.total_amount), 0);
+    const totalItems = bills.reduce((sum, bill) => sum + parseInt(bill.items_count), 0);
+
+    document.getElementById('totalBills').textContent = totalBills;
+    document.getElementById('totalAmount').textContent = `₹${totalAmount.toFixed(2)}`;
+    document.getElementById('totalItems').textContent = totalItems;
+}
+
+function viewBill(billId) {
+    window.open(`/print-bill/${billId}/`, '_blank');
+}
+
+function printBill(billId) {
+    window.open(`/print-bill/${billId}/`, '_blank');
+}
+
+function exportBills(button) {
+    const date = document.getElementById('dateFilter').value;
+    const customer = document.getElementById('customerFilter').value;
+
+    if (!date) {
+        alert('Please select a date to export');
+        return;
+    }
+
+    const params = { date: date };
+    if (customer) params.customer = customer;
+
+    runExportJob('bills', params, button);
+}
+
+// Auto-load bills for today on page load
+window.addEventListener('DOMContentLoaded', function() {
+    loadBills();
+});
+
+console.log('Bills page loaded successfully!');
@@ -0,0 +1,78 @@
+const monthlyData = JSON.parse(document.getElementById('monthly-data').textContent);
+const chartMonths = JSON.parse(document.getElementById('chart-months').textContent);
+const pieData = JSON.parse(document.getElementById('pie-data').textContent);
+
+const colors = [
+    '#3498db', '#e74c3c', '#27ae60', '#f39c12',
+    '#9b59b6', '#1abc9c', '#34495e', '#e67e22'
+];
+
+const pieCtx = document.getElementById('pieChart').getContext('2d');
+new Chart(pieCtx, {
+    type: 'pie',
+    data: {
+        labels: pieData.map(item => item.label),
+        datasets: [{
+            data: pieData.map(item => item.value),
+            backgroundColor: colors.slice(0, pieData.length),
+            borderWidth: 2,
+            borderColor: '#fff'
+        }]
+    },
+    options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        plugins: {
+            legend: {
+                position: 'bottom',
+                labels: {
+                    padding: 20,
+                    font: {
+                        size: 12
+                    }
+                }
+            }
+        }
+    }
+});
+
+const barCtx = document.getElementById('barChart').getContext('2d');
+new Chart(barCtx, {
+    type: 'bar',
+    data: {
+        labels: chartMonths,
+        datasets: [{
+            label: 'Admissions',
+            data: monthlyData,
+            backgroundColor: '#3498db',
+            borderColor: '#2980b9',
+            borderWidth: 1,
+            borderRadius: 4
+        }]
+    },
+    options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        scales: {
+            y: {
+                beginAtZero: true,
+                ticks: {
+                    stepSize: 1
+                }
+            }
+        },
+        plugins: {
+            legend: {
+                display: false
+            }
+        }
+    }
+});
+
+function changeYear(year) {
+    window.location.href = `/dashboard/?year=${year}`;
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    console.log('Dashboard loaded successfully!');
+});
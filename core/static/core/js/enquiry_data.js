@@ -0,0 +1,193 @@
+// Enquiries are loaded from the server one page at a time
+const PAGE_SIZE = 50;
+const searchInput = document.getElementById('searchInput');
+const courseFilter = document.getElementById('courseFilter');
+const sortSelect = document.getElementById('sortSelect');
+let loadedEnquiries = [];
+let nextCursor = null;
+let filteredTotal = 0;
+let requestSerial = 0;
+
+function escapeHtml(value) {
+    const div = document.createElement('div');
+    div.textContent = value;
+    return div.innerHTML;
+}
+
+function filterParams() {
+    const params = new URLSearchParams();
+    const q = searchInput.value.trim();
+    if (q) params.append('q', q);
+    if (courseFilter.value) params.append('course', courseFilter.value);
+    params.append('sort', sortSelect.value);
+    return params;
+}
+
+function fetchPage(cursor) {
+    const params = filterParams();
+    params.append('page_size', PAGE_SIZE);
+    if (cursor) params.append('cursor', cursor);
+
+    return fetch(`/api/get-enquiries/?${params.toString()}`)
+        .then(response => response.json());
+}
+
+function loadEnquiries() {
+    // Ignore responses to searches the user has already typed past
+    const serial = ++requestSerial;
+
+    fetchPage(null)
+    .then(data => {
+        if (serial !== requestSerial) return;
+        if (data.success) {
+            loadedEnquiries = data.enquiries;
+            nextCursor = data.next_cursor;
+            filteredTotal = data.totals.filtered;
+            document.getElementById('totalCount').textContent = data.totals.all;
+            document.getElementById('filteredCount').textContent = data.totals.filtered;
+            displayEnquiries();
+        } else {
+            showError(data.error || 'Failed to load enquiries');
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        showError('Failed to load enquiries');
+    });
+}
+
+function loadMoreEnquiries() {
+    if (nextCursor === null) return;
+
+    const serial = requestSerial;
+    const button = document.getElementById('loadMoreBtn');
+    button.disabled = true;
+
+    fetchPage(nextCursor)
+    .then(data => {
+        if (serial !== requestSerial) return;
+        if (data.success) {
+            loadedEnquiries = loadedEnquiries.concat(data.enquiries);
+            nextCursor = data.next_cursor;
+            displayEnquiries();
+        } else {
+            alert(data.error || 'Failed to load more enquiries');
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        alert('Failed to load more enquiries');
+    })
+    .finally(() => {
+        button.disabled = false;
+    });
+}
+
+function displayEnquiries() {
+    const container = document.getElementById('enquiriesContainer');
+    document.getElementById('loadMore').style.display = nextCursor !== null ? 'block' : 'none';
+    document.getElementById('tableCount').textContent = `${loadedEnquiries.length} of ${filteredTotal} records`;
+
+    if (loadedEnquiries.length === 0) {
+        container.innerHTML = `
+            <div class="no-enquiries">
+                <div class="icon">📝</div>
+                <h3>No Enquiries Found</h3>
+                <p>No enquiry records match your search. <a href="/new-enquiry">Create a new enquiry</a></p>
+            </div>
+        `;
+        return;
+    }
+
+    const rows = loadedEnquiries.map(enquiry => `
+        <tr>
+            <td class="enquiry-no">${escapeHtml(enquiry.enquiry_no)}</td>
+            <td>${enquiry.enquiry_date}</td>
+            <td><strong>${escapeHtml(enquiry.student_name)}</strong></td>
+            <td>${escapeHtml(enquiry.mobile_no)}</td>
+            <td>
+                <span class="course-badge ${enquiry.course.toLowerCase().replace('_', '-')}">
+                    ${escapeHtml(enquiry.course_display)}
+                </span>
+            </td>
+            <td class="address-cell" title="${escapeHtml(enquiry.address)}">${escapeHtml(enquiry.address)}</td>
+        </tr>
+    `).join('');
+
+    container.innerHTML = `
+        <div style="overflow-x: auto;">
+            <table class="enquiries-table" id="enquiriesTable">
+                <thead>
+                    <tr>
+                        <th>Enquiry No</th>
+                        <th>Date</th>
+                        <th>Student Name</th>
+                        <th>Mobile No</th>
+                        <th>Course</th>
+                        <th>Address</th>
+                    </tr>
+                </thead>
+                <tbody>${rows}</tbody>
+            </table>
+        </div>
+    `;
+}
+
+function showError(message) {
+    document.getElementById('enquiriesContainer').innerHTML = `
+        <div class="no-enquiries">
+            <div class="icon">⚠️</div>
+            <h3>Error</h3>
+            <p>${escapeHtml(message)}</p>
+        </div>
+    `;
+}
+
+let searchTimer;
+searchInput.addEventListener('input', () => {
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(loadEnquiries, 300);
+});
+courseFilter.addEventListener('change', loadEnquiries);
+sortSelect.addEventListener('change', loadEnquiries);
+
+// Highlight the clicked row
+document.getElementById('enquiriesContainer').addEventListener('click', function(e) {
+    const row = e.target.closest('tbody tr');
+    if (!row) return;
+    this.querySelectorAll('tbody tr').forEach(r => r.style.backgroundColor = '');
+    row.style.backgroundColor = '#e3f2fd';
+});
+
+// Auto-refresh functionality (optional)
+let autoRefreshInterval;
+
+function startAutoRefresh() {
+    autoRefreshInterval = setInterval(() => {
+        // Refresh the first page every 30 seconds
+        loadEnquiries();
+    }, 30000);
+}
+
+function stopAutoRefresh() {
+    if (autoRefreshInterval) {
+        clearInterval(autoRefreshInterval);
+    }
+}
+
+// Start auto-refresh on page load
+document.addEventListener('DOMContentLoaded', function() {
+    loadEnquiries();
+    console.log('Enquiry Data page loaded successfully!');
+    // Uncomment next line if you want auto-refresh
+    // startAutoRefresh();
+});
+
+// Stop auto-refresh when user is interacting
+['mousedown', 'keydown', 'scroll', 'touchstart'].forEach(event => {
+    document.addEventListener(event, () => {
+        stopAutoRefresh();
+        // Restart after 5 minutes of inactivity
+        setTimeout(startAutoRefresh, 300000);
+    });
+});
@@ -0,0 +1,220 @@
+let selectedStudentData = null;
+let searchTimeout = null;
+
+// Search student
+document.getElementById('studentSearch').addEventListener('input', function(e) {
+    const searchTerm = e.target.value.trim();
+
+    clearTimeout(searchTimeout);
+
+    if (searchTerm.length < 2) {
+        document.getElementById('searchResults').classList.remove('show');
+        return;
+    }
+
+    searchTimeout = setTimeout(() => {
+        searchStudent(searchTerm);
+    }, 500);
+});
+
+function searchStudent(searchTerm) {
+    const csrftoken = getCookie('csrftoken');
+
+    fetch('/api/search-student-payment/', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': csrftoken
+        },
+        body: JSON.stringify({ search_term: searchTerm })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            displaySearchResults(data.students);
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+    });
+}
+
+function displaySearchResults(students) {
+    const resultsContainer = document.getElementById('searchResults');
+
+    if (students.length === 0) {
+        resultsContainer.innerHTML = '<div style="padding: 15px; text-align: center; color: #7f8c8d;">No students found</div>';
+        resultsContainer.classList.add('show');
+        return;
+    }
+
+    const resultsHtml = students.map(student => `
+        <div class="search-result-item" onclick='selectStudent(${JSON.stringify(student)})'>
+            <div class="result-name">${student.full_name}</div>
+            <div class="result-details">
+                <span>📱 ${student.mobile}</span>
+                <span class="result-badge badge-course">${student.course}</span>
+                <span class="result-badge badge-remaining">Remaining: ₹${student.remaining_fees}</span>
+            </div>
+        </div>
+    `).join('');
+
+    resultsContainer.innerHTML = resultsHtml;
+    resultsContainer.classList.add('show');
+}
+
+function selectStudent(student) {
+    selectedStudentData = student;
+
+    // Hide search results
+    document.getElementById('searchResults').classList.remove('show');
+
+    // Update student info
+    document.getElementById('studentName').textContent = student.full_name;
+    document.getElementById('formNo').textContent = student.form_no;
+    document.getElementById('course').textContent = student.course;
+    document.getElementById('batch').textContent = student.batch;
+    document.getElementById('totalFees').textContent = `₹${student.total_fees}`;
+    document.getElementById('paidFees').textContent = `₹${student.paid_fees}`;
+    document.getElementById('remainingFees').textContent = `₹${student.remaining_fees}`;
+    document.getElementById('mobile').textContent = student.mobile;
+
+    // Set admission ID
+    document.getElementById('admissionId').value = student.id;
+
+    // Show selected student and payment form
+    document.getElementById('selectedStudent').classList.add('show');
+    document.getElementById('paymentForm').classList.add('show');
+
+    // Set max amount
+    document.getElementById('amountPaid').max = student.remaining_fees;
+
+    // Clear search input
+    document.getElementById('studentSearch').value = student.full_name;
+}
+
+// Form submission
+document.getElementById('paymentForm').addEventListener('submit', function(e) {
+    const amount = parseFloat(document.getElementById('amountPaid').value);
+    const remaining = selectedStudentData.remaining_fees;
+
+    if (amount <= 0) {
+        e.preventDefault();
+        alert('Amount must be greater than zero!');
+        return;
+    }
+
+    if (amount > remaining) {
+        e.preventDefault();
+        alert(`Amount cannot exceed remaining fees (₹${remaining})!`);
+        return;
+    }
+
+    const submitBtn = document.getElementById('submitBtn');
+    submitBtn.disabled = true;
+    submitBtn.textContent = '⏳ Processing Payment...';
+});
+
+// Check if receipt number is in URL
+window.addEventListener('DOMContentLoaded', function() {
+    const urlParams = new URLSearchParams(window.location.search);
+    const receiptNo = urlParams.get('receipt');
+
+    if (receiptNo) {
+        loadReceipt(receiptNo);
+    }
+});
+
+function loadReceipt(receiptNo) {
+    fetch(`/api/get-receipt/?receipt_no=${receiptNo}`)
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            showReceipt(data.receipt);
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+    });
+}
+
+function showReceipt(receipt) {
+    const receiptHtml = `
+        <div class="receipt-header">
+            <div class="institute-name">SHRI SAMARTH COMPUTER EDUCATION</div>
+            <div class="institute-address">Behind Bus Stand, Samarth Road</div>
+            <div class="institute-address">Shivaji Nagar, Murud - 413510</div>
+            <div class="institute-phone">📞 9960638066</div>
+        </div>
+
+        <div class="receipt-title">FEE PAYMENT RECEIPT</div>
+
+        <div class="receipt-meta">
+            <div><strong>Receipt No:</strong> ${receipt.receipt_no}</div>
+            <div><strong>Date:</strong> ${receipt.payment_date}</div>
+        </div>
+
+        <div class="receipt-details">
+            <div class="detail-row">
+                <div class="detail-label">Student Name:</div>
+                <div class="detail-value">${receipt.student_name}</div>
+            </div>
+            <div class="detail-row">
+                <div class="detail-label">Course:</div>
+                <div class="detail-value">${receipt.course}</div>
+            </div>
+            <div class="detail-row">
+                <div class="detail-label">Batch:</div>
+                <div class="detail-value">${receipt.batch}</div>
+            </div>
+            <div class="detail-row">
+                <div class="detail-label">Payment Mode:</div>
+                <div class="detail-value">${receipt.payment_mode}</div>
+            </div>
+            ${receipt.transaction_ref ? `
+            <div class="detail-row">
+                <div class="detail-label">Transaction Ref:</div>
+                <div class="detail-value">${receipt.transaction_ref}</div>
+            </div>
+            ` : ''}
+        </div>
+
+        <div class="amount-section">
+            <div class="amount-row">
+                <div class="amount-label">Amount Paid:</div>
+                <div class="amount-value">₹${receipt.amount_paid}</div>
+            </div>
+            <div class="amount-words">(${receipt.amount_in_words})</div>
+        </div>
+
+        <div class="signature-section">
+            <div class="signature-box">
+                <div class="signature-line">
+                    Authorized Signature & Stamp
+                </div>
+            </div>
+        </div>
+    `;
+
+    document.getElementById('receiptContent').innerHTML = receiptHtml;
+    document.getElementById('receiptModal').classList.add('show');
+}
+
+function closeReceiptModal() {
+    document.getElementById('receiptModal').classList.remove('show');
+    // Remove receipt parameter from URL
+    window.history.replaceState({}, document.title, window.location.pathname);
+}
+
+function printReceipt() {
+    window.print();
+}
+
+// Close modal on outside click
+document.getElementById('receiptModal').addEventListener('click', function(e) {
+    if (e.target === this) {
+        closeReceiptModal();
+    }
+});
+
+console.log('Fees Payment page loaded successfully!');
@@ -0,0 +1,92 @@
+function togglePassword(fieldId) {
+  const passwordField = document.getElementById(fieldId);
+  const toggleBtn = passwordField.nextElementSibling;
+
+  if (passwordField.type === 'password') {
+    passwordField.type = 'text';
+    toggleBtn.innerHTML = '🙈';
+  } else {
+    passwordField.type = 'password';
+    toggleBtn.innerHTML = '👁️';
+  }
+}
+
+// Form submission handling
+document.getElementById('resetForm').addEventListener('submit', function(e) {
+  const resetBtn = document.getElementById('resetBtn');
+  const email = document.getElementById('email').value.trim();
+  const newPassword = document.getElementById('new_password').value;
+  const confirmPassword = document.getElementById('confirm_password').value;
+
+  // Validation
+  if (!email || !newPassword || !confirmPassword) {
+    e.preventDefault();
+    alert('Please fill all required fields.');
+    return;
+  }
+
+  if (newPassword !== confirmPassword) {
+    e.preventDefault();
+    alert('Passwords do not match!');
+    document.getElementById('confirm_password').focus();
+    return;
+  }
+
+  if (newPassword.length < 6) {
+    e.preventDefault();
+    alert('Password must be at least 6 characters long.');
+    document.getElementById('new_password').focus();
+    return;
+  }
+
+  // Check if password has letters and numbers
+  if (!/[A-Za-z]/.test(newPassword) || !/\d/.test(newPassword)) {
+    e.preventDefault();
+    alert('Password must contain both letters and numbers.');
+    document.getElementById('new_password').focus();
+    return;
+  }
+
+  // Disable button to prevent double submission
+  resetBtn.disabled = true;
+  resetBtn.textContent = 'Resetting Password...';
+
+  // Re-enable after 5 seconds in case of error
+  setTimeout(() => {
+    resetBtn.disabled = false;
+    resetBtn.textContent = 'Reset Password';
+  }, 5000);
+});
+
+// Real-time password match validation
+document.getElementById('confirm_password').addEventListener('input', function() {
+  const newPassword = document.getElementById('new_password').value;
+  const confirmPassword = this.value;
+
+  if (newPassword && confirmPassword && newPassword !== confirmPassword) {
+    this.style.borderColor = '#e74c3c';
+  } else {
+    this.style.borderColor = '#ecf0f1';
+  }
+});
+
+// Auto-focus email field
+document.getElementById('email').focus();
+
+// Password strength indicator
+document.getElementById('new_password').addEventListener('input', function() {
+  const password = this.value;
+  const hasLetters = /[A-Za-z]/.test(password);
+  const hasNumbers = /\d/.test(password);
+  const isLongEnough = password.length >= 6;
+
+  if (password.length > 0) {
+    if (hasLetters && hasNumbers && isLongEnough) {
+      this.style.borderColor = '#27ae60';
+    } else {
+      this.style.borderColor = '#f39c12';
+    }
+  } else {
+    this.style.borderColor = '#ecf0f1';
+  }
+});
@@ -0,0 +1,56 @@
+function togglePassword() {
+  const passwordField = document.getElementById('password');
+  const toggleBtn = document.querySelector('.toggle-password');
+
+  if (passwordField.type === 'password') {
+    passwordField.type = 'text';
+    toggleBtn.innerHTML = '🙈';
+  } else {
+    passwordField.type = 'password';
+    toggleBtn.innerHTML = '👁️';
+  }
+}
+
+// Form submission handling
+document.getElementById('loginForm').addEventListener('submit', function(e) {
+  const loginBtn = document.getElementById('loginBtn');
+  const email = document.getElementById('email').value.trim();
+  const password = document.getElementById('password').value;
+
+  // Basic validation
+  if (!email || !password) {
+    e.preventDefault();
+    alert('Please enter both email and password.');
+    return;
+  }
+
+  // Disable button to prevent double submission
+  loginBtn.disabled = true;
+  loginBtn.textContent = 'Signing In...';
+
+  // Re-enable after 3 seconds in case of error
+  setTimeout(() => {
+    loginBtn.disabled = false;
+    loginBtn.textContent = 'Sign In';
+  }, 3000);
+});
+
+// Auto-focus email field
+document.getElementById('email').focus();
+
+// Handle remember me functionality
+if (localStorage.getItem('rememberedEmail')) {
+  document.getElementById('email').value = localStorage.getItem('rememberedEmail');
+  document.getElementById('remember_me').checked = true;
+}
+
+document.getElementById('loginForm').addEventListener('submit', function() {
+  const rememberMe = document.getElementById('remember_me').checked;
+  const email = document.getElementById('email').value;
+
+  if (rememberMe) {
+    localStorage.setItem('rememberedEmail', email);
+  } else {
+    localStorage.removeItem('rememberedEmail');
+  }
+});
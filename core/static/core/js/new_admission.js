@@ -0,0 +1,262 @@
+// Initialize form
+window.onload = function() {
+    // Set current date
+    const today = new Date().toISOString().split('T')[0];
+    document.getElementById('admissionDate').value = today;
+
+    // Populate batch dropdown
+    populateBatchDropdown();
+
+    // Auto-focus first name field
+    document.getElementById('firstName').focus();
+};
+
+// Populate batch dropdown with months
+function populateBatchDropdown() {
+    const batchSelect = document.getElementById('batch');
+    const months = [
+        'January', 'February', 'March', 'April', 'May', 'June',
+        'July', 'August', 'September', 'October', 'November', 'December'
+    ];
+
+    // Add 2025 months
+    for (let i = 0; i < 12; i++) {
+        const monthNum = (i + 1).toString().padStart(2, '0');
+        const option = document.createElement('option');
+        option.value = `2025-${monthNum}`;
+        option.textContent = `${months[i]} 2025`;
+        batchSelect.appendChild(option);
+    }
+
+    // Add 2026 months
+    for (let i = 0; i < 12; i++) {
+        const monthNum = (i + 1).toString().padStart(2, '0');
+        const option = document.createElement('option');
+        option.value = `2026-${monthNum}`;
+        option.textContent = `${months[i]} 2026`;
+        batchSelect.appendChild(option);
+    }
+
+    // Set current month as default
+    const currentMonth = new Date().toISOString().substring(0, 7);
+    batchSelect.value = currentMonth;
+}
+
+// Handle installment checkbox (only one can be selected)
+function handleInstallmentChange(checkbox) {
+    const checkboxes = document.getElementsByName('installment');
+    checkboxes.forEach(cb => {
+        if (cb !== checkbox) cb.checked = false;
+    });
+}
+
+// Photo upload handling
+function handlePhotoUpload(event) {
+    const file = event.target.files[0];
+    if (file) {
+        // Validate file size (max 5MB)
+        if (file.size > 5 * 1024 * 1024) {
+            alert('File size should not exceed 5MB');
+            event.target.value = '';
+            return;
+        }
+
+        // Validate file type
+        if (!file.type.startsWith('image/')) {
+            alert('Please upload an image file');
+            event.target.value = '';
+            return;
+        }
+
+        const reader = new FileReader();
+        reader.onload = function(e) {
+            const preview = document.getElementById('photoPreview');
+            const placeholder = document.getElementById('uploadPlaceholder');
+            const removeBtn = document.getElementById('removePhotoBtn');
+            const uploadArea = document.querySelector('.photo-upload-area');
+
+            preview.src = e.target.result;
+            preview.classList.add('show');
+            placeholder.style.display = 'none';
+            removeBtn.classList.add('show');
+            uploadArea.classList.add('has-image');
+        };
+        reader.readAsDataURL(file);
+    }
+}
+
+// Remove photo
+function removePhoto(event) {
+    event.stopPropagation();
+    const preview = document.getElementById('photoPreview');
+    const placeholder = document.getElementById('uploadPlaceholder');
+    const removeBtn = document.getElementById('removePhotoBtn');
+    const photoInput = document.getElementById('photoInput');
+    const uploadArea = document.querySelector('.photo-upload-area');
+
+    preview.src = '';
+    preview.classList.remove('show');
+    placeholder.style.display = 'flex';
+    removeBtn.classList.remove('show');
+    photoInput.value = '';
+    uploadArea.classList.remove('has-image');
+}
+
+// Form submission with validation
+document.getElementById('admissionForm').addEventListener('submit', function(e) {
+    // Get form values
+    const batch = document.getElementById('batch').value;
+    const courseName = document.getElementById('courseName').value;
+    const firstName = document.getElementById('firstName').value.trim();
+    const middleName = document.getElementById('middleName').value.trim();
+    const lastName = document.getElementById('lastName').value.trim();
+    const birthDate = document.getElementById('birthDate').value;
+    const mobileOwn = document.getElementById('mobileOwn').value.trim();
+    const address = document.getElementById('address').value.trim();
+    const qualification = document.getElementById('qualification').value.trim();
+    const installmentChecked = document.querySelector('input[name="installment"]:checked');
+
+    // Validation
+    if (!batch) {
+        e.preventDefault();
+        alert('❌ Please select a batch (month-year)');
+        document.getElementById('batch').focus();
+        return false;
+    }
+
+    if (!courseName) {
+        e.preventDefault();
+        alert('❌ Please select a course');
+        document.getElementById('courseName').focus();
+        return false;
+    }
+
+    if (!firstName || firstName.length < 2) {
+        e.preventDefault();
+        alert('❌ First name must be at least 2 characters long');
+        document.getElementById('firstName').focus();
+        return false;
+    }
+
+    if (!middleName || middleName.length < 2) {
+        e.preventDefault();
+        alert('❌ Middle name must be at least 2 characters long');
+        document.getElementById('middleName').focus();
+        return false;
+    }
+
+    if (!lastName || lastName.length < 2) {
+        e.preventDefault();
+        alert('❌ Last name must be at least 2 characters long');
+        document.getElementById('lastName').focus();
+        return false;
+    }
+
+    if (!birthDate) {
+        e.preventDefault();
+        alert('❌ Birth date is required');
+        document.getElementById('birthDate').focus();
+        return false;
+    }
+
+    if (!mobileOwn || !/^\d{10}$/.test(mobileOwn)) {
+        e.preventDefault();
+        alert('❌ Mobile number must be exactly 10 digits');
+        document.getElementById('mobileOwn').focus();
+        return false;
+    }
+
+    if (!address || address.length < 10) {
+        e.preventDefault();
+        alert('❌ Address must be at least 10 characters long');
+        document.getElementById('address').focus();
+        return false;
+    }
+
+    if (!qualification || qualification.length < 2) {
+        e.preventDefault();
+        alert('❌ Current qualification is required');
+        document.getElementById('qualification').focus();
+        return false;
+    }
+
+    if (!installmentChecked) {
+        e.preventDefault();
+        alert('❌ Please select a fees installment option');
+        return false;
+    }
+
+    // Show loading state
+    const submitBtn = document.getElementById('submitBtn');
+    const btnText = document.getElementById('btnText');
+    submitBtn.disabled = true;
+    btnText.textContent = '⏳ Submitting...';
+
+    // Form will submit if all validations pass
+    return true;
+});
+
+// Real-time mobile number validation
+document.getElementById('mobileOwn').addEventListener('input', function(e) {
+    this.value = this.value.replace(/[^0-9]/g, '').substring(0, 10);
+
+    // Visual feedback
+    if (this.value.length === 10) {
+        this.style.borderColor = '#27ae60';
+    } else if (this.value.length > 0) {
+        this.style.borderColor = '#f39c12';
+    } else {
+        this.style.borderColor = '#e0e0e0';
+    }
+});
+
+document.getElementById('mobileParents').addEventListener('input', function(e) {
+    this.value = this.value.replace(/[^0-9]/g, '').substring(0, 10);
+
+    // Visual feedback
+    if (this.value.length === 10) {
+        this.style.borderColor = '#27ae60';
+    } else if (this.value.length > 0) {
+        this.style.borderColor = '#f39c12';
+    } else {
+        this.style.borderColor = '#e0e0e0';
+    }
+});
+
+// Real-time name validation
+['firstName', 'middleName', 'lastName'].forEach(fieldId => {
+    document.getElementById(fieldId).addEventListener('input', function(e) {
+        // Remove numbers and special characters, allow only letters and spaces
+        this.value = this.value.replace(/[^a-zA-Z\s]/g, '');
+        // Capitalize first letter of each word
+        this.value = this.value.replace(/\b\w/g, l => l.toUpperCase());
+    });
+});
+
+// Add course modal functionality (placeholder for custom courses)
+function openAddCourseModal() {
+    const courseName = prompt('Enter new course name:');
+    if (courseName && courseName.trim()) {
+        const select = document.getElementById('courseName');
+        const option = document.createElement('option');
+        option.value = courseName.trim();
+        option.textContent = courseName.trim();
+        select.appendChild(option);
+        select.value = courseName.trim();
+        alert('✅ Course "' + courseName.trim() + '" added successfully!');
+    }
+}
+
+// Auto-hide success messages after 5 seconds
+document.addEventListener('DOMContentLoaded', function() {
+    const alerts = document.querySelectorAll('.alert-success');
+    alerts.forEach(alert => {
+        setTimeout(() => {
+            alert.style.opacity = '0';
+            alert.style.transform = 'translateY(-20px)';
+            setTimeout(() => alert.remove(), 300);
+        }, 5000);
+    });
+});
+
+console.log('✅ New Admission form loaded successfully!');
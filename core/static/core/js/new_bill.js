@@ -0,0 +1,172 @@
+let itemCount = 0;
+
+// Set today's date
+document.getElementById('billDate').valueAsDate = new Date();
+
+// Add first item on load
+window.addEventListener('DOMContentLoaded', function() {
+    addItem();
+});
+
+function addItem() {
+    itemCount++;
+    const tbody = document.getElementById('itemsBody');
+    const row = document.createElement('tr');
+    row.id = `item-${itemCount}`;
+
+    row.innerHTML = `
+        <td>
+            <input type="text" class="item-name" placeholder="Enter item name" required>
+        </td>
+        <td>
+            <input type="number" class="item-quantity" value="1" min="0.01" step="0.01"
+                   onchange="calculateAmount(${itemCount})" required>
+        </td>
+        <td>
+            <input type="number" class="item-rate" value="0" min="0" step="0.01"
+                   onchange="calculateAmount(${itemCount})" required>
+        </td>
+        <td>
+            <input type="number" class="item-amount" value="0" readonly>
+        </td>
+        <td>
+            <button type="button" class="btn-remove" onclick="removeItem(${itemCount})"
+                    ${itemCount === 1 ? 'style="display:none"' : ''}>
+                ❌
+            </button>
+        </td>
+    `;
+
+    tbody.appendChild(row);
+}
+
+function removeItem(id) {
+    const row = document.getElementById(`item-${id}`);
+    if (row) {
+        row.remove();
+        calculateTotal();
+    }
+}
+
+function calculateAmount(id) {
+    const row = document.getElementById(`item-${id}`);
+    if (!row) return;
+
+    const quantity = parseFloat(row.querySelector('.item-quantity').value) || 0;
+    const rate = parseFloat(row.querySelector('.item-rate').value) || 0;
+    const amount = quantity * rate;
+
+    row.querySelector('.item-amount').value = amount.toFixed(2);
+    calculateTotal();
+}
+
+function calculateTotal() {
+    let total = 0;
+    document.querySelectorAll('.item-amount').forEach(input => {
+        total += parseFloat(input.value) || 0;
+    });
+
+    document.getElementById('grandTotal').textContent = `₹${total.toFixed(2)}`;
+}
+
+// Mobile number validation
+document.getElementById('customerMobile').addEventListener('input', function(e) {
+    this.value = this.value.replace(/[^0-9]/g, '').substring(0, 10);
+});
+
+// Form submission
+document.getElementById('billForm').addEventListener('submit', function(e) {
+    e.preventDefault();
+
+    const billDate = document.getElementById('billDate').value;
+    const customerName = document.getElementById('customerName').value.trim();
+    const customerMobile = document.getElementById('customerMobile').value.trim();
+
+    // Validate
+    if (!billDate || !customerName || !customerMobile) {
+        showMessage('Please fill all required fields', 'error');
+        return;
+    }
+
+    if (customerMobile.length !== 10) {
+        showMessage('Mobile number must be 10 digits', 'error');
+        return;
+    }
+
+    // Collect items
+    const items = [];
+    document.querySelectorAll('#itemsBody tr').forEach(row => {
+        const itemName = row.querySelector('.item-name').value.trim();
+        const quantity = parseFloat(row.querySelector('.item-quantity').value);
+        const rate = parseFloat(row.querySelector('.item-rate').value);
+        const amount = parseFloat(row.querySelector('.item-amount').value);
+
+        if (itemName && quantity > 0 && rate >= 0) {
+            items.push({
+                item_name: itemName,
+                quantity: quantity,
+                rate: rate,
+                amount: amount
+            });
+        }
+    });
+
+    if (items.length === 0) {
+        showMessage('Please add at least one item', 'error');
+        return;
+    }
+
+    // Submit form
+    const submitBtn = document.getElementById('submitBtn');
+    submitBtn.disabled = true;
+    submitBtn.textContent = '⏳ Creating Bill...';
+
+    const formData = new FormData();
+    formData.append('bill_date', billDate);
+    formData.append('customer_name', customerName);
+    formData.append('customer_mobile', customerMobile);
+    formData.append('items', JSON.stringify(items));
+    formData.append('csrfmiddlewaretoken', getCookie('csrftoken'));
+
+    fetch('/new-bill/', {
+        method: 'POST',
+        body: formData
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            showMessage(`Bill created successfully! Receipt No: ${data.receipt_no}`, 'success');
+
+            // Reset form
+            setTimeout(() => {
+                window.location.href = `/print-bill/${data.bill_id}/`;
+            }, 1500);
+        } else {
+            showMessage(data.error || 'Failed to create bill', 'error');
+            submitBtn.disabled = false;
+            submitBtn.textContent = '💾 Create Bill';
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        showMessage('An error occurred. Please try again.', 'error');
+        submitBtn.disabled = false;
+        submitBtn.textContent = '💾 Create Bill';
+    });
+});
+
+function showMessage(message, type) {
+    const container = document.getElementById('messageContainer');
+    container.innerHTML = `
+        <div class="alert alert-${type}">
+            ${message}
+        </div>
+    `;
+
+    // Auto-hide after 5 seconds
+    setTimeout(() => {
+        container.innerHTML = '';
+    }, 5000);
+}
+
+console.log('New Bill page loaded successfully!');
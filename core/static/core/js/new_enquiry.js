@@ -0,0 +1,81 @@
+// Form validation and handling
+document.getElementById('enquiryForm').addEventListener('submit', function(e) {
+    const submitBtn = document.getElementById('submitBtn');
+    const studentName = document.getElementById('student_name').value.trim();
+    const mobileNo = document.getElementById('mobile_no').value.trim();
+    const course = document.getElementById('course').value;
+    const address = document.getElementById('address').value.trim();
+
+    // Client-side validation
+    if (!studentName || studentName.length < 2) {
+        e.preventDefault();
+        alert('Student name must be at least 2 characters long.');
+        document.getElementById('student_name').focus();
+        return;
+    }
+
+    if (!mobileNo || mobileNo.length !== 10 || !/^\d{10}$/.test(mobileNo)) {
+        e.preventDefault();
+        alert('Mobile number must be exactly 10 digits.');
+        document.getElementById('mobile_no').focus();
+        return;
+    }
+
+    if (!course) {
+        e.preventDefault();
+        alert('Please select a course.');
+        document.getElementById('course').focus();
+        return;
+    }
+
+    if (!address || address.length < 10) {
+        e.preventDefault();
+        alert('Address must be at least 10 characters long.');
+        document.getElementById('address').focus();
+        return;
+    }
+
+    // Disable submit button to prevent double submission
+    submitBtn.disabled = true;
+    submitBtn.textContent = '⏳ Submitting...';
+
+    // Re-enable after 3 seconds in case of error
+    setTimeout(() => {
+        submitBtn.disabled = false;
+        submitBtn.textContent = '💾 Submit Enquiry';
+    }, 3000);
+});
+
+// Real-time mobile number validation
+document.getElementById('mobile_no').addEventListener('input', function(e) {
+    // Remove non-digits
+    this.value = this.value.replace(/[^0-9]/g, '');
+
+    // Limit to 10 digits
+    if (this.value.length > 10) {
+        this.value = this.value.substring(0, 10);
+    }
+
+    // Visual feedback
+    if (this.value.length === 10) {
+        this.style.borderColor = '#27ae60';
+    } else if (this.value.length > 0) {
+        this.style.borderColor = '#f39c12';
+    } else {
+        this.style.borderColor = '#ecf0f1';
+    }
+});
+
+// Real-time name validation
+document.getElementById('student_name').addEventListener('input', function(e) {
+    // Remove extra spaces and capitalize first letter of each word
+    this.value = this.value.replace(/\s+/g, ' ').replace(/\b\w/g, l => l.toUpperCase());
+});
+
+// Auto-focus first field
+document.getElementById('student_name').focus();
+
+// Add loading animation
+document.addEventListener('DOMContentLoaded', function() {
+    console.log('New Enquiry form loaded successfully!');
+});
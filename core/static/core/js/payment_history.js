@@ -0,0 +1,338 @@
+let currentPaymentData = null;
+let isEditMode = false;
+
+// Populate batch dropdown
+window.addEventListener('DOMContentLoaded', function() {
+    const batchFilter = document.getElementById('batchFilter');
+    const months = [
+        'January', 'February', 'March', 'April', 'May', 'June',
+        'July', 'August', 'September', 'October', 'November', 'December'
+    ];
+
+    for (let year = 2025; year <= 2026; year++) {
+        for (let i = 0; i < 12; i++) {
+            const monthNum = (i + 1).toString().padStart(2, '0');
+            const option = document.createElement('option');
+            option.value = `${year}-${monthNum}`;
+            option.textContent = `${months[i]} ${year}`;
+            batchFilter.appendChild(option);
+        }
+    }
+});
+
+const PAGE_SIZE = 50;
+let loadedPayments = [];
+let nextCursor = null;
+let totalCount = null;
+
+function filterParams() {
+    const course = document.getElementById('courseFilter').value;
+    const batch = document.getElementById('batchFilter').value;
+    const studentName = document.getElementById('studentNameFilter').value;
+
+    const params = new URLSearchParams();
+    if (course) params.append('course', course);
+    if (batch) params.append('batch', batch);
+    if (studentName) params.append('student_name', studentName);
+    return params;
+}
+
+function showError(message) {
+    document.getElementById('paymentsContainer').innerHTML = `
+        <div class="no-results">
+            <div class="no-results-icon">❌</div>
+            <h3>Error</h3>
+            <p>${message}</p>
+        </div>
+    `;
+    document.getElementById('loadMore').style.display = 'none';
+}
+
+function fetchPage(cursor) {
+    const params = filterParams();
+    params.append('page_size', PAGE_SIZE);
+    if (cursor) params.append('cursor', cursor);
+
+    return fetch(`/api/get-payment-history/?${params.toString()}`)
+        .then(response => response.json());
+}
+
+// Totals are a separate request, so the first page does not wait for them
+function loadTotals() {
+    fetch(`/api/get-payment-totals/?${filterParams().toString()}`)
+    .then(response => response.json())
+    .then(data => updateStats(data.success ? data.totals : null))
+    .catch(error => console.error('Error:', error));
+}
+
+function loadPayments() {
+    loadedPayments = [];
+    nextCursor = null;
+    totalCount = null;
+    loadTotals();
+
+    const container = document.getElementById('paymentsContainer');
+    container.innerHTML = `
+        <div class="no-results">
+            <div class="no-results-icon">⏳</div>
+            <h3>Loading...</h3>
+        </div>
+    `;
+    document.getElementById('loadMore').style.display = 'none';
+
+    fetchPage(null)
+    .then(data => {
+        if (data.success) {
+            loadedPayments = data.payments;
+            nextCursor = data.next_cursor;
+            displayPayments(loadedPayments);
+        } else {
+            showError(data.error || 'Failed to load payments');
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        showError('Failed to load payment history');
+    });
+}
+
+function loadMorePayments() {
+    if (!nextCursor) return;
+
+    const button = document.getElementById('loadMoreBtn');
+    button.disabled = true;
+
+    fetchPage(nextCursor)
+    .then(data => {
+        if (data.success) {
+            loadedPayments = loadedPayments.concat(data.payments);
+            nextCursor = data.next_cursor;
+            displayPayments(loadedPayments);
+        } else {
+            alert(data.error || 'Failed to load more payments');
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        alert('Failed to load more payments');
+    })
+    .finally(() => {
+        button.disabled = false;
+    });
+}
+
+function displayPayments(payments) {
+    const container = document.getElementById('paymentsContainer');
+    document.getElementById('loadMore').style.display = nextCursor ? 'block' : 'none';
+
+    if (payments.length === 0) {
+        container.innerHTML = `
+            <div class="no-results">
+                <div class="no-results-icon">📭</div>
+                <h3>No Payments Found</h3>
+                <p>No payment records match your filters</p>
+            </div>
+        `;
+        document.getElementById('recordCount').textContent = '0 records';
+        return;
+    }
+
+    const tableHtml = `
+        <table class="payments-table">
+            <thead>
+                <tr>
+                    <th>Receipt No</th>
+                    <th>Date</th>
+                    <th>Student Name</th>
+                    <th>Course</th>
+                    <th>Batch</th>
+                    <th>Amount</th>
+                    <th>Mode</th>
+                    <th>Actions</th>
+                </tr>
+            </thead>
+            <tbody>
+                ${payments.map(payment => `
+                    <tr>
+                        <td class="receipt-no">${payment.receipt_no}</td>
+                        <td>${new Date(payment.payment_date).toLocaleDateString('en-GB')}</td>
+                        <td><strong>${payment.student_name}</strong></td>
+                        <td>${payment.course}</td>
+                        <td>${payment.batch}</td>
+                        <td class="amount-cell">₹${payment.amount_paid}</td>
+                        <td>
+                            <span class="payment-badge badge-${payment.payment_mode.toLowerCase()}">
+                                ${payment.payment_mode}
+                            </span>
+                        </td>
+                        <td>
+                            <div class="action-buttons">
+                                <button class="action-btn btn-view" onclick="viewPayment(${payment.id})">
+                                    👁️ View
+                                </button>
+                                <button class="action-btn btn-edit" onclick="editPayment(${payment.id})">
+                                    ✏️ Edit
+                                </button>
+                            </div>
+                        </td>
+                    </tr>
+                `).join('')}
+            </tbody>
+        </table>
+    `;
+
+    container.innerHTML = tableHtml;
+    updateRecordCount();
+}
+
+function updateRecordCount() {
+    if (loadedPayments.length === 0) return;
+    document.getElementById('recordCount').textContent = totalCount === null
+        ? `${loadedPayments.length} records`
+        : `${loadedPayments.length} of ${totalCount} records`;
+}
+
+function updateStats(totals) {
+    totalCount = totals ? totals.count : 0;
+    const totalAmount = totals ? totals.amount : 0;
+
+    document.getElementById('totalPayments').textContent = totalCount;
+    document.getElementById('totalAmount').textContent = `₹${totalAmount.toFixed(2)}`;
+    updateRecordCount();
+}
+
+function viewPayment(paymentId) {
+    loadPaymentDetails(paymentId, false);
+}
+
+function editPayment(paymentId) {
+    loadPaymentDetails(paymentId, true);
+}
+
+function loadPaymentDetails(paymentId, editMode) {
+    // Payments shown in the table are already loaded
+    const payment = loadedPayments.find(p => p.id === paymentId);
+    if (payment) {
+        displayPaymentModal(payment, editMode);
+    }
+}
+
+function displayPaymentModal(payment, editMode) {
+    currentPaymentData = { ...payment };
+    isEditMode = editMode;
+
+    const readonly = editMode ? '' : 'readonly';
+    const modalHtml = `
+        <div class="detail-grid">
+            <div class="detail-item">
+                <div class="detail-label">Receipt No</div>
+                <div class="detail-value">
+                    <input type="text" value="${payment.receipt_no}" readonly>
+                </div>
+            </div>
+            <div class="detail-item">
+                <div class="detail-label">Payment Date</div>
+                <div class="detail-value">
+                    <input type="date" id="paymentDate" value="${payment.payment_date}" ${readonly}>
+                </div>
+            </div>
+            <div class="detail-item">
+                <div class="detail-label">Student Name</div>
+                <div class="detail-value">
+                    <input type="text" value="${payment.student_name}" readonly>
+                </div>
+            </div>
+            <div class="detail-item">
+                <div class="detail-label">Form No</div>
+                <div class="detail-value">
+                    <input type="text" value="${payment.form_no}" readonly>
+                </div>
+            </div>
+            <div class="detail-item">
+                <div class="detail-label">Course</div>
+                <div class="detail-value">
+                    <input type="text" value="${payment.course}" readonly>
+                </div>
+            </div>
+            <div class="detail-item">
+                <div class="detail-label">Batch</div>
+                <div class="detail-value">
+                    <input type="text" value="${payment.batch}" readonly>
+                </div>
+            </div>
+            <div class="detail-item">
+                <div class="detail-label">Amount Paid</div>
+                <div class="detail-value">
+                    <input type="number" id="amountPaid" value="${payment.amount_paid}" ${readonly}>
+                </div>
+            </div>
+            <div class="detail-item">
+                <div class="detail-label">Payment Mode</div>
+                <div class="detail-value">
+                    <input type="text" value="${payment.payment_mode}" readonly>
+                </div>
+            </div>
+            <div class="detail-item">
+                <div class="detail-label">Transaction Ref</div>
+                <div class="detail-value">
+                    <input type="text" id="transactionRef" value="${payment.transaction_ref}" ${readonly}>
+                </div>
+            </div>
+            <div class="detail-item">
+                <div class="detail-label">Created By</div>
+                <div class="detail-value">
+                    <input type="text" value="${payment.created_by}" readonly>
+                </div>
+            </div>
+            <div class="detail-item" style="grid-column: 1 / -1;">
+                <div class="detail-label">Remarks</div>
+                <div class="detail-value">
+                    <textarea id="remarks" rows="3" ${readonly}>${payment.remarks}</textarea>
+                </div>
+            </div>
+        </div>
+
+        <div class="modal-actions">
+            ${editMode ? `
+                <button class="btn btn-success" onclick="savePayment()">💾 Save Changes</button>
+                <button class="btn btn-secondary" onclick="closeModal()">❌ Cancel</button>
+            ` : `
+                <button class="btn btn-primary" onclick="printPayment()">🖨️ Print Receipt</button>
+                <button class="btn btn-secondary" onclick="closeModal()">❌ Close</button>
+            `}
+        </div>
+    `;
+
+    document.getElementById('modalContent').innerHTML = modalHtml;
+    document.getElementById('paymentModal').classList.add('show');
+}
+
+function savePayment() {
+    // In a real implementation, you would send updated data to backend
+    alert('Payment update functionality would be implemented here');
+    closeModal();
+    loadPayments();
+}
+
+function printPayment() {
+    window.open(`/fees-payment/?receipt=${currentPaymentData.receipt_no}`, '_blank');
+}
+
+function closeModal() {
+    document.getElementById('paymentModal').classList.remove('show');
+    currentPaymentData = null;
+    isEditMode = false;
+}
+
+function exportPayments(button) {
+    runExportJob('payment_history', Object.fromEntries(filterParams()), button);
+}
+
+// Close modal on outside click
+document.getElementById('paymentModal').addEventListener('click', function(e) {
+    if (e.target === this) {
+        closeModal();
+    }
+});
+
+console.log('Payment History page loaded successfully!');
@@ -0,0 +1,4 @@
+// Auto-print on load (optional)
+// window.onload = function() {
+//     setTimeout(() => window.print(), 500);
+// };
@@ -0,0 +1,54 @@
+function togglePassword(fieldId) {
+  const field = document.getElementById(fieldId);
+  const btn = field.nextElementSibling;
+
+  if (field.type === "password") {
+    field.type = "text";
+    btn.innerHTML = "🙈";
+  } else {
+    field.type = "password";
+    btn.innerHTML = "👁";
+  }
+}
+
+// Form validation
+document.getElementById('registerForm').addEventListener('submit', function(e) {
+  const submitBtn = document.getElementById('submitBtn');
+  const password1 = document.getElementById('password1').value;
+  const password2 = document.getElementById('password2').value;
+
+  // Disable submit button to prevent double submission
+  submitBtn.disabled = true;
+  submitBtn.textContent = 'Creating Account...';
+
+  // Re-enable button after 3 seconds in case of error
+  setTimeout(() => {
+    submitBtn.disabled = false;
+    submitBtn.textContent = 'Create Account';
+  }, 3000);
+
+  // Check password match on client side
+  if (password1 !== password2) {
+    e.preventDefault();
+    alert('Passwords do not match!');
+    submitBtn.disabled = false;
+    submitBtn.textContent = 'Create Account';
+  }
+});
+
+// Real-time mobile number validation
+document.getElementById('mobile').addEventListener('input', function(e) {
+  this.value = this.value.replace(/[^0-9]/g, '').substring(0, 10);
+});
+
+// Real-time password match validation
+document.getElementById('password2').addEventListener('input', function() {
+  const password1 = document.getElementById('password1').value;
+  const password2 = this.value;
+
+  if (password1 && password2 && password1 !== password2) {
+    this.style.borderColor = '#dc3545';
+  } else {
+    this.style.borderColor = '#ccc';
+  }
+});
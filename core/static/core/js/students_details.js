@@ -0,0 +1,53 @@
+// Search functionality
+const searchInput = document.getElementById('searchInput');
+const courseFilter = document.getElementById('courseFilter');
+const tableRows = document.querySelectorAll('#studentsTable tbody tr');
+
+function filterStudents() {
+    const searchTerm = searchInput.value.toLowerCase();
+    const selectedCourse = courseFilter.value;
+
+    tableRows.forEach(row => {
+        const name = row.dataset.name;
+        const email = row.dataset.email;
+        const mobile = row.dataset.mobile;
+        const course = row.dataset.course;
+
+        const matchesSearch = name.includes(searchTerm) ||
+                            email.includes(searchTerm) ||
+                            mobile.includes(searchTerm);
+
+        const matchesCourse = !selectedCourse || course === selectedCourse;
+
+        if (matchesSearch && matchesCourse) {
+            row.style.display = '';
+        } else {
+            row.style.display = 'none';
+        }
+    });
+
+    // Update visible count
+    const visibleRows = Array.from(tableRows).filter(row => row.style.display !== 'none');
+    const tableHeader = document.querySelector('.table-header');
+    if (tableHeader) {
+        tableHeader.textContent = `📚 Students Found (${visibleRows.length})`;
+    }
+}
+
+searchInput.addEventListener('input', filterStudents);
+courseFilter.addEventListener('change', filterStudents);
+
+// Add some interactive effects
+document.addEventListener('DOMContentLoaded', function() {
+    console.log('Students Details page loaded successfully!');
+
+    // Add click effect to table rows
+    tableRows.forEach(row => {
+        row.addEventListener('click', function() {
+            // Remove previous selections
+            tableRows.forEach(r => r.style.backgroundColor = '');
+            // Highlight selected row
+            this.style.backgroundColor = '#e3f2fd';
+        });
+    });
+});
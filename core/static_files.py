@@ -0,0 +1,141 @@
+# core/static_files.py
+"""Hashed, precompressed static files and the code that serves them
+
+collectstatic copies core/static into STATIC_ROOT under content-hashed
+names (app.3f2a9c.css) and writes a .gz copy next to each text file, plus
+a .br copy when the brotli package is installed. {% static %} links the
+hashed names, so they can be cached by browsers for a year: a changed
+file gets a new name. StaticFilesMiddleware (core/middleware.py) serves
+them with the smallest encoding the browser accepts.
+"""
+
+import gzip
+import mimetypes
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSED_EXTENSIONS = ('.css', '.js', '.json', '.map', '.svg', '.txt')
+
+# Hashed names never change content
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# Anything else is revalidated against Last-Modified
+REVALIDATE_CACHE_CONTROL = 'public, no-cache'
+
+
+def _gzip(data):
+    # mtime=0 so the same file always compresses to the same bytes
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli(data):
+    return brotli.compress(data, quality=11)
+
+
+# (Content-Encoding, file suffix, compressor) in order of preference
+ENCODINGS = [('br', '.br', _brotli if brotli else None), ('gzip', '.gz', _gzip)]
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage that also writes .gz/.br copies"""
+
+    # Tests and fresh checkouts run without collectstatic; fall back to the
+    # plain name instead of failing every page that uses {% static %}
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if name.endswith(COMPRESSED_EXTENSIONS) and self.exists(name):
+                self.compress(name)
+
+    def compress(self, name):
+        with self.open(name) as original:
+            data = original.read()
+        for _, suffix, compressor in ENCODINGS:
+            if compressor is None:
+                continue
+            compressed = compressor(data)
+            # Tiny files can grow; the browser then gets the original
+            if len(compressed) < len(data):
+                with open(self.path(name + suffix), 'wb') as output:
+                    output.write(compressed)
+
+
+def accepted_encodings(request):
+    header = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    return {part.split(';')[0].strip().lower() for part in header.split(',')}
+
+
+def find_static_file(name):
+    """Absolute path of a static file: STATIC_ROOT first, then the app directories"""
+    if settings.STATIC_ROOT:
+        try:
+            path = safe_join(settings.STATIC_ROOT, name)
+        except SuspiciousFileOperation:
+            return None
+        if os.path.isfile(path):
+            return path
+    try:
+        return finders.find(name)
+    except SuspiciousFileOperation:
+        return None
+
+
+def serve_static_file(request, name):
+    """Response for one static file, or None when there is no such file"""
+    path = find_static_file(name)
+    if path is None:
+        return None
+
+    stat = os.stat(path)
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+        response = HttpResponseNotModified()
+    else:
+        content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type in ('application/javascript', 'application/json'):
+            content_type += '; charset=utf-8'
+
+        accepted = accepted_encodings(request)
+        served_path, encoding = path, None
+        for candidate, suffix, _ in ENCODINGS:
+            if candidate in accepted and os.path.isfile(path + suffix):
+                served_path, encoding = path + suffix, candidate
+                break
+
+        response = FileResponse(
+            open(served_path, 'rb'), content_type=content_type, filename=os.path.basename(name)
+        )
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        if encoding:
+            response['Content-Encoding'] = encoding
+
+    if name.endswith(COMPRESSED_EXTENSIONS):
+        response['Vary'] = 'Accept-Encoding'
+    if name in getattr(staticfiles_storage, 'hashed_files', {}).values():
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    else:
+        response['Cache-Control'] = REVALIDATE_CACHE_CONTROL
+    return response
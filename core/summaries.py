@@ -0,0 +1,150 @@
+# core/summaries.py
+"""Incremental maintenance of the AdmissionSummary table"""
+
+from decimal import Decimal
+
+from django.db import transaction, IntegrityError
+from django.db.models import Q, F, Count, Sum
+from django.db.models.functions import ExtractYear, ExtractMonth
+from django.utils.dateparse import parse_date
+
+from .models import Admission, AdmissionSummary
+
+SUMMARY_FIELDS = ('admission_date', 'course_name', 'batch', 'is_active', 'total_fees', 'paid_fees')
+
+
+def _decimal(value):
+    return Decimal(str(value or 0))
+
+
+def summary_contribution(admission_date, course_name, batch, is_active, total_fees, paid_fees):
+    """Return (key, (count, total_fees, paid_fees)) for one admission, or None"""
+    if not is_active:
+        return None
+    if isinstance(admission_date, str):
+        admission_date = parse_date(admission_date)
+    key = (admission_date.year, admission_date.month, course_name, batch)
+    return key, (1, _decimal(total_fees), _decimal(paid_fees))
+
+
+def admission_contribution(admission):
+    """Contribution of an in-memory Admission instance"""
+    return summary_contribution(*(getattr(admission, field) for field in SUMMARY_FIELDS))
+
+
+def stored_contribution(admission_id):
+    """Contribution of the admission row as currently stored in the database"""
+    values = Admission.objects.filter(pk=admission_id).values_list(*SUMMARY_FIELDS).first()
+    return summary_contribution(*values) if values else None
+
+
+def apply_summary_delta(key, count=0, total_fees=0, paid_fees=0):
+    """Add the given amounts to one summary bucket, creating it if needed"""
+    year, month, course_name, batch = key
+    bucket = AdmissionSummary.objects.filter(year=year, month=month, course_name=course_name, batch=batch)
+    changes = {
+        'admissions_count': F('admissions_count') + count,
+        'total_fees': F('total_fees') + total_fees,
+        'paid_fees': F('paid_fees') + paid_fees,
+    }
+
+    with transaction.atomic():
+        if bucket.update(**changes):
+            return
+        try:
+            with transaction.atomic():
+                AdmissionSummary.objects.create(
+                    year=year, month=month, course_name=course_name, batch=batch,
+                    admissions_count=count, total_fees=total_fees, paid_fees=paid_fees
+                )
+        except IntegrityError:
+            # Another transaction created the bucket first
+            bucket.update(**changes)
+
+
+def apply_contribution_change(before, after):
+    """Move an admission's contribution from `before` to `after` (either may be None)"""
+    if before == after:
+        return
+    if before and after and before[0] == after[0]:
+        key = after[0]
+        deltas = [new - old for new, old in zip(after[1], before[1])]
+        apply_summary_delta(key, *deltas)
+        return
+    if before:
+        key, (count, total_fees, paid_fees) = before
+        apply_summary_delta(key, -count, -total_fees, -paid_fees)
+    if after:
+        key, (count, total_fees, paid_fees) = after
+        apply_summary_delta(key, count, total_fees, paid_fees)
+
+
+def _grouped_totals(admissions):
+    return (
+        admissions
+        .filter(is_active=True)
+        .annotate(year=ExtractYear('admission_date'), month=ExtractMonth('admission_date'))
+        .values_list('year', 'month', 'course_name', 'batch')
+        .annotate(
+            admissions_count=Count('id'),
+            total=Sum('total_fees'),
+            paid=Sum('paid_fees'),
+        )
+        .order_by()
+    )
+
+
+def summary_keys(admissions):
+    """Distinct summary keys touched by an Admission queryset"""
+    return set(
+        admissions
+        .annotate(year=ExtractYear('admission_date'), month=ExtractMonth('admission_date'))
+        .values_list('year', 'month', 'course_name', 'batch')
+        .distinct()
+        .order_by()
+    )
+
+
+def _key_filter(key):
+    year, month, course_name, batch = key
+    return Q(admission_date__year=year, admission_date__month=month, course_name=course_name, batch=batch)
+
+
+@transaction.atomic
+def refresh_summary_buckets(keys):
+    """Recompute the given buckets exactly, e.g. after a bulk queryset update"""
+    keys = list(keys)
+    for start in range(0, len(keys), 100):
+        chunk = keys[start:start + 100]
+        condition = Q()
+        for key in chunk:
+            condition |= _key_filter(key)
+
+        totals = {
+            (year, month, course_name, batch): (count, total, paid)
+            for year, month, course_name, batch, count, total, paid
+            in _grouped_totals(Admission.objects.filter(condition))
+        }
+
+        for key in chunk:
+            year, month, course_name, batch = key
+            count, total, paid = totals.get(key, (0, 0, 0))
+            AdmissionSummary.objects.update_or_create(
+                year=year, month=month, course_name=course_name, batch=batch,
+                defaults={'admissions_count': count, 'total_fees': total or 0, 'paid_fees': paid or 0}
+            )
+
+
+@transaction.atomic
+def rebuild_summaries():
+    """Recompute the whole summary table from the admissions table"""
+    AdmissionSummary.objects.all().delete()
+    AdmissionSummary.objects.bulk_create([
+        AdmissionSummary(
+            year=year, month=month, course_name=course_name, batch=batch,
+            admissions_count=count, total_fees=total or 0, paid_fees=paid or 0
+        )
+        for year, month, course_name, batch, count, total, paid
+        in _grouped_totals(Admission.objects.all()).iterator()
+    ], batch_size=500)
+    return AdmissionSummary.objects.count()
@@ -0,0 +1,19 @@
+# core/test_runner.py
+"""Test runner that keeps the request metrics of the test run out of METRICS_DIR"""
+
+from contextlib import ExitStack
+
+from django.test.runner import DiscoverRunner
+
+from .benchmarking import scratch_metrics
+
+
+class TestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._environment = ExitStack()
+        self._environment.enter_context(scratch_metrics())
+
+    def teardown_test_environment(self, **kwargs):
+        self._environment.close()
+        super().teardown_test_environment(**kwargs)
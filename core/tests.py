@@ -1,3 +1,1529 @@
-from django.test import TestCase
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import traceback
+from datetime import date, datetime
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.db.models import Sum
+from django.contrib.sessions.backends.signed_cookies import SessionStore
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, get_resolver, reverse
+import openpyxl
+from PIL import Image
+
+from . import async_views, throttle, views
+from .admin import AdmissionAdmin
+from .exports import build_export, build_workbook, XLSX_CONTENT_TYPE
+from .filters import ENQUIRY_SORTS
+from .metrics import MetricsRegistry, render_prometheus
+from .models import (
+    Admission, AdmissionSummary, Bill, BillItem, DocumentSequence, Enquiry, ExportJob, Payment,
+    PaymentExceedsDuesError, Student
+)
+from .reconciliation import apply_matches, match_statement, reconcile_statement
+from .reports import admission_stats
+from .render_cache import render_cache
+from .routers import READ_ALIAS
+from .search import search_admissions
+from .summaries import rebuild_summaries
+from .thumbnails import (
+    thumbnail_path, thumbnail_version, THUMBNAIL_CONTENT_TYPE, THUMBNAIL_FORMAT, THUMBNAIL_SIZE
+)
+
+
+class AppTestCase(TestCase):
+    """TestCase that isolates the process-wide state of the app
+    
+    Views routed to the read-only connection see the test transaction,
+    because the 'readonly' alias shares the default connection. The
+    response cache is cleared (cached API responses outlive the rolled-back
+    table versions of earlier tests) and rendered receipts and bills go to
+    a temporary render cache.
+    """
+    
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(connections.__setitem__, READ_ALIAS, connections[READ_ALIAS])
+        connections[READ_ALIAS] = connections['default']
+        
+        render_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(render_dir.cleanup)
+        self.addCleanup(setattr, render_cache, 'directory', render_cache.directory)
+        render_cache.directory = render_dir.name
+
+    def login(self):
+        """Log the test client in as a student"""
+        session = self.client.session
+        session['student_id'] = 'test'
+        session['student_name'] = 'Tester'
+        session.save()
+        # Signed-cookie sessions change their key (the cookie value) on every save
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+
+
+class BillQueryCountTests(AppTestCase):
+    """Bill listing and export must not issue a query per bill"""
+
+    def setUp(self):
+        super().setUp()
+        self.login()
+
+    def seed_bills(self, bill_date, count, items_per_bill=2):
+        bills = Bill.objects.bulk_create([
+            Bill(
+                receipt_no=f"BIL{bill_date:%Y%m%d}{i:05d}",
+                bill_date=bill_date,
+                customer_name=f'Customer {i}',
+                customer_mobile='9876543210',
+                total_amount=Decimal('100.00') * items_per_bill
+            )
+            for i in range(count)
+        ])
+        BillItem.objects.bulk_create([
+            BillItem(bill=bill, item_name=f'Item {n}', quantity=1, rate=100, amount=100)
+            for bill in bills
+            for n in range(items_per_bill)
+        ])
+
+    def count_queries(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+            if hasattr(response, 'streaming_content'):
+                b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def assert_constant_queries(self, url):
+        small_day, large_day = date(2025, 1, 10), date(2025, 1, 11)
+        self.seed_bills(small_day, 10)
+        self.seed_bills(large_day, 10000)
+
+        small = self.count_queries(url, {'date': small_day.isoformat()})
+        large = self.count_queries(url, {'date': large_day.isoformat()})
+        self.assertEqual(small, large)
+        return large
+
+    def test_get_bills_query_count_is_constant(self):
+        self.assert_constant_queries('/api/get-bills/')
+
+    def test_get_bills_reports_item_counts(self):
+        self.seed_bills(date(2025, 1, 10), 3, items_per_bill=4)
+        response = self.client.get('/api/get-bills/', {'date': '2025-01-10'})
+        self.assertEqual([bill['items_count'] for bill in response.json()['bills']], [4, 4, 4])
+
+    def test_export_bills_query_count_is_constant(self):
+        self.assert_constant_queries('/export-bills/')
+
+
+class SessionTests(TestCase):
+    """A session can only be created by logging in"""
+
+    def test_forged_signed_cookie_is_not_a_login(self):
+        # Anyone who has read the committed SECRET_KEY can sign this cookie
+        forged = SessionStore()
+        forged['student_id'] = 999999
+        forged.save()
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = forged.session_key
+
+        self.assertRedirects(self.client.get(reverse('dashboard')), reverse('login'))
+        self.assertEqual(self.client.get('/api/get-bills/', {'date': '2025-01-10'}).status_code, 401)
+
+
+class MetricsTests(TestCase):
+    """Snapshots of exited processes are taken over by the scraping process"""
+
+    def setUp(self):
+        metrics_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(metrics_dir.cleanup)
+        self.registry = MetricsRegistry(metrics_dir.name)
+
+    def write_snapshot(self, pid, view):
+        # Another process's registry; it flushes to a directory of its own
+        scratch = tempfile.TemporaryDirectory()
+        self.addCleanup(scratch.cleanup)
+        other = MetricsRegistry(scratch.name)
+        other.record(view, 'GET', 200, 0.01, 1, 0.001, 100)
+        path = os.path.join(self.registry.directory, f'{pid}-1.json')
+        with open(path, 'w') as f:
+            json.dump(other.snapshot(), f)
+        return path
+
+    def test_exited_snapshots_are_adopted_once(self):
+        exited = subprocess.Popen([sys.executable, '-c', 'pass'])
+        exited.wait()
+        dead = self.write_snapshot(exited.pid, 'payment_history')
+        alive = self.write_snapshot(os.getppid(), 'dashboard')
+        self.registry.record('login', 'GET', 200, 0.01, 0, 0.0, 100)
+        
+        for _ in range(2):
+            text = render_prometheus(self.registry.collect())
+            self.assertIn('ssc_http_requests_total{view="payment_history",method="GET",status="200"} 1', text)
+            self.assertIn('ssc_http_requests_total{view="dashboard",method="GET",status="200"} 1', text)
+            self.assertIn('ssc_http_requests_total{view="login",method="GET",status="200"} 1', text)
+        
+        self.assertFalse(os.path.exists(dead))
+        self.assertTrue(os.path.exists(alive))
+        # The adopted counts now live in this process's own snapshot
+        self.assertEqual(
+            sorted(os.listdir(self.registry.directory)),
+            sorted([os.path.basename(alive), self.registry.file_name])
+        )
+
+
+# ==================== QUERY BUDGETS ====================
+
+SMALL_SCALE, LARGE_SCALE = 3, 30
+
+
+def seed_rows(start, count):
+    """Admissions with two payments each, enquiries and bills with items; all dated today"""
+    today = date.today()
+    admissions = Admission.objects.bulk_create([
+        Admission(
+            form_no=f'SSC{today:%Y%m}{i:05d}',
+            admission_date=today,
+            batch=today.strftime('%Y-%m'),
+            course_name='MS-CIT',
+            first_name=f'Student{i}',
+            middle_name='Budget',
+            last_name='Test',
+            birth_date=date(2005, 1, 1),
+            mobile_own=f'9{i:09d}',
+            address='Test address',
+            qualification='HSC',
+            installments='2',
+            total_fees=Decimal('10000.00'),
+            paid_fees=Decimal('200.00'),
+        )
+        for i in range(start, start + count)
+    ])
+    Payment.objects.bulk_create([
+        Payment(
+            receipt_no=f'RCP{today:%Y%m%d}{admission.id:04d}{n}',
+            payment_date=today,
+            admission=admission,
+            amount_paid=Decimal('100.00'),
+            payment_mode='CASH',
+        )
+        for admission in admissions
+        for n in range(2)
+    ])
+    Enquiry.objects.bulk_create([
+        Enquiry(
+            enquiry_no=f'ENQ{i:06d}',
+            student_name=f'Enquirer {i}',
+            mobile_no=f'8{i:09d}',
+            course='MS-CIT',
+            address='Test address',
+        )
+        for i in range(start, start + count)
+    ])
+    bills = Bill.objects.bulk_create([
+        Bill(
+            receipt_no=f'BIL{today:%Y%m%d}{i:05d}',
+            bill_date=today,
+            customer_name=f'Customer {i}',
+            customer_mobile='9876543210',
+            total_amount=Decimal('200.00'),
+        )
+        for i in range(start, start + count)
+    ])
+    BillItem.objects.bulk_create([
+        BillItem(bill=bill, item_name=f'Item {n}', quantity=1, rate=100, amount=100)
+        for bill in bills
+        for n in range(2)
+    ])
+    ExportJob.objects.bulk_create([ExportJob(kind='payments') for _ in range(count)])
+
+
+class QueryRecorder:
+    """Execute wrapper keeping each query's SQL and the frames that issued it"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        # Innermost frames outside the ORM internals, e.g. an admin column or a template tag
+        frames = [
+            frame for frame in traceback.extract_stack()[:-1]
+            if '/django/db/' not in frame.filename
+        ]
+        self.queries.append((sql, frames[-6:]))
+        return execute(sql, params, many, context)
+
+    def report(self):
+        lines = []
+        for number, (sql, frames) in enumerate(self.queries, 1):
+            lines.append(f'{number}. {sql}')
+            lines.extend(f'       {frame.filename}:{frame.lineno} in {frame.name}' for frame in frames)
+        return '\n'.join(lines)
+
+
+@override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
+class EndpointQueryBudgetTests(AppTestCase):
+    """Every URL stays within a fixed query budget that does not grow with the data
+    
+    A new URL in backend/urls.py or a new admin model needs an entry in BUDGETS.
+    Sessions are signed cookies here, so the budgets do not depend on the
+    session engine in use.
+    """
+    
+    # url name: (method, params or JSON body, maximum queries)
+    BUDGETS = {
+        'home': ('GET', {}, 0),
+        'register': ('GET', {}, 0),
+        'login': ('GET', {}, 0),
+        'forgot_password': ('GET', {}, 0),
+        'dashboard': ('GET', {}, 1),
+        'logout': ('GET', {}, 0),
+        'new_enquiry': ('GET', {}, 0),
+        'enquiry_data': ('GET', {}, 0),
+        'export_enquiries': ('GET', {}, 1),
+        'get_enquiries': ('GET', {}, 3),
+        'new_admission': ('GET', {}, 0),
+        'import_admissions': ('GET', {}, 0),
+        'fees_payment': ('GET', {}, 0),
+        'payment_history': ('GET', {}, 0),
+        'students_details': ('GET', {}, 1),
+        'admitted_students': ('GET', {}, 0),
+        'get_admitted_students': ('GET', {}, 1),
+        'update_student': ('GET', {}, 0),
+        'search_student_payment': ('POST', {'search_term': 'Student'}, 1),
+        'get_payment_history': ('GET', {}, 2),
+        'get_payment_totals': ('GET', {}, 2),
+        'reconcile_statement': ('GET', {}, 0),
+        'get_receipt_details': ('GET', {'receipt_no': 'latest'}, 1),
+        'delete_student_admission': ('GET', {}, 0),
+        'admission_thumbnail': ('GET', {}, 1),
+        'get_bills': ('GET', {'date': 'today'}, 2),
+        'export_payment_history': ('GET', {}, 1),
+        'export_bills': ('GET', {'date': 'today'}, 2),
+        'create_export_job': ('GET', {}, 0),
+        'export_job_status': ('GET', {}, 1),
+        'download_export_job': ('GET', {}, 1),
+        'metrics': ('GET', {}, 0),
+        'new_bill': ('GET', {}, 0),
+        'create_bills_batch': ('GET', {}, 0),
+        'bills_list': ('GET', {}, 0),
+        'print_bill': ('GET', {}, 2),
+        # Admin changelists, by model name
+        'admin:student': ('GET', {}, 4),
+        'admin:enquiry': ('GET', {}, 4),
+        'admin:admission': ('GET', {}, 8),
+        'admin:payment': ('GET', {}, 6),
+        'admin:bill': ('GET', {}, 6),
+        'admin:billitem': ('GET', {}, 4),
+        'admin:exportjob': ('GET', {}, 4),
+        'admin:user': ('GET', {}, 5),
+        'admin:group': ('GET', {}, 4),
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.staff = User.objects.create_superuser('budget', 'budget@example.com', 'password')
+        self.login()
+
+    def login(self):
+        """Log in as staff and as a student in the same session"""
+        self.client.force_login(self.staff)
+        super().login()
+
+    def endpoints(self):
+        """(name, url) of every URL pattern and admin changelist"""
+        for pattern in get_resolver().url_patterns:
+            if isinstance(pattern, URLPattern) and pattern.name:
+                yield pattern.name, self.url_for(pattern.name)
+        for model in admin.site._registry:
+            yield f'admin:{model._meta.model_name}', reverse(
+                f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist'
+            )
+
+    def url_for(self, name):
+        admission = Admission.objects.order_by('-id').first()
+        kwargs = {
+            'admission_thumbnail': {'admission_id': admission.id, 'version': 'none'},
+            'export_job_status': {'job_id': ExportJob.objects.order_by('-id').first().job_id},
+            'download_export_job': {'job_id': ExportJob.objects.order_by('-id').first().job_id},
+            'print_bill': {'bill_id': Bill.objects.order_by('-id').first().id},
+        }.get(name, {})
+        return reverse(name, kwargs=kwargs)
+
+    def params_for(self, params):
+        values = {
+            'today': date.today().isoformat(),
+            'latest': Payment.objects.order_by('-id').values_list('receipt_no', flat=True).first(),
+        }
+        return {key: values.get(value, value) for key, value in params.items()}
+
+    def measure(self):
+        """Query count of every endpoint, with the recorder of each"""
+        results = {}
+        for name, url in self.endpoints():
+            self.assertIn(name, self.BUDGETS, f'No query budget for {name} ({url})')
+            method, params, budget = self.BUDGETS[name]
+            params = self.params_for(params)
+            
+            # Measure the view itself, not the response cache or render cache
+            cache.clear()
+            render_cache.clear()
+            recorder = QueryRecorder()
+            with connection.execute_wrapper(recorder):
+                if method == 'POST':
+                    response = self.client.post(url, json.dumps(params), content_type='application/json')
+                else:
+                    response = self.client.get(url, params)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+            
+            self.assertLess(response.status_code, 500, f'{name} failed: {response.status_code}')
+            if name == 'logout':
+                self.login()
+            results[name] = (budget, recorder)
+        return results
+
+    def test_query_budgets_hold_at_two_scales(self):
+        seed_rows(0, SMALL_SCALE)
+        small = self.measure()
+        seed_rows(SMALL_SCALE, LARGE_SCALE - SMALL_SCALE)
+        large = self.measure()
+        
+        for name, (budget, recorder) in large.items():
+            with self.subTest(endpoint=name):
+                small_count, large_count = len(small[name][1].queries), len(recorder.queries)
+                self.assertLessEqual(
+                    large_count, budget,
+                    f'{name}: {large_count} queries, budget {budget}\n{recorder.report()}'
+                )
+                self.assertEqual(
+                    large_count, small_count,
+                    f'{name}: {small_count} queries with {SMALL_SCALE} rows but {large_count} '
+                    f'with {LARGE_SCALE}\n{recorder.report()}'
+                )
+
+
+class AsyncApiViewTests(AppTestCase):
+    """The async API views (core/async_views.py) answer exactly like the sync ones"""
+
+    # view name: (method, params or JSON body)
+    REQUESTS = {
+        'get_admitted_students': ('GET', {'course': 'MS-CIT', 'batch': 'this_month'}),
+        'search_student_for_payment': ('POST', {'search_term': 'Student'}),
+        'get_payment_history': ('GET', {'page_size': 2}),
+        'get_payment_totals': ('GET', {}),
+        'get_receipt_details': ('GET', {'receipt_no': 'latest'}),
+        'get_bills': ('GET', {'date': 'today'}),
+    }
+
+    def setUp(self):
+        super().setUp()
+        seed_rows(0, SMALL_SCALE)
+
+    def make_request(self, method, params):
+        values = {
+            'today': date.today().isoformat(),
+            'this_month': date.today().strftime('%Y-%m'),
+            'latest': Payment.objects.order_by('-id').values_list('receipt_no', flat=True).first(),
+        }
+        params = {key: values.get(value, value) for key, value in params.items()}
+        
+        factory = RequestFactory()
+        if method == 'POST':
+            request = factory.post('/', json.dumps(params), content_type='application/json')
+        else:
+            request = factory.get('/', params)
+        request.session = SessionStore()
+        request.session['student_id'] = 'test'
+        return request
+
+    def test_async_views_match_sync_views(self):
+        for name, (method, params) in self.REQUESTS.items():
+            with self.subTest(view=name):
+                cache.clear()
+                render_cache.clear()
+                expected = getattr(views, name)(self.make_request(method, params))
+                cache.clear()
+                render_cache.clear()
+                response = async_to_sync(getattr(async_views, name))(self.make_request(method, params))
+                
+                self.assertEqual(response.status_code, expected.status_code)
+                data = json.loads(response.content)
+                self.assertTrue(data['success'], data)
+                # Rows were found, so the comparison covers the row helpers
+                self.assertTrue(all(value for value in data.values() if isinstance(value, list)), data)
+                self.assertEqual(data, json.loads(expected.content))
+
+
+class StaticAssetTests(TestCase):
+    """Pages link hashed bundles, which are served compressed and cached for good"""
+    
+    def setUp(self):
+        static_root = tempfile.TemporaryDirectory()
+        self.addCleanup(static_root.cleanup)
+        settings_override = override_settings(STATIC_ROOT=static_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    def test_pages_link_hashed_compressed_bundles(self):
+        html = self.client.get(reverse('login')).content.decode()
+        stylesheet = re.search(r'href="(/static/core/css/login\.[0-9a-f]{12}\.css)"', html)
+        self.assertIsNotNone(stylesheet, html)
+        
+        response = self.client.get(stylesheet.group(1), HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        
+        # Unhashed names must be revalidated
+        response = self.client.get('/static/core/css/login.css')
+        self.assertEqual(response['Cache-Control'], 'public, no-cache')
+        self.assertNotIn('Content-Encoding', response)
+
+
+class RenderCacheTests(AppTestCase):
+    """Reprints come from the render cache until a printed field changes"""
+    
+    def setUp(self):
+        super().setUp()
+        self.login()
+        seed_rows(0, 1)
+
+    def test_cached_bill_is_printed_with_current_static_files(self):
+        bill = Bill.objects.get()
+        url = reverse('print_bill', args=[bill.id])
+        self.assertContains(self.client.get(url), bill.customer_name)
+        
+        # A deploy that moves the static files must not reprint stale links
+        with override_settings(STATIC_URL='/assets/'), CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertContains(response, bill.customer_name)
+        self.assertContains(response, '/assets/core/css/print_bill.css')
+        self.assertFalse([query for query in queries if 'bill' in query['sql']], queries.captured_queries)
+
+    def test_admission_edit_drops_receipts_only_when_printed_fields_change(self):
+        admission = Admission.objects.get()
+        receipts = list(admission.payments.values_list('receipt_no', flat=True))
+        for receipt_no in receipts:
+            render_cache.set('receipts', receipt_no, b'{}', render_cache.generation('receipts', receipt_no))
+        
+        admission.mobile_own = '9111111111'
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as queries:
+            admission.save()
+        self.assertFalse([query for query in queries if '"payments"' in query['sql']], queries.captured_queries)
+        self.assertEqual([render_cache.get('receipts', number) for number in receipts], [b'{}'] * 2)
+        
+        admission.first_name = 'Renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            admission.save()
+        self.assertEqual([render_cache.get('receipts', number) for number in receipts], [None] * 2)
+
+    def test_reprint_rendered_before_an_edit_is_never_served(self):
+        payment = Payment.objects.first()
+        url = reverse('get_receipt_details')
+        
+        # A reprint reads the payment, then the edit commits and drops the entry
+        generation = render_cache.generation('receipts', payment.receipt_no)
+        stale = self.client.get(url, {'receipt_no': payment.receipt_no}).content
+        payment.transaction_ref = 'UTR-CORRECTED'
+        with self.captureOnCommitCallbacks(execute=True):
+            payment.save()
+        # ...and only then stores what it rendered
+        render_cache.set('receipts', payment.receipt_no, stale, generation)
+        
+        self.assertIsNone(render_cache.get('receipts', payment.receipt_no))
+        response = self.client.get(url, {'receipt_no': payment.receipt_no})
+        self.assertEqual(response.json()['receipt']['transaction_ref'], 'UTR-CORRECTED')
+
+    def test_keys_must_be_plain_file_names(self):
+        for key in ('..', '../payments', 'a/b', 'RCP.1', ''):
+            with self.subTest(key=key):
+                with self.assertRaises(ValueError):
+                    render_cache.get('receipts', key)
+                with self.assertRaises(ValueError):
+                    render_cache.set('receipts', key, b'{}', '0')
+        
+        response = self.client.get(reverse('get_receipt_details'), {'receipt_no': '../receipts'})
+        self.assertEqual(response.json(), {'success': False, 'error': 'Receipt not found'})
+
+
+def make_admissions(*names, **fields):
+    """Active admissions with pending fees, one per (first, middle, last) name, in id order"""
+    today = date.today()
+    start = Admission.objects.count()
+    return Admission.objects.bulk_create([
+        Admission(**{
+            'form_no': f'SSC{today:%Y%m}{start + i:05d}',
+            'admission_date': today,
+            'batch': today.strftime('%Y-%m'),
+            'course_name': 'MS-CIT',
+            'first_name': first_name,
+            'middle_name': middle_name,
+            'last_name': last_name,
+            'birth_date': date(2005, 1, 1),
+            'mobile_own': f'9{start + i:09d}',
+            'address': 'Test address',
+            'qualification': 'HSC',
+            'installments': '2',
+            'total_fees': Decimal('10000.00'),
+            'paid_fees': Decimal('0.00'),
+            **fields,
+        })
+        for i, (first_name, middle_name, last_name) in enumerate(names)
+    ])
+
+
+class StudentSearchTests(TestCase):
+    """search_admissions() on the FTS5 index and on the icontains fallback"""
+    
+    def test_long_standing_student_is_found_among_many_newer_matches(self):
+        oldest, = make_admissions(('Ravi', '', 'Patil'))
+        make_admissions(*[('Ravi', 'Kumar', 'Deshmukh')] * 250)
+        
+        results = search_admissions('ravi', pending_only=True)
+        self.assertEqual(len(results), 10)
+        # The shortest name is the best bm25 match, however old it is
+        self.assertEqual(results[0].id, oldest.id)
+        self.assertEqual([student.id for student in search_admissions('ravi pat')], [oldest.id])
+
+    def test_index_matches_word_prefixes_of_name_form_number_and_mobiles(self):
+        student, = make_admissions(('Sakshi', 'Anil', 'Sawant'), mobile_parents='8877665544')
+        make_admissions(('Rahul', 'Anil', 'Mane'), paid_fees=Decimal('10000.00'))
+        
+        for term in ('sak', 'Sawant Sak', student.form_no, student.mobile_own[:4], '88776'):
+            with self.subTest(term=term):
+                self.assertEqual([found.id for found in search_admissions(term, pending_only=True)], [student.id])
+        # Word prefixes, not substrings
+        self.assertEqual(search_admissions('akshi'), [])
+
+    def test_fallback_matches_substrings_of_the_same_fields(self):
+        student, = make_admissions(('Sakshi', 'Anil', 'Sawant'), mobile_parents='8877665544')
+        make_admissions(('Rahul', 'Anil', 'Mane'), paid_fees=Decimal('10000.00'))
+        make_admissions(('Sakshi', 'Anil', 'Jadhav'), is_active=False)
+        
+        with mock.patch('core.search.fts_available', return_value=False):
+            for term in ('akshi', 'Sawant', student.form_no, student.mobile_own[3:], '776655'):
+                with self.subTest(term=term):
+                    found = search_admissions(term, pending_only=True)
+                    self.assertEqual([admission.id for admission in found], [student.id])
+
+
+class PaymentHistoryTests(AppTestCase):
+    """Keyset pages of get_payment_history and the separate totals"""
+    
+    def setUp(self):
+        super().setUp()
+        self.login()
+        
+        seed_rows(0, 4)
+        # Two days, and on each day every payment created at the same instant,
+        # so the pages can only be told apart by the id tiebreak
+        instant = Payment.objects.order_by('id').first().created_at
+        Payment.objects.filter(id__in=Payment.objects.order_by('id').values('id')[:3]).update(
+            payment_date=date(2025, 1, 1)
+        )
+        Payment.objects.update(created_at=instant)
+
+    def get_history(self, **params):
+        response = self.client.get('/api/get-payment-history/', params)
+        return response.status_code, response.json()
+
+    def test_cursor_pages_cover_every_payment_once_in_order(self):
+        expected = list(Payment.objects.order_by('-payment_date', '-created_at', '-id').values_list('id', flat=True))
+        
+        seen, cursor = [], None
+        while True:
+            params = {'page_size': 3, **({'cursor': cursor} if cursor else {})}
+            with CaptureQueriesContext(connection) as queries:
+                status, data = self.get_history(**params)
+            self.assertEqual(status, 200)
+            self.assertFalse([query for query in queries if 'SUM(' in query['sql'].upper()])
+            seen += [payment['id'] for payment in data['payments']]
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+        
+        self.assertEqual(seen, expected)
+
+    def test_tampered_cursor_is_rejected(self):
+        status, data = self.get_history(page_size=3)
+        cursor = data['next_cursor']
+        forged = signing.dumps(['2999-01-01', '2999-01-01T00:00:00+00:00', 1], salt='other')
+        
+        for bad in (cursor[:-2] + ('aa' if not cursor.endswith('aa') else 'bb'), forged, 'garbage'):
+            with self.subTest(cursor=bad):
+                self.assertEqual(self.get_history(cursor=bad), (400, {'success': False, 'error': 'Invalid cursor'}))
+
+    def test_totals_cover_the_whole_filtered_set(self):
+        response = self.client.get('/api/get-payment-totals/', {'batch': date.today().strftime('%Y-%m')})
+        self.assertEqual(response.json(), {'success': True, 'totals': {'count': 8, 'amount': 800.0}})
+        
+        response = self.client.get('/api/get-payment-totals/', {'batch': '1999-01'})
+        self.assertEqual(response.json(), {'success': True, 'totals': {'count': 0, 'amount': 0.0}})
+
+
+class EnquiryPagingTests(AppTestCase):
+    """Keyset pages of get_enquiries in every sort order"""
+    
+    def setUp(self):
+        super().setUp()
+        self.login()
+        
+        seed_rows(0, 7)
+        # Equal created_at and student names, so only the id tiebreak
+        # separates rows
+        instant = Enquiry.objects.order_by('id').first().created_at
+        Enquiry.objects.update(created_at=instant)
+        Enquiry.objects.filter(id__in=Enquiry.objects.order_by('id').values('id')[:4]).update(
+            student_name='Same Name'
+        )
+
+    def get_page(self, **params):
+        response = self.client.get('/api/get-enquiries/', params)
+        return response.status_code, response.json()
+
+    def test_cursor_pages_cover_every_enquiry_once_in_order(self):
+        for sort, ordering in ENQUIRY_SORTS.items():
+            with self.subTest(sort=sort):
+                expected = list(Enquiry.objects.order_by(*ordering).values_list('id', flat=True))
+                
+                seen, cursor = [], None
+                while True:
+                    params = {'sort': sort, 'page_size': 3, **({'cursor': cursor} if cursor else {})}
+                    status, data = self.get_page(**params)
+                    self.assertEqual(status, 200)
+                    # Counts are only worked out for the first page
+                    self.assertEqual(data['totals'] is None, bool(cursor))
+                    seen += [enquiry['id'] for enquiry in data['enquiries']]
+                    cursor = data['next_cursor']
+                    if not cursor:
+                        break
+                
+                self.assertEqual(seen, expected)
+
+    def test_cursor_keeps_the_search_filter(self):
+        status, data = self.get_page(q='Same', page_size=3)
+        self.assertEqual(data['totals']['filtered'], 4)
+        
+        status, data = self.get_page(q='Same', page_size=3, cursor=data['next_cursor'])
+        self.assertEqual([enquiry['student_name'] for enquiry in data['enquiries']], ['Same Name'])
+        self.assertIsNone(data['next_cursor'])
+
+    def test_tampered_cursor_is_rejected(self):
+        status, data = self.get_page(sort='name', page_size=3)
+        cursor = data['next_cursor']
+        forged = signing.dumps(['A', 1], salt='other')
+        
+        bad_cursors = [
+            (cursor[:-2] + ('aa' if not cursor.endswith('aa') else 'bb'), 'name'),
+            (forged, 'name'),
+            ('garbage', 'name'),
+            # A cursor only works in the order it was made for
+            (cursor, 'newest'),
+        ]
+        for bad, sort in bad_cursors:
+            with self.subTest(cursor=bad, sort=sort):
+                self.assertEqual(
+                    self.get_page(sort=sort, cursor=bad),
+                    (400, {'success': False, 'error': 'Invalid cursor'})
+                )
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class LoginThrottleTests(AppTestCase):
+    """Per-IP and per-account login limits"""
+    
+    def setUp(self):
+        super().setUp()
+        # Fresh in-process buckets; the shared windows live in the cleared cache
+        for name, rate in (('_ip_buckets', throttle.IP_RATE), ('_email_buckets', throttle.EMAIL_RATE)):
+            patcher = mock.patch.object(throttle, name, throttle.TokenBucket(*rate))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        Student.objects.create(name='Asha', mobile='9000000001', email='asha@example.com', password='right-password')
+
+    def post_login(self, password, ip='10.0.0.1'):
+        return self.client.post('/login/', {'email': 'asha@example.com', 'password': password}, REMOTE_ADDR=ip)
+
+    def test_failures_are_limited_per_account_with_retry_after(self):
+        failures, period = throttle.EMAIL_RATE
+        for _ in range(failures):
+            self.assertEqual(self.post_login('wrong').status_code, 200)
+        
+        response = self.post_login('wrong')
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(0 < int(response['Retry-After']) <= period)
+        # Locked out even with the right password
+        self.assertEqual(self.post_login('right-password').status_code, 429)
+
+    def test_guesses_spread_over_many_ips_share_the_email_limit(self):
+        failures = throttle.EMAIL_RATE[0]
+        for i in range(failures):
+            self.assertEqual(self.post_login('wrong', ip=f'10.6.6.{i}').status_code, 200)
+        
+        # A fresh address, well inside its own IP limit, is still refused
+        for ip in ('10.7.7.7', '10.8.8.8'):
+            with self.subTest(ip=ip):
+                response = self.post_login('wrong', ip=ip)
+                self.assertEqual(response.status_code, 429)
+                self.assertIn('Retry-After', response)
+        # Another account is not affected
+        response = self.client.post('/login/', {'email': 'ravi@example.com', 'password': 'wrong'},
+                                    REMOTE_ADDR='10.7.7.7')
+        self.assertEqual(response.status_code, 200)
+
+    def test_successful_logins_do_not_spend_the_email_limit(self):
+        for _ in range(throttle.EMAIL_RATE[0] * 2):
+            self.assertEqual(self.post_login('right-password').status_code, 302)
+
+    def test_success_resets_the_failures(self):
+        failures = throttle.EMAIL_RATE[0]
+        for _ in range(failures - 1):
+            self.post_login('wrong')
+        self.assertEqual(self.post_login('right-password').status_code, 302)
+        
+        for _ in range(failures):
+            self.assertEqual(self.post_login('wrong').status_code, 200)
+        self.assertEqual(self.post_login('wrong').status_code, 429)
+
+    def test_bucket_refills_over_its_period(self):
+        bucket = throttle.TokenBucket(2, 10)
+        with mock.patch.object(throttle.time, 'monotonic', return_value=100.0) as clock:
+            self.assertEqual(bucket.take('key'), 0)
+            self.assertEqual(bucket.wait('key'), 0)
+            self.assertEqual(bucket.take('key'), 0)
+            self.assertEqual(bucket.wait('key'), 5.0)
+            self.assertEqual(bucket.take('key'), 5.0)
+            
+            clock.return_value = 105.0
+            self.assertEqual(bucket.take('key'), 0)
+            self.assertEqual(bucket.wait('key'), 5.0)
+            
+            clock.return_value = 200.0
+            self.assertEqual(bucket.wait('key'), 0)
+
+
+class ResponseCacheTests(AppTestCase):
+    """versioned_json_cache: table versions, ETags and error payloads"""
+    
+    def setUp(self):
+        super().setUp()
+        self.login()
+        seed_rows(0, 1)
+
+    def get_totals(self, **headers):
+        return self.client.get('/api/get-payment-totals/', **headers)
+
+    def add_payment(self):
+        Payment.objects.create(
+            admission=Admission.objects.get(), payment_date=date.today(),
+            amount_paid=Decimal('50.00'), payment_mode='CASH'
+        )
+
+    def test_write_bumps_the_version(self):
+        first = self.get_totals()
+        self.assertEqual(first.json()['totals'], {'count': 2, 'amount': 200.0})
+        
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get_totals().content, first.content)
+        self.assertFalse([query for query in queries if 'SUM(' in query['sql'].upper()])
+        
+        self.add_payment()
+        second = self.get_totals()
+        self.assertEqual(second.json()['totals'], {'count': 3, 'amount': 250.0})
+        self.assertNotEqual(second['ETag'], first['ETag'])
+
+    def test_matching_if_none_match_gets_304(self):
+        etag = self.get_totals()['ETag']
+        
+        response = self.get_totals(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+        
+        self.add_payment()
+        self.assertEqual(self.get_totals(HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_error_payloads_are_not_cached(self):
+        with mock.patch.object(views, 'filter_payments', side_effect=RuntimeError('database is locked')):
+            response = self.get_totals()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'success': False, 'error': 'database is locked'})
+        self.assertFalse(response.has_header('ETag'))
+        
+        self.assertEqual(self.get_totals().json()['totals'], {'count': 2, 'amount': 200.0})
+
+
+class ExportJobTests(AppTestCase):
+    """Export job progress and the admin's queued admissions export"""
+    
+    def setUp(self):
+        super().setUp()
+        seed_rows(0, 12)
+        make_admissions(('Student1', 'Tally', 'Student'), course_name='TALLY')
+        self.client.force_login(User.objects.create_superuser('exporter', 'exporter@example.com', 'password'))
+
+    def test_bills_progress_only_moves_forward(self):
+        reports = []
+        _, sheets = build_export('bills', {'date': date.today().isoformat()}, lambda done, total: reports.append((done, total)))
+        build_workbook(sheets, io.BytesIO())
+        
+        # 12 bills and 24 items
+        self.assertEqual(reports[-1], (36, 36))
+        self.assertEqual({total for _, total in reports}, {36})
+        self.assertEqual([done for done, _ in reports], sorted(done for done, _ in reports))
+
+    def export_action(self, query, **data):
+        response = self.client.post(f'/admin/core/admission/?{query}', {
+            'action': 'export_to_excel', 'index': 0, **data
+        })
+        self.assertEqual(response.status_code, 302)
+        return ExportJob.objects.get(kind='admissions')
+
+    def test_select_all_saves_the_changelist_filter(self):
+        job = self.export_action(
+            'course_name=MS-CIT&q=Student1', select_across=1,
+            _selected_action=[Admission.objects.first().pk]
+        )
+        self.assertEqual(job.params, {'changelist': 'course_name=MS-CIT&q=Student1'})
+        
+        _, [sheet] = build_export('admissions', job.params)
+        build_workbook([sheet], io.BytesIO())
+        # Student1, Student10 and Student11; the Tally admission is filtered out
+        self.assertEqual(sheet.row_count, 3)
+
+    def test_ticked_rows_save_their_ids(self):
+        ids = list(Admission.objects.order_by('id').values_list('id', flat=True)[:2])
+        job = self.export_action('', _selected_action=ids)
+        
+        self.assertEqual(sorted(job.params['ids']), ids)
+        _, [sheet] = build_export('admissions', job.params)
+        build_workbook([sheet], io.BytesIO())
+        self.assertEqual(sheet.row_count, 2)
+
+
+class ExcelExportTests(AppTestCase):
+    """Exports write rows straight from the query into a write-only workbook"""
+    
+    def setUp(self):
+        super().setUp()
+        self.login()
+        seed_rows(0, 3)
+
+    def test_enquiries_export_contains_every_row(self):
+        response = self.client.get('/export-enquiries/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], XLSX_CONTENT_TYPE)
+        
+        ws = openpyxl.load_workbook(io.BytesIO(b''.join(response.streaming_content))).active
+        rows = list(ws.iter_rows(values_only=True))
+        self.assertEqual(rows[0], ('Enquiry No', 'Date', 'Student Name', 'Mobile No', 'Course', 'Address'))
+        self.assertEqual([row[0] for row in rows[1:]], ['ENQ000002', 'ENQ000001', 'ENQ000000'])
+        # Widths are fixed up front: from the header, or the hint for long columns
+        self.assertEqual(ws.column_dimensions['A'].width, 12)
+        self.assertEqual(ws.column_dimensions['F'].width, 50)
+
+    def test_rows_are_read_while_the_workbook_is_written(self):
+        _, [sheet] = build_export('enquiries', {})
+        self.assertEqual(sheet.row_count, 0)
+        
+        with CaptureQueriesContext(connection) as queries:
+            build_workbook([sheet], io.BytesIO())
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(sheet.row_count, 3)
+
+
+class ReconciliationTests(AppTestCase):
+    """Statement lines matched by reference, form number or mobile, and applied in bulk"""
+    
+    def setUp(self):
+        super().setUp()
+        self.first, self.second = make_admissions(('Asha', 'R', 'Patil'), ('Ravi', 'S', 'More'))
+        make_admissions(('Kiran', 'A', 'Shah'), ('Kavya', 'A', 'Shah'), mobile_parents='8888888888')
+        
+        # Online payments already entered at the desk with their UTR
+        self.desk = Payment.objects.create(
+            admission=self.first, payment_date=date.today(), amount_paid=Decimal('500.00'),
+            payment_mode='UPI', transaction_ref='UTR-DESK'
+        )
+        Payment.objects.create(
+            admission=self.first, payment_date=date.today(), amount_paid=Decimal('400.00'),
+            payment_mode='UPI', transaction_ref='UTR-DESK-2'
+        )
+
+    def statement(self):
+        lines = [
+            'Date,Amount,Reference,Narration',
+            '01/10/2026,500,UTR-DESK,UPI desk payment',
+            '01/10/2026,450,UTR-DESK-2,UPI desk payment',
+            f'2026-10-01,1000,UTR1,UPI fees {self.first.form_no}',
+            f'2026-10-01,1000,UTR1,UPI fees {self.first.form_no}',
+            f'2026-10-01,2000,UTR2,UPI from {self.second.mobile_own}',
+            'someday,100,UTR3,UPI',
+            '2026-10-01,-50,UTR4,Bank charges',
+            '2026-10-01,100,UTR5,UPI from 8888888888',
+            '2026-10-01,100,UTR6,NEFT transfer',
+            f'2026-10-01,3000,UTR7,UPI fees {self.first.form_no}',
+            f'2026-10-01,9000,UTR8,UPI fees {self.second.form_no}',
+        ]
+        return io.BytesIO('\n'.join(lines).encode())
+
+    def test_lines_are_classified(self):
+        report = reconcile_statement(self.statement(), dry_run=True)
+        
+        self.assertEqual([line['status'] for line in report['lines']], [
+            'reconciled', 'mismatch', 'matched', 'duplicate', 'matched', 'invalid',
+            'ignored', 'ambiguous', 'unmatched', 'matched', 'exceeds_dues',
+        ])
+        self.assertEqual(report['lines'][0]['receipt_no'], self.desk.receipt_no)
+        self.assertEqual(report['lines'][0]['form_no'], self.first.form_no)
+        self.assertEqual(report['lines'][4]['form_no'], self.second.form_no)
+        # A dry run records nothing
+        self.assertEqual(report['recorded'], 0)
+        self.assertEqual(Payment.objects.count(), 2)
+
+    def test_matched_lines_are_applied_with_one_grouped_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            report = reconcile_statement(self.statement(), created_by='Bank')
+        
+        self.assertEqual(report['recorded'], 3)
+        self.assertEqual(report['matched_amount'], 6000.0)
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "admissions" SET "paid_fees"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('CASE', updates[0])
+        
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual(self.first.paid_fees, Decimal('4900.00'))
+        self.assertEqual(self.second.paid_fees, Decimal('2000.00'))
+        self.assertEqual(
+            sorted(Payment.objects.filter(created_by='Bank').values_list('transaction_ref', flat=True)),
+            ['UTR1', 'UTR2', 'UTR7']
+        )
+        
+        # Applying the same statement again records nothing new
+        report = reconcile_statement(self.statement())
+        self.assertEqual(report['recorded'], 0)
+        self.assertEqual(report['counts']['reconciled'], 4)
+
+    def test_paise_amounts_keep_paid_fees_equal_to_the_payments(self):
+        for reference, amount in (('UTRP1', '0.10'), ('UTRP2', '0.20'), ('UTRP3', '0.30')):
+            statement = f'Date,Amount,Reference,Narration\n2026-10-01,{amount},{reference},UPI from {self.second.mobile_own}'
+            report = reconcile_statement(io.BytesIO(statement.encode()))
+            self.assertEqual(report['recorded'], 1)
+        
+        self.second.refresh_from_db()
+        payments = Payment.objects.filter(admission=self.second).aggregate(total=Sum('amount_paid'))['total']
+        self.assertEqual(self.second.paid_fees, payments)
+        # The stored value itself, before Django rounds it on the way out
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT paid_fees FROM admissions WHERE id = %s', [self.second.pk])
+            self.assertEqual(cursor.fetchone()[0], 0.6)
+        
+        Payment.objects.create(
+            admission=self.second, payment_date=date.today(),
+            amount_paid=self.second.get_remaining_fees(), payment_mode='CASH'
+        )
+        self.second.refresh_from_db()
+        self.assertEqual(self.second.get_remaining_fees(), Decimal('0.00'))
+
+    def test_update_chunks_and_dues_rechecked_under_lock(self):
+        with mock.patch('core.reconciliation.UPDATE_CHUNK_SIZE', 1):
+            results = match_statement(self.statement())
+            matched = [result for result in results if result['status'] == 'matched']
+            
+            # A payment taken at the desk after matching
+            Admission.objects.filter(pk=self.second.pk).update(paid_fees=Decimal('9000.00'))
+            with self.assertRaises(PaymentExceedsDuesError):
+                apply_matches(matched)
+            self.assertEqual(Payment.objects.count(), 2)
+            self.first.refresh_from_db()
+            self.assertEqual(self.first.paid_fees, Decimal('900.00'))
+            
+            Admission.objects.filter(pk=self.second.pk).update(paid_fees=Decimal('0.00'))
+            apply_matches(matched)
+        self.second.refresh_from_db()
+        self.assertEqual(self.second.paid_fees, Decimal('2000.00'))
+
+
+class PaymentLedgerTests(AppTestCase):
+    """Payment.save adds to paid_fees with one conditional UPDATE"""
+    
+    def setUp(self):
+        super().setUp()
+        [self.admission] = make_admissions(('Asha', 'R', 'Patil'), total_fees=Decimal('1000.00'))
+
+    def pay(self, amount, admission=None):
+        return Payment.objects.create(
+            admission=admission or self.admission, payment_date=date.today(),
+            amount_paid=Decimal(amount), payment_mode='CASH'
+        )
+
+    def test_payment_is_added_in_the_database(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.pay('400.00')
+        
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "admissions"')]
+        self.assertEqual(len(updates), 1)
+        set_clause, where_clause = updates[0].split(' WHERE ')
+        # Rounded to paise, as SQLite does the arithmetic in floating point
+        self.assertIn('ROUND(', set_clause)
+        self.assertIn('"admissions"."paid_fees" + ', set_clause)
+        self.assertIn('ROUND(', where_clause)
+        self.assertIn('"admissions"."total_fees" - "admissions"."paid_fees"', where_clause)
+        # The loaded admission is refreshed
+        self.assertEqual(self.admission.paid_fees, Decimal('400.00'))
+
+    def test_paying_the_exact_remainder_is_allowed(self):
+        self.pay('1000.00')
+        self.admission.refresh_from_db()
+        self.assertEqual(self.admission.get_remaining_fees(), Decimal('0.00'))
+
+    def test_exact_remainder_is_allowed_after_paise_payments(self):
+        self.admission.total_fees = Decimal('1000.30')
+        self.admission.save()
+        # 0.10 + 0.20 is 0.30000000000000004 in floating point
+        self.pay('0.10')
+        self.pay('0.20')
+        self.admission.refresh_from_db()
+        self.assertEqual(self.admission.get_remaining_fees(), Decimal('1000.00'))
+        
+        self.pay('1000.00')
+        self.admission.refresh_from_db()
+        self.assertEqual(self.admission.paid_fees, Decimal('1000.30'))
+        with self.assertRaises(PaymentExceedsDuesError):
+            self.pay('0.01')
+
+    def test_stale_desks_cannot_over_collect(self):
+        # Two desks loaded the admission while ₹1000 was due
+        desk_one = Admission.objects.get(pk=self.admission.pk)
+        desk_two = Admission.objects.get(pk=self.admission.pk)
+        
+        self.pay('800.00', desk_one)
+        with self.assertRaises(PaymentExceedsDuesError):
+            self.pay('800.00', desk_two)
+        self.pay('200.00', desk_two)
+        
+        self.admission.refresh_from_db()
+        self.assertEqual(self.admission.paid_fees, Decimal('1000.00'))
+        self.assertEqual(
+            Payment.objects.filter(admission=self.admission).aggregate(total=Sum('amount_paid'))['total'],
+            Decimal('1000.00')
+        )
+
+    def test_non_positive_amounts_are_rejected(self):
+        for amount in ('0.00', '-100.00'):
+            with self.subTest(amount=amount):
+                with self.assertRaises(ValueError):
+                    self.pay(amount)
+                
+                payment = Payment(admission=self.admission, payment_date=date.today(),
+                                  amount_paid=Decimal(amount), payment_mode='CASH')
+                with self.assertRaises(ValidationError) as caught:
+                    payment.clean()
+                self.assertEqual(caught.exception.message_dict, {'amount_paid': ['Amount must be greater than zero']})
+        
+        self.admission.refresh_from_db()
+        self.assertEqual(self.admission.paid_fees, Decimal('0.00'))
+        self.assertFalse(Payment.objects.exists())
+
+
+class DocumentSequenceTests(AppTestCase):
+    """Form, receipt and enquiry numbers from the per-period counters"""
+    
+    def freeze(self, moment):
+        patcher = mock.patch('core.models.datetime')
+        patcher.start().now.return_value = moment
+        self.addCleanup(patcher.stop)
+
+    def test_numbers_restart_when_the_period_rolls_over(self):
+        [admission] = make_admissions(('Asha', 'R', 'Patil'))
+        
+        def documents():
+            payment = Payment.objects.create(
+                admission=admission, payment_date=date.today(), amount_paid=Decimal('10.00'), payment_mode='CASH'
+            )
+            enquiry = Enquiry.objects.create(student_name='Ravi', mobile_no='9876543210', course='MS-CIT', address='-')
+            new_admission = Admission.objects.create(**{
+                field: getattr(admission, field) for field in (
+                    'admission_date', 'batch', 'course_name', 'first_name', 'middle_name', 'last_name',
+                    'birth_date', 'address', 'qualification', 'installments', 'total_fees'
+                )
+            }, mobile_own='9111111111')
+            return payment.receipt_no, enquiry.enquiry_no, new_admission.form_no
+        
+        self.freeze(datetime(2026, 12, 31, 23, 59))
+        self.assertEqual(documents(), ('RCP202612310001', 'ENQ20261231001', 'SSC20260001'))
+        self.assertEqual(documents(), ('RCP202612310002', 'ENQ20261231002', 'SSC20260002'))
+        
+        self.freeze(datetime(2027, 1, 1, 0, 1))
+        self.assertEqual(documents(), ('RCP202701010001', 'ENQ20270101001', 'SSC20270001'))
+
+    def test_reserve_hands_out_consecutive_blocks(self):
+        self.assertEqual(DocumentSequence.reserve('BIL', '20261017', 3),
+                         ['BIL202610170001', 'BIL202610170002', 'BIL202610170003'])
+        self.assertEqual(DocumentSequence.next_number('BIL', '20261017'), 'BIL202610170004')
+        self.assertEqual(DocumentSequence.reserve('BIL', '20261017', 2, width=6),
+                         ['BIL20261017000005', 'BIL20261017000006'])
+        # Other prefixes and periods have their own counters
+        self.assertEqual(DocumentSequence.reserve('BIL', '20261018', 1), ['BIL202610180001'])
+        self.assertEqual(DocumentSequence.reserve('RCP', '20261017', 1), ['RCP202610170001'])
+        
+        with self.assertRaises(ValueError):
+            DocumentSequence.reserve('BIL', '20261017', 0)
+
+    def test_block_of_a_rolled_back_insert_is_released(self):
+        DocumentSequence.reserve('SSC', '2026', 2)
+        
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                DocumentSequence.reserve('SSC', '2026', 500)
+                raise RuntimeError('import failed')
+        
+        self.assertEqual(DocumentSequence.reserve('SSC', '2026', 1), ['SSC20260003'])
+
+    def test_cost_does_not_depend_on_existing_rows(self):
+        seed_rows(0, 20)
+        DocumentSequence.reserve('RCP', '20261017', 1)
+        
+        with CaptureQueriesContext(connection) as queries:
+            DocumentSequence.reserve('RCP', '20261017', 100)
+        
+        statements = [query['sql'] for query in queries if 'SAVEPOINT' not in query['sql']]
+        # One UPDATE of the counter row and one read of it back
+        self.assertEqual(len(statements), 2)
+        self.assertTrue(all('"document_sequences"' in sql for sql in statements))
+
+
+class DashboardStatsTests(AppTestCase):
+    """Dashboard totals, months and courses come from one grouped query"""
+    
+    def setUp(self):
+        super().setUp()
+        for admission_date, course_name in (
+            (date(2026, 1, 10), 'MS-CIT'), (date(2026, 1, 20), 'MS-CIT'), (date(2026, 1, 25), 'KLIC'),
+            (date(2026, 3, 5), 'MS-CIT'), (date(2026, 12, 31), 'Tally'), (date(2025, 12, 31), 'MS-CIT'),
+        ):
+            make_admissions(('Asha', 'R', 'Patil'), admission_date=admission_date, course_name=course_name,
+                            batch=admission_date.strftime('%Y-%m'))
+        make_admissions(('Left', 'R', 'Early'), admission_date=date(2026, 3, 6), is_active=False)
+        # bulk_create sends no signals
+        rebuild_summaries()
+
+    def test_stats_of_a_year(self):
+        with self.assertNumQueries(1):
+            stats = admission_stats(2026)
+        
+        self.assertEqual(stats['total'], 5)
+        self.assertEqual(stats['mscit'], 3)
+        self.assertEqual(stats['others'], 2)
+        self.assertEqual(stats['monthly'], [3, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1])
+        self.assertEqual(
+            sorted((course['label'], course['value']) for course in stats['courses']),
+            [('KLIC', 1), ('MS-CIT', 3), ('Tally', 1)]
+        )
+        self.assertEqual(admission_stats(2024)['monthly'], [0] * 12)
+
+    def test_dashboard_cost_does_not_depend_on_admissions(self):
+        self.login()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('dashboard'), {'year': 2026})
+        self.assertEqual(response.context['total_students'], 5)
+        self.assertEqual(response.context['mscit_count'], 3)
+        self.assertEqual(response.context['klic_count'], 2)
+        self.assertFalse([query for query in queries if 'FROM "admissions"' in query['sql']], queries.captured_queries)
+
+
+class AdmissionSummaryTests(AppTestCase):
+    """AdmissionSummary follows admission and payment writes"""
+    
+    def admit(self, first_name, admission_date=date(2026, 1, 10), **fields):
+        return Admission.objects.create(**{
+            'admission_date': admission_date,
+            'batch': admission_date.strftime('%Y-%m'),
+            'course_name': 'MS-CIT',
+            'first_name': first_name,
+            'middle_name': 'K',
+            'last_name': 'Summary',
+            'birth_date': date(2005, 1, 1),
+            'mobile_own': f'9{Admission.objects.count():09d}',
+            'address': 'Test address',
+            'qualification': 'HSC',
+            'installments': '2',
+            'total_fees': Decimal('10000.00'),
+            **fields,
+        })
+
+    def assert_summary(self, expected):
+        """The table holds `expected` ({(year, month, course, batch): (count, total, paid)}), as a rebuild would"""
+        def rows():
+            return {
+                (year, month, course, batch): (count, total, paid)
+                for year, month, course, batch, count, total, paid in AdmissionSummary.objects.filter(
+                    admissions_count__gt=0
+                ).values_list('year', 'month', 'course_name', 'batch', 'admissions_count', 'total_fees', 'paid_fees')
+            }
+        
+        expected = {key: (count, Decimal(total), Decimal(paid)) for key, (count, total, paid) in expected.items()}
+        self.assertEqual(rows(), expected)
+        rebuild_summaries()
+        self.assertEqual(rows(), expected)
+
+    def test_create_and_payment(self):
+        first = self.admit('Asha')
+        self.admit('Ravi', total_fees=Decimal('8000.00'))
+        self.assert_summary({(2026, 1, 'MS-CIT', '2026-01'): (2, '18000', '0')})
+        
+        Payment.objects.create(admission=first, payment_date=date.today(), amount_paid=Decimal('2500.00'),
+                               payment_mode='CASH')
+        self.assert_summary({(2026, 1, 'MS-CIT', '2026-01'): (2, '18000', '2500')})
+
+    def test_edit_moves_the_admission_between_buckets(self):
+        admission = self.admit('Asha')
+        self.admit('Ravi')
+        
+        admission.total_fees = Decimal('12000.00')
+        admission.save()
+        self.assert_summary({(2026, 1, 'MS-CIT', '2026-01'): (2, '22000', '0')})
+        
+        admission.course_name = 'TALLY'
+        admission.admission_date = date(2026, 2, 3)
+        admission.save()
+        self.assert_summary({
+            (2026, 1, 'MS-CIT', '2026-01'): (1, '10000', '0'),
+            (2026, 2, 'TALLY', '2026-01'): (1, '12000', '0'),
+        })
+
+    def test_deactivate_reactivate_and_delete(self):
+        admission = self.admit('Asha')
+        other = self.admit('Ravi')
+        Payment.objects.create(admission=admission, payment_date=date.today(), amount_paid=Decimal('1000.00'),
+                               payment_mode='CASH')
+        admission.refresh_from_db()
+        
+        admission.is_active = False
+        admission.save()
+        self.assert_summary({(2026, 1, 'MS-CIT', '2026-01'): (1, '10000', '0')})
+        
+        admission.is_active = True
+        admission.save()
+        self.assert_summary({(2026, 1, 'MS-CIT', '2026-01'): (2, '20000', '1000')})
+        
+        admission.delete()
+        self.assert_summary({(2026, 1, 'MS-CIT', '2026-01'): (1, '10000', '0')})
+        
+        # The admin's bulk actions recompute the touched buckets
+        AdmissionAdmin(Admission, admin.site).mark_inactive(
+            mock.Mock(), Admission.objects.filter(pk=other.pk)
+        )
+        self.assert_summary({})
+
+
+class BillBatchTests(AppTestCase):
+    """create_bills_batch saves a whole batch or nothing"""
+    
+    def setUp(self):
+        super().setUp()
+        self.login()
+
+    def bill(self, customer, *items):
+        return {
+            'bill_date': '2026-10-17',
+            'customer_name': customer,
+            'customer_mobile': '9876543210',
+            'items': [{'item_name': name, 'quantity': quantity, 'rate': rate} for name, quantity, rate in items],
+        }
+
+    def post_batch(self, *bills):
+        return self.client.post('/api/bills/batch/', json.dumps({'bills': list(bills)}),
+                                content_type='application/json').json()
+
+    def test_batch_is_saved_with_server_side_amounts(self):
+        # A client-side amount is ignored
+        first = self.bill('Asha', ('Pen', '3', '10.50'))
+        first['items'][0]['amount'] = 1
+        
+        with CaptureQueriesContext(connection) as queries:
+            data = self.post_batch(first, self.bill('Ravi', ('Book', 2, 120), ('Bag', 1, 499.99)))
+        
+        self.assertTrue(data['success'])
+        self.assertEqual([bill['total_amount'] for bill in data['bills']], [31.5, 739.99])
+        self.assertEqual(BillItem.objects.get(item_name='Pen').amount, Decimal('31.50'))
+        self.assertEqual(len({bill['receipt_no'] for bill in data['bills']}), 2)
+        inserts = [query['sql'] for query in queries if query['sql'].startswith('INSERT INTO "bill')]
+        self.assertEqual(len(inserts), 2)
+
+    def test_one_invalid_bill_rejects_the_whole_batch(self):
+        invalid_bills = [
+            (self.bill('Ravi', ('Book', 0, 120)), 'Item 1: quantity must be greater than zero'),
+            (self.bill('Ravi', ('Book', 1, 'ten')), 'Item 1: rate must be a number'),
+            (self.bill('Ravi'), 'At least one item is required'),
+            ({**self.bill('Ravi', ('Book', 1, 5)), 'customer_mobile': '12345'}, 'Mobile number must be 10 digits'),
+            ('not a bill', 'Invalid bill'),
+        ]
+        for invalid, error in invalid_bills:
+            with self.subTest(error=error):
+                data = self.post_batch(
+                    self.bill('Asha', ('Pen', 1, 10)), invalid, self.bill('Kiran', ('Ink', 1, 50))
+                )
+                self.assertEqual(data, {'success': False, 'error': f'Bill 2: {error}', 'bill_index': 1})
+        
+        self.assertFalse(Bill.objects.exists())
+        self.assertFalse(BillItem.objects.exists())
+        self.assertFalse(DocumentSequence.objects.filter(prefix='BIL').exists())
+
+
+class AdmissionImportTests(AppTestCase):
+    """Spreadsheet import and the validation it shares with new_admission"""
+    
+    HEADINGS = ('Admission Date,Batch,Course,First Name,Middle Name,Last Name,Date of Birth,'
+                'Mobile,Mobile Parents,Address,Qualification,Installments,Total Fees')
+    
+    def setUp(self):
+        super().setUp()
+        self.login()
+
+    def upload(self, *rows, **options):
+        content = '\n'.join((self.HEADINGS,) + rows).encode('utf-8-sig')
+        return self.client.post('/api/import-admissions/', {
+            'file': SimpleUploadedFile('batch.csv', content, content_type='text/csv'), **options
+        }).json()
+
+    def test_csv_upload_is_read_through_a_text_wrapper(self):
+        report = self.upload(
+            '2026-10-01,2026-10,MS-CIT,Asha,R,Patil,01/02/2005,9000000001,,Pune,HSC,2 Installments,12000',
+            '2026-10-01,2026-10,TALLY,Ravi,S,More,2006-03-04,9000000002,9800000002,Pune,SSC,1,',
+        )
+        
+        self.assertEqual((report['success'], report['imported'], report['errors']), (True, 2, []))
+        asha = Admission.objects.get(first_name='Asha')
+        self.assertEqual(asha.form_no, report['first_form_no'])
+        self.assertEqual(
+            (asha.birth_date, asha.installments, asha.total_fees), (date(2005, 2, 1), '2', Decimal('12000'))
+        )
+        self.assertEqual(Admission.objects.get(first_name='Ravi').mobile_parents, '9800000002')
+
+    def test_row_with_an_error(self):
+        rows = (
+            '2026-10-01,2026-10,MS-CIT,Asha,R,Patil,01/02/2005,9000000001,,Pune,HSC,2,',
+            '2026-10-01,October,MS-CIT,Ravi,S,More,01/02/2005,9000000002,,Pune,HSC,2,',
+        )
+        
+        report = self.upload(*rows)
+        self.assertEqual(report['errors'], [{'row': 3, 'error': 'Batch must look like YYYY-MM'}])
+        self.assertEqual(report['imported'], 0)
+        self.assertFalse(Admission.objects.exists())
+        
+        report = self.upload(*rows, skip_invalid='1')
+        self.assertEqual((report['imported'], report['valid_rows'], report['total_rows']), (1, 1, 2))
+        self.assertEqual(list(Admission.objects.values_list('first_name', flat=True)), ['Asha'])
+
+    def test_new_admission_applies_the_same_rules(self):
+        form = {
+            'admission_date': '2026-10-01', 'batch': '2026-10', 'course_name': 'MS-CIT',
+            'first_name': 'Asha', 'middle_name': 'R', 'last_name': 'Patil', 'birth_date': '2005-02-01',
+            'mobile_own': '9000000001', 'mobile_parents': '', 'address': 'Pune', 'qualification': 'HSC',
+            'installment': '2',
+        }
+        invalid_forms = [
+            ({'batch': '10/2026'}, 'Batch must look like YYYY-MM'),
+            ({'installment': '3'}, 'Installments must be 1 or 2'),
+            ({'mobile_parents': '98000'}, "Parents' mobile number must be 10 digits"),
+            ({'birth_date': '2005/02/01'}, 'Birth date must be a date (YYYY-MM-DD or DD/MM/YYYY)'),
+            ({'first_name': 'A' * 51}, 'First Name must be at most 50 characters'),
+        ]
+        for change, error in invalid_forms:
+            with self.subTest(error=error):
+                response = self.client.post('/new-admission/', {**form, **change})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.context['error'], error)
+        self.assertFalse(Admission.objects.exists())
+        
+        self.assertRedirects(self.client.post('/new-admission/', form), '/admitted-students/',
+                             fetch_redirect_response=False)
+        self.assertEqual(Admission.objects.get().batch, '2026-10')
+
+
+class ThumbnailTests(AppTestCase):
+    """Photo thumbnails: generated on upload or first request, versioned URLs"""
+    
+    def setUp(self):
+        super().setUp()
+        self.login()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root.name))
+        
+        [self.admission] = make_admissions(('Asha', 'R', 'Patil'))
+
+    def upload_photo(self, name, size=(640, 480)):
+        buffer = io.BytesIO()
+        Image.new('RGB', size, 'teal').save(buffer, 'JPEG')
+        self.admission.photo = SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+        self.admission.save()
+        return thumbnail_path(thumbnail_version(self.admission.photo.name))
+
+    def listed_thumbnail(self):
+        response = self.client.get('/api/get-admitted-students/', {
+            'course': self.admission.course_name, 'batch': self.admission.batch
+        })
+        [student] = response.json()['students']
+        return student['photoThumb']
+
+    def test_thumbnail_is_made_on_upload(self):
+        path = self.upload_photo('asha.jpg')
+        
+        with Image.open(path) as thumbnail:
+            self.assertEqual(thumbnail.size, (THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+            self.assertEqual(thumbnail.format, THUMBNAIL_FORMAT)
+
+    def test_url_carries_the_photo_version(self):
+        self.assertIsNone(self.listed_thumbnail())
+        
+        self.upload_photo('asha.jpg')
+        first_url = self.listed_thumbnail()
+        self.assertEqual(
+            first_url, f'/admission-thumbnail/{self.admission.id}/{thumbnail_version(self.admission.photo.name)}/'
+        )
+        
+        # A new photo gets a new URL, so a cached old thumbnail is never shown
+        self.upload_photo('asha-new.jpg', size=(300, 600))
+        second_url = self.listed_thumbnail()
+        self.assertNotEqual(second_url, first_url)
+        
+        response = self.client.get(second_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], THUMBNAIL_CONTENT_TYPE)
+        self.assertEqual(response['Cache-Control'], f'private, max-age={views.THUMBNAIL_MAX_AGE}, immutable')
+        response.close()
+        # The old version no longer belongs to the admission
+        os.remove(thumbnail_path(first_url.rstrip('/').rsplit('/', 1)[1]))
+        self.assertEqual(self.client.get(first_url).status_code, 404)
+
+    def test_missing_thumbnail_is_made_on_first_request(self):
+        path = self.upload_photo('asha.jpg')
+        os.remove(path)
+        
+        response = self.client.get(self.listed_thumbnail())
+        self.assertEqual(response.status_code, 200)
+        response.close()
+        self.assertTrue(os.path.exists(path))
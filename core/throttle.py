@@ -0,0 +1,188 @@
+# core/throttle.py
+"""Throttling of the password endpoints, which are the CPU-heavy ones
+
+Each password check or hash runs PBKDF2 with hundreds of thousands of
+iterations, so a burst of bad logins can keep every worker busy. Three
+limits run before any hashing:
+
+- a token bucket per client IP, spent by every attempt, and one per
+  account email, spent only by failed attempts; both are kept in process
+  memory;
+- the same limits counted per time window in the Django cache, so that
+  they also hold across server processes when the cache is shared;
+- a semaphore capping how many hashes run at once, so legitimate logins
+  wait briefly for a slot instead of competing with a flood.
+
+The email limit is keyed on the email alone, so guesses against one
+account spread over many addresses are still counted together. A correct
+password never spends it and clears it.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import render
+
+# (attempts, seconds): bursts of `attempts`, refilled evenly over `seconds`.
+# Staff at the front desk share one IP, so the IP limit is the looser one.
+# The email limit counts failed attempts only.
+IP_RATE = getattr(settings, 'LOGIN_RATE_PER_IP', (30, 60))
+EMAIL_RATE = getattr(settings, 'LOGIN_RATE_PER_EMAIL', (5, 300))
+
+# Concurrent password hashes per process, and how long a request waits for one
+HASH_CONCURRENCY = getattr(settings, 'PASSWORD_HASH_CONCURRENCY', max(1, (os.cpu_count() or 2) // 2))
+HASH_WAIT_SECONDS = 5
+
+MAX_TRACKED_KEYS = 10000
+
+
+class Throttled(Exception):
+    """Request refused before hashing; `retry_after` is in seconds"""
+
+    def __init__(self, retry_after):
+        super().__init__(f'Too many attempts, retry in {retry_after}s')
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Per-key token buckets held in this process"""
+
+    def __init__(self, capacity, period, max_keys=MAX_TRACKED_KEYS):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key):
+        """Spend a token; return 0 if allowed, else the seconds until one is available"""
+        return self._update(key, spend=True)
+
+    def wait(self, key):
+        """Seconds until a token is available, without spending one"""
+        return self._update(key, spend=False)
+
+    def _update(self, key, spend):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            if tokens >= 1:
+                if spend:
+                    tokens -= 1
+                wait = 0
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            # Keys are attacker controlled; forget the least recently seen ones
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def reset(self, key):
+        with self._lock:
+            self._buckets.pop(key, None)
+
+
+def _shared_window_take(scope, key, capacity, period):
+    """Count an attempt in the shared cache; return seconds to wait when over the limit
+
+    cache.add and cache.incr are atomic on memcached and Redis. With the
+    default local-memory cache this only repeats the in-process limit.
+    """
+    now = time.time()
+    window = int(now // period)
+    cache_key = f'throttle:{scope}:{window}:{key}'
+    cache.add(cache_key, 0, period)
+    try:
+        count = cache.incr(cache_key)
+    except ValueError:
+        # Expired between add and incr
+        cache.add(cache_key, 1, period)
+        count = 1
+    if count > capacity:
+        return (window + 1) * period - now
+    return 0
+
+
+def _shared_window_wait(scope, key, capacity, period):
+    """Seconds to wait when the current window is already full, without counting"""
+    now = time.time()
+    window = int(now // period)
+    if cache.get(f'throttle:{scope}:{window}:{key}', 0) >= capacity:
+        return (window + 1) * period - now
+    return 0
+
+
+def _shared_window_reset(scope, key, period):
+    cache.delete(f'throttle:{scope}:{int(time.time() // period)}:{key}')
+
+
+_ip_buckets = TokenBucket(*IP_RATE)
+_email_buckets = TokenBucket(*EMAIL_RATE)
+_hash_slots = threading.BoundedSemaphore(HASH_CONCURRENCY)
+
+
+def client_ip(request):
+    # X-Forwarded-For is not trusted: the app is served directly
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _email_key(email):
+    return email.strip().lower()
+
+
+def check_attempt(request, email=''):
+    """Raise Throttled if this client, or this account, has used up its attempts
+
+    Every call spends an IP attempt. The email limit is only checked here;
+    record_failure spends it.
+    """
+    waits = [_ip_buckets.take(client_ip(request))]
+    if email:
+        waits.append(_email_buckets.wait(_email_key(email)))
+    if not any(waits):
+        waits.append(_shared_window_take('ip', client_ip(request), *IP_RATE))
+        if email:
+            waits.append(_shared_window_wait('email', _email_key(email), *EMAIL_RATE))
+    wait = max(waits)
+    if wait:
+        raise Throttled(int(wait) + 1)
+
+
+def record_failure(email):
+    """Count a wrong password or unknown email against the account, from any client"""
+    _email_buckets.take(_email_key(email))
+    _shared_window_take('email', _email_key(email), *EMAIL_RATE)
+
+
+def reset_email(email):
+    """Forget the failed attempts for an email after a successful login"""
+    _email_buckets.reset(_email_key(email))
+    _shared_window_reset('email', _email_key(email), EMAIL_RATE[1])
+
+
+@contextmanager
+def hashing_slot():
+    """Hold one of the limited password hashing slots, or raise Throttled"""
+    if not _hash_slots.acquire(timeout=HASH_WAIT_SECONDS):
+        raise Throttled(HASH_WAIT_SECONDS)
+    try:
+        yield
+    finally:
+        _hash_slots.release()
+
+
+def throttled_response(request, template, throttled, context=None):
+    """Re-render a form with a 429 status and a Retry-After header"""
+    response = render(request, template, {
+        **(context or {}),
+        'error': f'Too many attempts. Please try again in {throttled.retry_after} seconds.'
+    }, status=429)
+    response['Retry-After'] = str(throttled.retry_after)
+    return response
@@ -0,0 +1,74 @@
+# core/thumbnails.py
+"""Small square thumbnails of admission photos, generated with Pillow
+
+Thumbnails live under MEDIA_ROOT/thumbnails and are named after a hash of
+the original photo's name, so a new photo gets a new URL and a thumbnail
+can be cached by browsers forever.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+
+from django.conf import settings
+from PIL import Image, ImageOps, features
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZE = 160  # pixels; the grid shows photos at 80px, this covers 2x screens
+THUMBNAIL_DIR = 'thumbnails'
+
+if features.check('webp'):
+    THUMBNAIL_FORMAT, THUMBNAIL_EXTENSION, THUMBNAIL_CONTENT_TYPE = 'WEBP', 'webp', 'image/webp'
+else:
+    THUMBNAIL_FORMAT, THUMBNAIL_EXTENSION, THUMBNAIL_CONTENT_TYPE = 'JPEG', 'jpg', 'image/jpeg'
+
+
+def thumbnail_version(photo_name):
+    """Short token identifying one original photo"""
+    return hashlib.sha1(f'{photo_name}:{THUMBNAIL_SIZE}'.encode()).hexdigest()[:16]
+
+
+def thumbnail_path(version):
+    return os.path.join(settings.MEDIA_ROOT, THUMBNAIL_DIR, f'{version}.{THUMBNAIL_EXTENSION}')
+
+
+def thumbnail_url(admission):
+    """URL of the admission's thumbnail, or None when there is no photo"""
+    if not admission.photo:
+        return None
+    return f'/admission-thumbnail/{admission.id}/{thumbnail_version(admission.photo.name)}/'
+
+
+def make_thumbnail(photo):
+    """Create the thumbnail of a stored photo if it does not exist yet; return its path"""
+    path = thumbnail_path(thumbnail_version(photo.name))
+    if os.path.exists(path):
+        return path
+
+    with photo.open('rb'), Image.open(photo) as image:
+        # Let the JPEG decoder downscale while reading large camera photos
+        image.draft('RGB', (THUMBNAIL_SIZE * 2, THUMBNAIL_SIZE * 2))
+        # Phone cameras store the rotation in EXIF instead of rotating the pixels
+        image = ImageOps.exif_transpose(image).convert('RGB')
+        thumbnail = ImageOps.fit(image, (THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.LANCZOS)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            thumbnail.save(f, THUMBNAIL_FORMAT, quality=80)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return path
+
+
+def make_thumbnail_quietly(photo):
+    """Generate a thumbnail at upload time; failures are left to the lazy path"""
+    try:
+        make_thumbnail(photo)
+    except Exception:
+        logger.exception('Could not create thumbnail for %s', photo.name)
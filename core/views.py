@@ -1,17 +1,38 @@
 # core/views.py - Complete and Fixed
 
 from django.shortcuts import render, redirect, get_object_or_404
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
 from django.contrib import messages
 from django.contrib.auth.hashers import make_password, check_password
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, FileResponse, Http404
 from django.views.decorators.csrf import csrf_exempt
+from django.core import signing
+from django.utils.dateparse import parse_date, parse_datetime
 from django.db import models, transaction
 from django.db.models import Q, Sum, Count
-from .models import Student, Enquiry, Admission, Payment, Bill, BillItem
+from django.conf import settings
+from .decorators import login_required, api_login_required, is_logged_in
+from .models import Student, Enquiry, Admission, Payment, Bill, BillItem, ExportJob, PaymentExceedsDuesError
+from .reports import admission_stats
+from .search import search_admissions
+from .filters import filter_enquiries, filter_payments, filter_bills, ENQUIRY_SORTS
+from .exports import build_export, xlsx_response, EXPORT_BUILDERS, XLSX_CONTENT_TYPE
+from .jobs import enqueue_export, job_file_path
+from .caching import versioned_json_cache, ADMISSIONS, PAYMENTS, BILLS
+from .render_cache import render_cache, InvalidCacheKeyError
+from .thumbnails import thumbnail_url, thumbnail_path, thumbnail_version, make_thumbnail, THUMBNAIL_CONTENT_TYPE
+from .billing import clean_bill, create_bills, InvalidBillError
+from .admissions import clean_admission, InvalidAdmissionError
+from .imports import import_admissions
+from .reconciliation import reconcile_statement, StatementError
+from .routers import read_only_database
+from .metrics import registry, render_prometheus
+from .throttle import check_attempt, record_failure, reset_email, hashing_slot, throttled_response, Throttled
 from datetime import datetime, timedelta
 from decimal import Decimal
 import json
-import openpyxl
+import os
 from collections import defaultdict
 
 
@@ -71,14 +92,18 @@ def register(request):
         
         # Create student
         try:
-            student = Student.objects.create(
-                name=name,
-                mobile=mobile,
-                email=email,
-                password=password1  # Will be hashed in model's save method
-            )
+            check_attempt(request)
+            with hashing_slot():
+                student = Student.objects.create(
+                    name=name,
+                    mobile=mobile,
+                    email=email,
+                    password=password1  # Will be hashed in model's save method
+                )
             messages.success(request, 'Registration successful! Please login.')
             return redirect('login')
+        except Throttled as e:
+            return throttled_response(request, 'register.html', e, {'form_data': request.POST})
         except Exception as e:
             return render(request, 'register.html', {
                 'error': f'Registration failed: {str(e)}',
@@ -99,10 +124,21 @@ def login_view(request):
                 'error': 'Email and password are required'
             })
         
+        # Refuse floods before spending CPU on the password hash
+        try:
+            check_attempt(request, email)
+        except Throttled as e:
+            return throttled_response(request, 'login.html', e)
+        
         try:
             student = Student.objects.get(email=email, is_active=True)
             
-            if check_password(password, student.password):
+            with hashing_slot():
+                valid = check_password(password, student.password)
+            
+            if valid:
+                reset_email(email)
+                
                 # Set session
                 request.session['student_id'] = str(student.student_id)
                 request.session['student_name'] = student.name
@@ -111,10 +147,14 @@ def login_view(request):
                 messages.success(request, f'Welcome back, {student.name}!')
                 return redirect('dashboard')
             else:
+                record_failure(email)
                 return render(request, 'login.html', {
                     'error': 'Invalid email or password'
                 })
+        except Throttled as e:
+            return throttled_response(request, 'login.html', e)
         except Student.DoesNotExist:
+            record_failure(email)
             return render(request, 'login.html', {
                 'error': 'Invalid email or password'
             })
@@ -152,13 +192,18 @@ def forgot_password(request):
             })
         
         try:
+            check_attempt(request, email)
             student = Student.objects.get(email=email)
-            student.password = make_password(new_password)
+            with hashing_slot():
+                student.password = make_password(new_password)
             student.save()
             
             messages.success(request, 'Password reset successful! Please login with your new password.')
             return redirect('login')
+        except Throttled as e:
+            return throttled_response(request, 'forgot_password.html', e)
         except Student.DoesNotExist:
+            record_failure(email)
             return render(request, 'forgot_password.html', {
                 'error': 'Email not found'
             })
@@ -168,48 +213,27 @@ def forgot_password(request):
 
 # ==================== DASHBOARD ====================
 
+@login_required
 def dashboard(request):
     """Dashboard view"""
-    if 'student_id' not in request.session:
-        messages.error(request, 'Please login to access dashboard')
-        return redirect('login')
-    
     # Get selected year
     selected_year = int(request.GET.get('year', datetime.now().year))
     
-    # Get all admissions for the selected year
-    admissions = Admission.objects.filter(
-        admission_date__year=selected_year,
-        is_active=True
-    )
-    
-    # Total statistics
-    total_students = admissions.count()
-    mscit_count = admissions.filter(course_name='MS-CIT').count()
-    klic_count = admissions.exclude(course_name='MS-CIT').count()
-    
-    # Monthly data for bar chart
-    monthly_data = [0] * 12
-    for admission in admissions:
-        month = admission.admission_date.month - 1
-        monthly_data[month] += 1
-    
-    # Course distribution for pie chart
-    course_counts = admissions.values('course_name').annotate(count=Count('id'))
-    pie_data = [{'label': item['course_name'], 'value': item['count']} for item in course_counts]
+    # Totals, monthly histogram and course distribution in one query
+    stats = admission_stats(selected_year)
     
     # Available years
     years_range = range(datetime.now().year, datetime.now().year - 5, -1)
     
     context = {
         'student_name': request.session.get('student_name'),
-        'total_students': total_students,
-        'mscit_count': mscit_count,
-        'klic_count': klic_count,
-        'monthly_data': json.dumps(monthly_data),
-        'months': json.dumps(['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                             'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']),
-        'pie_data': json.dumps(pie_data),
+        'total_students': stats['total'],
+        'mscit_count': stats['mscit'],
+        'klic_count': stats['others'],
+        'monthly_data': stats['monthly'],
+        'months': ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                   'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'],
+        'pie_data': stats['courses'],
         'selected_year': selected_year,
         'available_years': years_range
     }
@@ -219,12 +243,9 @@ def dashboard(request):
 
 # ==================== ENQUIRY VIEWS ====================
 
+@login_required
 def new_enquiry(request):
     """New enquiry form view"""
-    if 'student_id' not in request.session:
-        messages.error(request, 'Please login to access this page')
-        return redirect('login')
-    
     if request.method == 'POST':
         student_name = request.POST.get('student_name', '').strip()
         mobile_no = request.POST.get('mobile_no', '').strip()
@@ -272,135 +293,120 @@ def new_enquiry(request):
     })
 
 
+@login_required
 def enquiry_data(request):
     """View all enquiries"""
-    if 'student_id' not in request.session:
-        messages.error(request, 'Please login to access this page')
-        return redirect('login')
-    
-    enquiries = Enquiry.objects.all().order_by('-created_at')
-    
+    # Rows are loaded page by page from get_enquiries
     return render(request, 'enquiry_data.html', {
         'student_name': request.session.get('student_name'),
-        'enquiries': enquiries,
-        'total_enquiries': enquiries.count()
+        'course_choices': Enquiry.COURSE_CHOICES
     })
 
 
+@csrf_exempt
+@api_login_required
+@read_only_database
+def get_enquiries(request):
+    """API: Get a page of enquiries matching the search and course filter"""
+    try:
+        try:
+            page_size = int(request.GET.get('page_size', ENQUIRY_PAGE_SIZE))
+        except ValueError:
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid page'
+            }, status=400)
+        page_size = max(1, min(page_size, MAX_ENQUIRY_PAGE_SIZE))
+        
+        sort = request.GET.get('sort', 'newest')
+        if sort not in ENQUIRY_SORTS:
+            sort = 'newest'
+        
+        enquiries = filter_enquiries(request.GET).order_by(*ENQUIRY_SORTS[sort])
+        cursor = request.GET.get('cursor', '')
+        
+        # Counts come back with the first page only
+        totals = None
+        if cursor:
+            try:
+                enquiries = enquiries.filter(enquiry_cursor_filter(cursor, sort))
+            except (signing.BadSignature, ValueError, TypeError):
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Invalid cursor'
+                }, status=400)
+        else:
+            totals = {
+                'all': Enquiry.objects.count(),
+                'filtered': enquiries.count()
+            }
+        
+        page = list(enquiries.values(
+            'id', 'enquiry_no', 'enquiry_date', 'student_name', 'mobile_no', 'course', 'address',
+            'created_at'
+        )[:page_size + 1])
+        has_more = len(page) > page_size
+        page = page[:page_size]
+        
+        course_labels = dict(Enquiry.COURSE_CHOICES)
+        enquiries_data = []
+        for enquiry in page:
+            enquiries_data.append({
+                'id': enquiry['id'],
+                'enquiry_no': enquiry['enquiry_no'],
+                'enquiry_date': enquiry['enquiry_date'].strftime('%d/%m/%Y'),
+                'student_name': enquiry['student_name'],
+                'mobile_no': enquiry['mobile_no'],
+                'course': enquiry['course'],
+                'course_display': course_labels.get(enquiry['course'], enquiry['course']),
+                'address': enquiry['address']
+            })
+        
+        return JsonResponse({
+            'success': True,
+            'enquiries': enquiries_data,
+            'next_cursor': make_enquiry_cursor(page[-1], sort) if has_more else None,
+            'totals': totals
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
+
+
+@login_required
+@read_only_database
 def export_enquiries(request):
     """Export enquiries to Excel"""
-    if 'student_id' not in request.session:
-        return redirect('login')
-    
-    enquiries = Enquiry.objects.all().order_by('-created_at')
-    
-    # Create workbook
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Enquiries"
-    
-    # Headers
-    headers = ['Enquiry No', 'Date', 'Student Name', 'Mobile No', 'Course', 'Address']
-    
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.font = openpyxl.styles.Font(bold=True, color="FFFFFF")
-        cell.fill = openpyxl.styles.PatternFill(
-            start_color="4472C4",
-            end_color="4472C4",
-            fill_type="solid"
-        )
-    
-    # Data
-    for row, enquiry in enumerate(enquiries, 2):
-        ws.cell(row=row, column=1, value=enquiry.enquiry_no)
-        ws.cell(row=row, column=2, value=enquiry.enquiry_date.strftime('%d/%m/%Y'))
-        ws.cell(row=row, column=3, value=enquiry.student_name)
-        ws.cell(row=row, column=4, value=enquiry.mobile_no)
-        ws.cell(row=row, column=5, value=enquiry.get_course_display())
-        ws.cell(row=row, column=6, value=enquiry.address)
-    
-    # Auto-adjust columns
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        ws.column_dimensions[column_letter].width = min(max_length + 2, 50)
-    
-    # Response
-    response = HttpResponse(
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
-    response['Content-Disposition'] = f'attachment; filename="enquiries_{datetime.now().strftime("%Y%m%d")}.xlsx"'
-    wb.save(response)
-    
-    return response
+    filename, sheets = build_export('enquiries', request.GET)
+    return xlsx_response(sheets, filename)
 
 
 # ==================== ADMISSION VIEWS ====================
 
+@login_required
 def new_admission(request):
     """New admission form view"""
-    if 'student_id' not in request.session:
-        messages.error(request, 'Please login to access this page')
-        return redirect('login')
-    
     if request.method == 'POST':
         try:
-            # Get form data
-            admission_date = request.POST.get('admission_date')
-            batch = request.POST.get('batch')
-            course_name = request.POST.get('course_name')
-            first_name = request.POST.get('first_name', '').strip()
-            middle_name = request.POST.get('middle_name', '').strip()
-            last_name = request.POST.get('last_name', '').strip()
-            birth_date = request.POST.get('birth_date')
-            mobile_own = request.POST.get('mobile_own', '').strip()
-            mobile_parents = request.POST.get('mobile_parents', '').strip()
-            address = request.POST.get('address', '').strip()
-            qualification = request.POST.get('qualification', '').strip()
-            installment = request.POST.get('installment')
-            photo = request.FILES.get('photo')
-            
-            # Validation
-            if not all([admission_date, batch, course_name, first_name, middle_name, last_name,
-                       birth_date, mobile_own, address, qualification, installment]):
-                messages.error(request, 'All required fields must be filled')
-                return render(request, 'new_admission.html', {
-                    'error': 'All required fields must be filled',
-                    'form_data': request.POST,
-                    'student_name': request.session.get('student_name')
-                })
-            
-            if len(mobile_own) != 10 or not mobile_own.isdigit():
-                messages.error(request, 'Mobile number must be 10 digits')
+            # Validation (shared with the spreadsheet importer)
+            try:
+                cleaned = clean_admission(request.POST)
+            except InvalidAdmissionError as e:
+                messages.error(request, str(e))
                 return render(request, 'new_admission.html', {
-                    'error': 'Mobile number must be 10 digits',
+                    'error': str(e),
                     'form_data': request.POST,
                     'student_name': request.session.get('student_name')
                 })
             
             # Create admission
             admission = Admission.objects.create(
-                admission_date=admission_date,
-                batch=batch,
-                course_name=course_name,
-                first_name=first_name,
-                middle_name=middle_name,
-                last_name=last_name,
-                birth_date=birth_date,
-                mobile_own=mobile_own,
-                mobile_parents=mobile_parents if mobile_parents else None,
-                address=address,
-                qualification=qualification,
-                installments=installment,
-                photo=photo,
-                created_by=request.session.get('student_name')
+                photo=request.FILES.get('photo'),
+                created_by=request.session.get('student_name'),
+                **cleaned
             )
             
             messages.success(request, f'Admission created successfully! Form No: {admission.form_no}')
@@ -419,23 +425,62 @@ def new_admission(request):
     })
 
 
+@csrf_exempt
+@api_login_required
+def import_admissions_upload(request):
+    """API: Import admissions from an uploaded XLSX or CSV sheet"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Invalid request'}, status=400)
+    
+    upload = request.FILES.get('file')
+    if not upload:
+        return JsonResponse({
+            'success': False,
+            'error': 'Please choose a file to import'
+        })
+    if not upload.name.lower().endswith(('.xlsx', '.csv')):
+        return JsonResponse({
+            'success': False,
+            'error': 'Only .xlsx and .csv files can be imported'
+        })
+    
+    try:
+        report = import_admissions(
+            upload,
+            upload.name,
+            created_by=request.session.get('student_name'),
+            dry_run=request.POST.get('dry_run') in ('1', 'true', 'on'),
+            skip_invalid=request.POST.get('skip_invalid') in ('1', 'true', 'on')
+        )
+        
+        return JsonResponse({
+            'success': True,
+            **report
+        })
+        
+    except InvalidAdmissionError as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': f'Could not read the file: {str(e)}'
+        })
+
+
+@login_required
 def admitted_students(request):
     """View admitted students"""
-    if 'student_id' not in request.session:
-        messages.error(request, 'Please login to access this page')
-        return redirect('login')
-    
     return render(request, 'admitted_students.html', {
         'student_name': request.session.get('student_name')
     })
 
 
+@login_required
 def students_details(request):
     """View all registered students"""
-    if 'student_id' not in request.session:
-        messages.error(request, 'Please login to access this page')
-        return redirect('login')
-    
     students = Student.objects.all().order_by('-date_registered')
     
     return render(request, 'students_details.html', {
@@ -447,11 +492,11 @@ def students_details(request):
 # ==================== API ENDPOINTS ====================
 
 @csrf_exempt
+@api_login_required
+@read_only_database
+@versioned_json_cache(ADMISSIONS)
 def get_admitted_students(request):
     """API: Get admitted students by course and batch"""
-    if 'student_id' not in request.session:
-        return JsonResponse({'error': 'Unauthorized'}, status=401)
-    
     try:
         course = request.GET.get('course', '')
         batch = request.GET.get('batch', '')
@@ -468,28 +513,7 @@ def get_admitted_students(request):
             is_active=True
         ).order_by('-created_at')
         
-        students_data = []
-        for student in students:
-            students_data.append({
-                'id': student.id,
-                'formNo': student.form_no,
-                'admissionDate': student.admission_date.strftime('%Y-%m-%d'),
-                'course': student.course_name,
-                'batch': student.batch,
-                'firstName': student.first_name,
-                'middleName': student.middle_name,
-                'lastName': student.last_name,
-                'birthDate': student.birth_date.strftime('%Y-%m-%d'),
-                'mobileOwn': student.mobile_own,
-                'mobileParents': student.mobile_parents or '',
-                'address': student.address,
-                'qualification': student.qualification,
-                'installments': student.installments,
-                'totalFees': float(student.total_fees),
-                'paidFees': float(student.paid_fees),
-                'remainingFees': float(student.get_remaining_fees()),
-                'photo': student.photo.url if student.photo else None
-            })
+        students_data = [admission_json(student) for student in students]
         
         return JsonResponse({
             'success': True,
@@ -503,12 +527,32 @@ def get_admitted_students(request):
         })
 
 
+THUMBNAIL_MAX_AGE = 365 * 24 * 60 * 60
+
+
+@api_login_required
+def admission_thumbnail(request, admission_id, version):
+    """Serve a photo thumbnail; the URL changes with the photo, so it is cached for a year"""
+    path = thumbnail_path(version)
+    if not os.path.exists(path):
+        # First request for this photo: create the thumbnail now
+        admission = get_object_or_404(Admission, id=admission_id)
+        if not admission.photo or thumbnail_version(admission.photo.name) != version:
+            raise Http404('Thumbnail not found')
+        try:
+            path = make_thumbnail(admission.photo)
+        except (OSError, ValueError):
+            raise Http404('Photo could not be read')
+    
+    response = FileResponse(open(path, 'rb'), content_type=THUMBNAIL_CONTENT_TYPE)
+    response['Cache-Control'] = f'private, max-age={THUMBNAIL_MAX_AGE}, immutable'
+    return response
+
+
 @csrf_exempt
+@api_login_required
 def update_student(request):
     """API: Update student data"""
-    if 'student_id' not in request.session:
-        return JsonResponse({'error': 'Unauthorized'}, status=401)
-    
     if request.method == 'POST':
         try:
             data = json.loads(request.body)
@@ -550,11 +594,9 @@ def update_student(request):
 
 
 @csrf_exempt
+@api_login_required
 def delete_student_admission(request):
     """API: Delete student admission"""
-    if 'student_id' not in request.session:
-        return JsonResponse({'error': 'Unauthorized'}, status=401)
-    
     if request.method == 'POST':
         try:
             data = json.loads(request.body)
@@ -587,12 +629,9 @@ def delete_student_admission(request):
 
 # ==================== PAYMENT VIEWS ====================
 
+@login_required
 def fees_payment(request):
     """Fees payment view"""
-    if 'student_id' not in request.session:
-        messages.error(request, 'Please login to access this page')
-        return redirect('login')
-    
     if request.method == 'POST':
         try:
             admission_id = request.POST.get('admission_id')
@@ -613,11 +652,7 @@ def fees_payment(request):
                 messages.error(request, 'Amount must be greater than zero')
                 return redirect('fees_payment')
             
-            if amount > admission.get_remaining_fees():
-                messages.error(request, 'Amount cannot exceed remaining fees')
-                return redirect('fees_payment')
-            
-            # Create payment
+            # Create payment (remaining fees are checked atomically on insert)
             payment = Payment.objects.create(
                 payment_date=datetime.now().date(),
                 admission=admission,
@@ -634,6 +669,9 @@ def fees_payment(request):
         except Admission.DoesNotExist:
             messages.error(request, 'Student not found')
             return redirect('fees_payment')
+        except PaymentExceedsDuesError as e:
+            messages.error(request, str(e))
+            return redirect('fees_payment')
         except Exception as e:
             messages.error(request, f'Error processing payment: {str(e)}')
             return redirect('fees_payment')
@@ -644,23 +682,19 @@ def fees_payment(request):
     })
 
 
+@login_required
 def payment_history(request):
     """Payment history view"""
-    if 'student_id' not in request.session:
-        messages.error(request, 'Please login to access this page')
-        return redirect('login')
-    
     return render(request, 'payment_history.html', {
         'student_name': request.session.get('student_name')
     })
 
 
 @csrf_exempt
+@api_login_required
+@read_only_database
 def search_student_for_payment(request):
     """API: Search student for payment"""
-    if 'student_id' not in request.session:
-        return JsonResponse({'error': 'Unauthorized'}, status=401)
-    
     if request.method == 'POST':
         try:
             data = json.loads(request.body)
@@ -672,30 +706,10 @@ def search_student_for_payment(request):
                     'students': []
                 })
             
-            # Search by name or mobile
-            students = Admission.objects.filter(
-                Q(first_name__icontains=search_term) |
-                Q(middle_name__icontains=search_term) |
-                Q(last_name__icontains=search_term) |
-                Q(mobile_own__icontains=search_term),
-                is_active=True
-            )[:10]
+            # Search by name, form number or mobile (only students with pending fees)
+            students = search_admissions(search_term, pending_only=True, limit=10)
             
-            students_data = []
-            for student in students:
-                remaining = student.get_remaining_fees()
-                if remaining > 0:  # Only show students with pending fees
-                    students_data.append({
-                        'id': student.id,
-                        'form_no': student.form_no,
-                        'full_name': student.get_full_name(),
-                        'mobile': student.mobile_own,
-                        'course': student.course_name,
-                        'batch': student.batch,
-                        'total_fees': float(student.total_fees),
-                        'paid_fees': float(student.paid_fees),
-                        'remaining_fees': float(remaining)
-                    })
+            students_data = [payment_search_json(student) for student in students]
             
             return JsonResponse({
                 'success': True,
@@ -712,49 +726,40 @@ def search_student_for_payment(request):
 
 
 @csrf_exempt
+@api_login_required
+@read_only_database
+@versioned_json_cache(PAYMENTS, ADMISSIONS)
 def get_payment_history(request):
-    """API: Get payment history"""
-    if 'student_id' not in request.session:
-        return JsonResponse({'error': 'Unauthorized'}, status=401)
-    
+    """API: Get payment history, one keyset-paginated page at a time"""
     try:
-        course = request.GET.get('course', '')
-        batch = request.GET.get('batch', '')
-        student_name = request.GET.get('student_name', '').strip()
-        
-        payments = Payment.objects.select_related('admission').all()
-        
-        if course:
-            payments = payments.filter(admission__course_name=course)
-        if batch:
-            payments = payments.filter(admission__batch=batch)
-        if student_name:
-            payments = payments.filter(
-                Q(admission__first_name__icontains=student_name) |
-                Q(admission__middle_name__icontains=student_name) |
-                Q(admission__last_name__icontains=student_name)
-            )
+        page_size = payment_page_size(request.GET)
+        cursor = request.GET.get('cursor', '')
         
-        payments_data = []
-        for payment in payments:
-            payments_data.append({
-                'id': payment.id,
-                'receipt_no': payment.receipt_no,
-                'payment_date': payment.payment_date.strftime('%Y-%m-%d'),
-                'student_name': payment.admission.get_full_name(),
-                'form_no': payment.admission.form_no,
-                'course': payment.admission.course_name,
-                'batch': payment.admission.batch,
-                'amount_paid': float(payment.amount_paid),
-                'payment_mode': payment.payment_mode,
-                'transaction_ref': payment.transaction_ref or '',
-                'remarks': payment.remarks or '',
-                'created_by': payment.created_by or 'N/A'
-            })
+        payments = filter_payments(request.GET).select_related('admission').order_by(
+            '-payment_date', '-created_at', '-id'
+        )
+        
+        # Totals over the whole filtered set come from get_payment_totals, so
+        # no page has to scan every matching payment
+        if cursor:
+            try:
+                payments = payments.filter(payment_cursor_filter(cursor))
+            except (signing.BadSignature, ValueError, TypeError):
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Invalid cursor'
+                }, status=400)
+        
+        page = list(payments[:page_size + 1])
+        has_more = len(page) > page_size
+        page = page[:page_size]
+        
+        payments_data = [payment_json(payment) for payment in page]
         
         return JsonResponse({
             'success': True,
-            'payments': payments_data
+            'payments': payments_data,
+            'next_cursor': make_payment_cursor(page[-1]) if has_more else None
         })
         
     except Exception as e:
@@ -765,11 +770,74 @@ def get_payment_history(request):
 
 
 @csrf_exempt
+@api_login_required
+@read_only_database
+@versioned_json_cache(PAYMENTS, ADMISSIONS)
+def get_payment_totals(request):
+    """API: Count and amount of all payments matching the history filters"""
+    try:
+        summary = filter_payments(request.GET).aggregate(count=Count('id'), amount=Sum('amount_paid'))
+        
+        return JsonResponse({
+            'success': True,
+            'totals': payment_totals_json(summary)
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
+
+
+@csrf_exempt
+@api_login_required
+def reconcile_statement_upload(request):
+    """API: Preview or record payments from a bank/UPI statement CSV"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Invalid request'}, status=400)
+    
+    upload = request.FILES.get('file')
+    if not upload:
+        return JsonResponse({
+            'success': False,
+            'error': 'Please choose a statement file'
+        })
+    if not upload.name.lower().endswith('.csv'):
+        return JsonResponse({
+            'success': False,
+            'error': 'Statements must be uploaded as .csv files'
+        })
+    
+    try:
+        report = reconcile_statement(
+            upload,
+            created_by=request.session.get('student_name'),
+            dry_run=request.POST.get('dry_run') in ('1', 'true', 'on')
+        )
+        
+        return JsonResponse({
+            'success': True,
+            **report
+        })
+        
+    except (StatementError, PaymentExceedsDuesError) as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': f'Could not read the statement: {str(e)}'
+        })
+
+
+@csrf_exempt
+@api_login_required
+@read_only_database
 def get_receipt_details(request):
     """API: Get receipt details"""
-    if 'student_id' not in request.session:
-        return JsonResponse({'error': 'Unauthorized'}, status=401)
-    
     try:
         receipt_no = request.GET.get('receipt_no', '')
         
@@ -779,26 +847,21 @@ def get_receipt_details(request):
                 'error': 'Receipt number is required'
             })
         
-        payment = Payment.objects.select_related('admission').get(receipt_no=receipt_no)
+        # Reprints are served from the render cache without touching the ORM
+        cached, generation = render_cache.lookup('receipts', receipt_no)
+        if cached is not None:
+            return HttpResponse(cached, content_type='application/json')
         
-        receipt_data = {
-            'receipt_no': payment.receipt_no,
-            'payment_date': payment.payment_date.strftime('%d/%m/%Y'),
-            'student_name': payment.admission.get_full_name(),
-            'course': payment.admission.course_name,
-            'batch': payment.admission.batch,
-            'amount_paid': float(payment.amount_paid),
-            'payment_mode': payment.payment_mode,
-            'transaction_ref': payment.transaction_ref or '',
-            'amount_in_words': payment.get_amount_in_words()
-        }
+        payment = Payment.objects.select_related('admission').get(receipt_no=receipt_no)
         
-        return JsonResponse({
+        response = JsonResponse({
             'success': True,
-            'receipt': receipt_data
+            'receipt': receipt_json(payment)
         })
+        render_cache.set('receipts', payment.receipt_no, response.content, generation)
+        return response
         
-    except Payment.DoesNotExist:
+    except (Payment.DoesNotExist, InvalidCacheKeyError):
         return JsonResponse({
             'success': False,
             'error': 'Receipt not found'
@@ -810,84 +873,13 @@ def get_receipt_details(request):
         })
 
 
+@login_required
+@read_only_database
 def export_payment_history(request):
     """Export payment history to Excel"""
-    if 'student_id' not in request.session:
-        return redirect('login')
-    
     try:
-        course = request.GET.get('course', '')
-        batch = request.GET.get('batch', '')
-        student_name = request.GET.get('student_name', '').strip()
-        
-        payments = Payment.objects.select_related('admission').all()
-        
-        if course:
-            payments = payments.filter(admission__course_name=course)
-        if batch:
-            payments = payments.filter(admission__batch=batch)
-        if student_name:
-            payments = payments.filter(
-                Q(admission__first_name__icontains=student_name) |
-                Q(admission__middle_name__icontains=student_name) |
-                Q(admission__last_name__icontains=student_name)
-            )
-        
-        # Create workbook
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Payment History"
-        
-        # Headers
-        headers = [
-            'Receipt No', 'Payment Date', 'Student Name', 'Form No',
-            'Course', 'Batch', 'Amount Paid', 'Payment Mode',
-            'Transaction Ref', 'Remarks', 'Created By'
-        ]
-        
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = openpyxl.styles.Font(bold=True, color="FFFFFF")
-            cell.fill = openpyxl.styles.PatternFill(
-                start_color="4472C4",
-                end_color="4472C4",
-                fill_type="solid"
-            )
-        
-        # Data
-        for row, payment in enumerate(payments, 2):
-            ws.cell(row=row, column=1, value=payment.receipt_no)
-            ws.cell(row=row, column=2, value=payment.payment_date.strftime('%d/%m/%Y'))
-            ws.cell(row=row, column=3, value=payment.admission.get_full_name())
-            ws.cell(row=row, column=4, value=payment.admission.form_no)
-            ws.cell(row=row, column=5, value=payment.admission.course_name)
-            ws.cell(row=row, column=6, value=payment.admission.batch)
-            ws.cell(row=row, column=7, value=float(payment.amount_paid))
-            ws.cell(row=row, column=8, value=payment.payment_mode)
-            ws.cell(row=row, column=9, value=payment.transaction_ref or 'N/A')
-            ws.cell(row=row, column=10, value=payment.remarks or 'N/A')
-            ws.cell(row=row, column=11, value=payment.created_by or 'N/A')
-        
-        # Auto-adjust columns
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            ws.column_dimensions[column_letter].width = min(max_length + 2, 50)
-        
-        # Response
-        response = HttpResponse(
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f'attachment; filename="payment_history_{datetime.now().strftime("%Y%m%d")}.xlsx"'
-        wb.save(response)
-        
-        return response
+        filename, sheets = build_export('payment_history', request.GET)
+        return xlsx_response(sheets, filename)
         
     except Exception as e:
         messages.error(request, f'Error exporting payment history: {str(e)}')
@@ -896,67 +888,20 @@ def export_payment_history(request):
 
 # ==================== BILL MANAGEMENT VIEWS ====================
 
+@login_required
 def new_bill(request):
     """Create new bill page"""
-    if 'student_id' not in request.session:
-        messages.error(request, 'Please login to access this page.')
-        return redirect('login')
-    
     if request.method == 'POST':
         try:
-            # Get form data
-            bill_date = request.POST.get('bill_date', '').strip()
-            customer_name = request.POST.get('customer_name', '').strip()
-            customer_mobile = request.POST.get('customer_mobile', '').strip()
-            items_json = request.POST.get('items', '[]')
-            
-            # Validation
-            if not bill_date or not customer_name or not customer_mobile:
-                return JsonResponse({
-                    'success': False,
-                    'error': 'All fields are required'
-                })
-            
-            if len(customer_mobile) != 10 or not customer_mobile.isdigit():
-                return JsonResponse({
-                    'success': False,
-                    'error': 'Mobile number must be 10 digits'
-                })
-            
-            # Parse items
-            items = json.loads(items_json)
-            if not items or len(items) == 0:
-                return JsonResponse({
-                    'success': False,
-                    'error': 'At least one item is required'
-                })
+            cleaned = clean_bill({
+                'bill_date': request.POST.get('bill_date', ''),
+                'customer_name': request.POST.get('customer_name', ''),
+                'customer_mobile': request.POST.get('customer_mobile', ''),
+                'items': json.loads(request.POST.get('items', '[]'))
+            })
             
-            # Calculate total
-            total_amount = Decimal('0.00')
-            for item in items:
-                amount = Decimal(str(item['amount']))
-                total_amount += amount
-            
-            # Create bill and items in a transaction
-            with transaction.atomic():
-                # Create bill
-                bill = Bill.objects.create(
-                    bill_date=bill_date,
-                    customer_name=customer_name,
-                    customer_mobile=customer_mobile,
-                    total_amount=total_amount,
-                    created_by=request.session.get('student_name', 'Admin')
-                )
-                
-                # Create bill items
-                for item in items:
-                    BillItem.objects.create(
-                        bill=bill,
-                        item_name=item['item_name'],
-                        quantity=Decimal(str(item['quantity'])),
-                        rate=Decimal(str(item['rate'])),
-                        amount=Decimal(str(item['amount']))
-                    )
+            # Line amounts and the total are computed server-side
+            bill, = create_bills([cleaned], created_by=request.session.get('student_name', 'Admin'))
             
             return JsonResponse({
                 'success': True,
@@ -977,55 +922,91 @@ def new_bill(request):
     })
 
 
+MAX_BATCH_BILLS = 500
+
+
+@csrf_exempt
+@api_login_required
+def create_bills_batch(request):
+    """API: Create many bills in one request (end-of-day entry)"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Invalid request'}, status=400)
+    
+    try:
+        data = json.loads(request.body)
+        bills = data.get('bills') or []
+        
+        if not isinstance(bills, list) or not bills:
+            return JsonResponse({
+                'success': False,
+                'error': 'At least one bill is required'
+            })
+        if len(bills) > MAX_BATCH_BILLS:
+            return JsonResponse({
+                'success': False,
+                'error': f'At most {MAX_BATCH_BILLS} bills can be created at once'
+            })
+        
+        # Validate everything first: the batch is saved completely or not at all
+        cleaned_bills = []
+        for number, bill_data in enumerate(bills, 1):
+            try:
+                if not isinstance(bill_data, dict):
+                    raise InvalidBillError('Invalid bill')
+                cleaned_bills.append(clean_bill(bill_data))
+            except InvalidBillError as e:
+                return JsonResponse({
+                    'success': False,
+                    'error': f'Bill {number}: {e}',
+                    'bill_index': number - 1
+                })
+        
+        created = create_bills(cleaned_bills, created_by=request.session.get('student_name', 'Admin'))
+        
+        return JsonResponse({
+            'success': True,
+            'bills': [
+                {'bill_id': bill.id, 'receipt_no': bill.receipt_no, 'total_amount': float(bill.total_amount)}
+                for bill in created
+            ],
+            'count': len(created),
+            'message': f'{len(created)} bill(s) created successfully'
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
+
+
+@login_required
 def bills_list(request):
     """View all bills page"""
-    if 'student_id' not in request.session:
-        messages.error(request, 'Please login to access this page.')
-        return redirect('login')
-    
     return render(request, 'bills.html', {
         'student_name': request.session.get('student_name')
     })
 
 
 @csrf_exempt
+@api_login_required
+@read_only_database
+@versioned_json_cache(BILLS)
 def get_bills(request):
     """API endpoint to get filtered bills"""
-    if 'student_id' not in request.session:
-        return JsonResponse({'error': 'Unauthorized'}, status=401)
-    
     try:
-        date = request.GET.get('date', '')
-        customer = request.GET.get('customer', '').strip().lower()
-        
-        if not date:
+        if not request.GET.get('date', ''):
             return JsonResponse({
                 'success': False,
                 'error': 'Date is required'
             })
         
-        # Filter bills by date
-        bills = Bill.objects.filter(bill_date=date)
+        bills = filter_bills(request.GET)
         
-        # Filter by customer name if provided
-        if customer:
-            bills = bills.filter(
-                models.Q(customer_name__icontains=customer)
-            )
+        # Count items in the same query instead of once per bill
+        bills = bills.annotate(items_count=Count('items'))
         
-        # Prepare bills data
-        bills_data = []
-        for bill in bills:
-            items_count = bill.items.count()
-            bills_data.append({
-                'id': bill.id,
-                'receipt_no': bill.receipt_no,
-                'bill_date': bill.bill_date.strftime('%Y-%m-%d'),
-                'customer_name': bill.customer_name,
-                'customer_mobile': bill.customer_mobile,
-                'total_amount': float(bill.total_amount),
-                'items_count': items_count
-            })
+        bills_data = [bill_json(bill) for bill in bills]
         
         return JsonResponse({
             'success': True,
@@ -1040,167 +1021,320 @@ def get_bills(request):
         })
 
 
+@login_required
 def print_bill(request, bill_id):
     """Print bill page"""
-    if 'student_id' not in request.session:
-        return redirect('login')
-    
     try:
-        bill = get_object_or_404(Bill, id=bill_id)
-        items = bill.items.all()
-        
-        # Convert amount to words
-        amount_in_words = convert_amount_to_words(float(bill.total_amount))
-        
-        context = {
-            'bill': bill,
-            'items': items,
-            'amount_in_words': amount_in_words
-        }
-        
-        return render(request, 'print_bill.html', context)
+        # Reprints take the bill from the render cache without touching the
+        # ORM. Only the bill itself is cached: the page around it links the
+        # static files of the current deploy.
+        cached, generation = render_cache.lookup('bill_bodies', bill_id)
+        if cached is None:
+            bill = get_object_or_404(Bill, id=bill_id)
+            items = bill.items.all()
+            
+            # Convert amount to words
+            amount_in_words = convert_amount_to_words(float(bill.total_amount))
+            
+            context = {
+                'bill': bill,
+                'items': items,
+                'amount_in_words': amount_in_words
+            }
+            
+            cached = json.dumps({
+                'receipt_no': bill.receipt_no,
+                'body': render_to_string('print_bill_body.html', context, request)
+            }).encode()
+            render_cache.set('bill_bodies', bill.id, cached, generation)
+        
+        rendered = json.loads(cached)
+        return render(request, 'print_bill.html', {
+            'receipt_no': rendered['receipt_no'],
+            'bill_body': mark_safe(rendered['body'])
+        })
         
     except Exception as e:
         messages.error(request, f'Error loading bill: {str(e)}')
         return redirect('bills_list')
 
 
+@login_required
+@read_only_database
 def export_bills(request):
     """Export bills to Excel"""
-    if 'student_id' not in request.session:
-        return redirect('login')
-    
     try:
-        date = request.GET.get('date', '')
-        customer = request.GET.get('customer', '').strip().lower()
-        
-        if not date:
+        if not request.GET.get('date', ''):
             messages.error(request, 'Date is required for export')
             return redirect('bills_list')
         
-        # Filter bills by date
-        bills = Bill.objects.filter(bill_date=date)
+        filename, sheets = build_export('bills', request.GET)
+        return xlsx_response(sheets, filename)
         
-        # Filter by customer name if provided
-        if customer:
-            bills = bills.filter(
-                models.Q(customer_name__icontains=customer)
-            )
-        
-        # Create workbook
-        wb = openpyxl.Workbook()
-        
-        # Sheet 1: Bills Summary
-        ws_summary = wb.active
-        ws_summary.title = "Bills Summary"
-        
-        # Headers for summary
-        summary_headers = [
-            'Receipt No', 'Date', 'Customer Name', 
-            'Mobile', 'Items Count', 'Total Amount'
-        ]
-        
-        # Write summary headers
-        for col, header in enumerate(summary_headers, 1):
-            cell = ws_summary.cell(row=1, column=col, value=header)
-            cell.font = openpyxl.styles.Font(bold=True, color="FFFFFF")
-            cell.fill = openpyxl.styles.PatternFill(
-                start_color="4472C4",
-                end_color="4472C4",
-                fill_type="solid"
-            )
-        
-        # Write summary data
-        row = 2
-        for bill in bills:
-            items_count = bill.items.count()
-            ws_summary.cell(row=row, column=1, value=bill.receipt_no)
-            ws_summary.cell(row=row, column=2, value=bill.bill_date.strftime('%d/%m/%Y'))
-            ws_summary.cell(row=row, column=3, value=bill.customer_name)
-            ws_summary.cell(row=row, column=4, value=bill.customer_mobile)
-            ws_summary.cell(row=row, column=5, value=items_count)
-            ws_summary.cell(row=row, column=6, value=float(bill.total_amount))
-            row += 1
-        
-        # Auto-adjust column widths for summary
-        for column in ws_summary.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws_summary.column_dimensions[column_letter].width = adjusted_width
-        
-        # Sheet 2: Items Details
-        ws_items = wb.create_sheet(title="Items Details")
-        
-        # Headers for items
-        items_headers = [
-            'Receipt No', 'Bill Date', 'Customer Name',
-            'Item Name', 'Quantity', 'Rate', 'Amount'
-        ]
-        
-        # Write items headers
-        for col, header in enumerate(items_headers, 1):
-            cell = ws_items.cell(row=1, column=col, value=header)
-            cell.font = openpyxl.styles.Font(bold=True, color="FFFFFF")
-            cell.fill = openpyxl.styles.PatternFill(
-                start_color="27AE60",
-                end_color="27AE60",
-                fill_type="solid"
-            )
-        
-        # Write items data
-        row = 2
-        for bill in bills:
-            for item in bill.items.all():
-                ws_items.cell(row=row, column=1, value=bill.receipt_no)
-                ws_items.cell(row=row, column=2, value=bill.bill_date.strftime('%d/%m/%Y'))
-                ws_items.cell(row=row, column=3, value=bill.customer_name)
-                ws_items.cell(row=row, column=4, value=item.item_name)
-                ws_items.cell(row=row, column=5, value=float(item.quantity))
-                ws_items.cell(row=row, column=6, value=float(item.rate))
-                ws_items.cell(row=row, column=7, value=float(item.amount))
-                row += 1
-        
-        # Auto-adjust column widths for items
-        for column in ws_items.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws_items.column_dimensions[column_letter].width = adjusted_width
-        
-        # Create response
-        response = HttpResponse(
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
+    except Exception as e:
+        messages.error(request, f'Error exporting bills: {str(e)}')
+        return redirect('bills_list')
+
+
+# ==================== EXPORT JOBS ====================
+
+@csrf_exempt
+@api_login_required
+def create_export_job(request):
+    """API: Queue an Excel export for the background worker"""
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Invalid request method'})
+    
+    try:
+        data = json.loads(request.body)
+        kind = data.get('kind', '')
+        params = data.get('params') or {}
         
-        date_obj = datetime.strptime(date, '%Y-%m-%d')
-        filename = f"bills_{date_obj.strftime('%d%m%Y')}.xlsx"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        if kind not in EXPORT_BUILDERS or kind == 'admissions':
+            return JsonResponse({'success': False, 'error': 'Unknown export type'})
+        if kind == 'bills' and not params.get('date'):
+            return JsonResponse({'success': False, 'error': 'Date is required for export'})
         
-        # Save workbook
-        wb.save(response)
+        job = enqueue_export(kind, params, created_by=request.session.get('student_name'))
         
-        return response
+        return JsonResponse({
+            'success': True,
+            'job_id': str(job.job_id),
+            'status': job.status
+        })
         
     except Exception as e:
-        messages.error(request, f'Error exporting bills: {str(e)}')
-        return redirect('bills_list')
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
+
+
+@api_login_required
+def export_job_status(request, job_id):
+    """API: Get the progress of an export job"""
+    job = ExportJob.objects.filter(job_id=job_id).first()
+    if job is None:
+        return JsonResponse({'success': False, 'error': 'Export not found'})
+    
+    return JsonResponse({
+        'success': True,
+        'job_id': str(job.job_id),
+        'status': job.status,
+        'progress': job.progress,
+        'total': job.total,
+        'error': job.error,
+        'download_url': f'/export-jobs/{job.job_id}/download/' if job.status == 'DONE' else None
+    })
+
+
+def download_export_job(request, job_id):
+    """Download the workbook of a finished export job"""
+    # Admin exports are downloaded from the admin site, so staff users are allowed too
+    if not is_logged_in(request) and not request.user.is_staff:
+        return redirect('login')
+    
+    job = get_object_or_404(ExportJob, job_id=job_id)
+    if job.status != 'DONE':
+        return HttpResponse('Export is not ready yet', status=202)
+    
+    try:
+        workbook = open(job_file_path(job), 'rb')
+    except FileNotFoundError:
+        raise Http404('Export file has expired')
+    
+    return FileResponse(workbook, as_attachment=True, filename=job.download_name, content_type=XLSX_CONTENT_TYPE)
+
+
+# ==================== METRICS ====================
+
+def metrics(request):
+    """Request metrics of all server processes in Prometheus format"""
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS and not request.user.is_staff:
+        raise Http404
+    
+    return HttpResponse(
+        render_prometheus(registry.collect()),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
 
 
 # ==================== HELPER FUNCTIONS ====================
 
+PAYMENT_PAGE_SIZE = 50
+MAX_PAYMENT_PAGE_SIZE = 500
+ENQUIRY_PAGE_SIZE = 50
+MAX_ENQUIRY_PAGE_SIZE = 500
+
+
+def payment_page_size(params):
+    try:
+        page_size = int(params.get('page_size', PAYMENT_PAGE_SIZE))
+    except ValueError:
+        page_size = PAYMENT_PAGE_SIZE
+    return max(1, min(page_size, MAX_PAYMENT_PAGE_SIZE))
+
+
+def admission_json(student):
+    """An admission as listed by get_admitted_students"""
+    return {
+        'id': student.id,
+        'formNo': student.form_no,
+        'admissionDate': student.admission_date.strftime('%Y-%m-%d'),
+        'course': student.course_name,
+        'batch': student.batch,
+        'firstName': student.first_name,
+        'middleName': student.middle_name,
+        'lastName': student.last_name,
+        'birthDate': student.birth_date.strftime('%Y-%m-%d'),
+        'mobileOwn': student.mobile_own,
+        'mobileParents': student.mobile_parents or '',
+        'address': student.address,
+        'qualification': student.qualification,
+        'installments': student.installments,
+        'totalFees': float(student.total_fees),
+        'paidFees': float(student.paid_fees),
+        'remainingFees': float(student.get_remaining_fees()),
+        'photo': student.photo.url if student.photo else None,
+        'photoThumb': thumbnail_url(student)
+    }
+
+
+def payment_search_json(student):
+    """An admission as found by search_student_for_payment"""
+    return {
+        'id': student.id,
+        'form_no': student.form_no,
+        'full_name': student.get_full_name(),
+        'mobile': student.mobile_own,
+        'course': student.course_name,
+        'batch': student.batch,
+        'total_fees': float(student.total_fees),
+        'paid_fees': float(student.paid_fees),
+        'remaining_fees': float(student.get_remaining_fees())
+    }
+
+
+def payment_json(payment):
+    """A payment history row; expects the admission to be selected with it"""
+    return {
+        'id': payment.id,
+        'receipt_no': payment.receipt_no,
+        'payment_date': payment.payment_date.strftime('%Y-%m-%d'),
+        'student_name': payment.admission.get_full_name(),
+        'form_no': payment.admission.form_no,
+        'course': payment.admission.course_name,
+        'batch': payment.admission.batch,
+        'amount_paid': float(payment.amount_paid),
+        'payment_mode': payment.payment_mode,
+        'transaction_ref': payment.transaction_ref or '',
+        'remarks': payment.remarks or '',
+        'created_by': payment.created_by or 'N/A'
+    }
+
+
+def payment_totals_json(summary):
+    """Totals of an aggregate(count=..., amount=...) over payments"""
+    return {
+        'count': summary['count'],
+        'amount': float(summary['amount'] or 0)
+    }
+
+
+def receipt_json(payment):
+    """What a printed receipt shows"""
+    return {
+        'receipt_no': payment.receipt_no,
+        'payment_date': payment.payment_date.strftime('%d/%m/%Y'),
+        'student_name': payment.admission.get_full_name(),
+        'course': payment.admission.course_name,
+        'batch': payment.admission.batch,
+        'amount_paid': float(payment.amount_paid),
+        'payment_mode': payment.payment_mode,
+        'transaction_ref': payment.transaction_ref or '',
+        'amount_in_words': payment.get_amount_in_words()
+    }
+
+
+def bill_json(bill):
+    """A bill as listed by get_bills; expects the items_count annotation"""
+    return {
+        'id': bill.id,
+        'receipt_no': bill.receipt_no,
+        'bill_date': bill.bill_date.strftime('%Y-%m-%d'),
+        'customer_name': bill.customer_name,
+        'customer_mobile': bill.customer_mobile,
+        'total_amount': float(bill.total_amount),
+        'items_count': bill.items_count
+    }
+
+
+def make_payment_cursor(payment):
+    """Opaque token pointing just after a payment in history order"""
+    return signing.dumps(
+        [payment.payment_date.isoformat(), payment.created_at.isoformat(), payment.id],
+        salt='payment-history'
+    )
+
+
+def payment_cursor_filter(cursor):
+    """Filter selecting the payments that come after a cursor token"""
+    payment_date, created_at, payment_id = signing.loads(cursor, salt='payment-history')
+    payment_date = parse_date(payment_date)
+    created_at = parse_datetime(created_at)
+    if payment_date is None or created_at is None:
+        raise ValueError('Malformed cursor')
+    
+    return (
+        Q(payment_date__lt=payment_date) |
+        Q(payment_date=payment_date, created_at__lt=created_at) |
+        Q(payment_date=payment_date, created_at=created_at, id__lt=int(payment_id))
+    )
+
+
+# Turns a cursor value back into what the sort column holds
+ENQUIRY_CURSOR_FIELDS = {
+    'created_at': parse_datetime,
+    'student_name': str,
+    'enquiry_no': str,
+    'id': int,
+}
+
+
+def make_enquiry_cursor(enquiry, sort):
+    """Opaque token pointing just after an enquiry in the given sort order"""
+    values = []
+    for field in ENQUIRY_SORTS[sort]:
+        value = enquiry[field.lstrip('-')]
+        values.append(value.isoformat() if isinstance(value, datetime) else value)
+    # The sort is part of the salt, so a cursor only works in its own order
+    return signing.dumps(values, salt=f'enquiries:{sort}')
+
+
+def enquiry_cursor_filter(cursor, sort):
+    """Filter selecting the enquiries that come after a cursor token
+
+    For the ordering (a, b, id) that is a > x, or a = x and b > y, or
+    a = x, b = y and id > z, with < for descending columns.
+    """
+    ordering = ENQUIRY_SORTS[sort]
+    values = signing.loads(cursor, salt=f'enquiries:{sort}')
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise ValueError('Malformed cursor')
+    
+    condition = Q()
+    equal = {}
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        value = ENQUIRY_CURSOR_FIELDS[name](value)
+        if value is None:
+            raise ValueError('Malformed cursor')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        condition |= Q(**equal, **{f'{name}__{lookup}': value})
+        equal[name] = value
+    return condition
+
+
 def convert_amount_to_words(amount):
     """Convert numeric amount to words (Indian numbering system)"""
     def num_to_words(n):